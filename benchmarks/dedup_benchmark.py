@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Lead deduplication benchmark
+Runs LeadDeduplicator over a synthetic dataset with known duplicates and reports speed and accuracy
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.deduplication import LeadDeduplicator
+
+BUSINESS_TYPES = ['Café', 'Bäckerei', 'Friseur', 'Zahnarztpraxis', 'Autowerkstatt', 'Blumenladen', 'Yoga Studio']
+SURNAMES = ['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer', 'Wagner', 'Becker', 'Schulz', 'Köhler']
+LEGAL_FORMS = ['', ' GmbH', ' UG', ' e.K.', ' GmbH & Co. KG']
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'to', 'sa', 'vi', 'dor', 'ne', 'bu', 'fa', 'gil',
+             'pe', 'ri', 'stan', 'ho', 'le', 'wen', 'tu', 'mar', 'ze', 'bo', 'nik', 'al']
+
+
+def pseudo_word(rng: random.Random) -> str:
+    """Random made-up word that keeps synthetic businesses distinct"""
+    return ''.join(rng.choice(SYLLABLES) for _ in range(4)).capitalize()
+
+
+def make_entity(rng: random.Random, entity_id: int) -> dict:
+    """Canonical record of one synthetic business"""
+    word = pseudo_word(rng)
+    return {
+        'entity': entity_id,
+        'name': f"{rng.choice(BUSINESS_TYPES)} {rng.choice(SURNAMES)} {word}{rng.choice(LEGAL_FORMS)}",
+        'email': f"info@{word.lower()}{entity_id}.de" if rng.random() < 0.5 else None,
+        'phone': f"030 {entity_id:08d}" if rng.random() < 0.6 else None,
+        'website': f"https://www.{word.lower()}{entity_id}.de" if rng.random() < 0.5 else None,
+    }
+
+
+def make_variant(rng: random.Random, entity: dict) -> dict:
+    """Duplicate of an entity as another platform would report it"""
+    name = entity['name']
+    if rng.random() < 0.5:
+        name = name.replace('ä', 'ae').replace('ö', 'oe').replace('ü', 'ue').replace('é', 'e')
+    if rng.random() < 0.4:
+        for form in LEGAL_FORMS[1:]:
+            name = name.replace(form, '')
+    if rng.random() < 0.3:
+        name = name.upper()
+    return {
+        'entity': entity['entity'],
+        'name': name,
+        'email': entity['email'] if rng.random() < 0.5 else None,
+        'phone': entity['phone'].replace('030 ', '+49 30 ') if entity['phone'] and rng.random() < 0.5 else None,
+        'website': entity['website'].replace('https://www.', '') if entity['website'] and rng.random() < 0.5 else None,
+    }
+
+
+def build_dataset(count: int, duplicate_rate: float, seed: int) -> list:
+    """Shuffled records of which roughly duplicate_rate are duplicates of another record"""
+    rng = random.Random(seed)
+    records = []
+    entities = []
+    while len(records) < count:
+        if entities and rng.random() < duplicate_rate:
+            records.append(make_variant(rng, rng.choice(entities)))
+        else:
+            entity = make_entity(rng, len(entities))
+            entities.append(entity)
+            records.append(entity)
+    rng.shuffle(records)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=200_000, help='number of synthetic records')
+    parser.add_argument('--duplicate-rate', type=float, default=0.3, help='share of records that are duplicates')
+    parser.add_argument('--threshold', type=float, default=0.85, help='name similarity threshold')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    records = build_dataset(args.count, args.duplicate_rate, args.seed)
+    entities = {record['entity'] for record in records}
+
+    start = time.perf_counter()
+    unique = LeadDeduplicator(threshold=args.threshold).deduplicate(records)
+    elapsed = time.perf_counter() - start
+
+    kept_entities = [record['entity'] for record in unique]
+    missed = len(kept_entities) - len(set(kept_entities))
+    lost = len(entities) - len(set(kept_entities))
+    true_duplicates = len(records) - len(entities)
+
+    print(f"Records:                {len(records):,} ({len(entities):,} businesses, {true_duplicates:,} duplicates)")
+    print(f"Deduplication time:     {elapsed:.2f}s ({elapsed / len(records) * 1e6:.1f} us/record)")
+    print(f"Records kept:           {len(unique):,}")
+    print(f"Duplicates missed:      {missed:,} ({missed / max(true_duplicates, 1):.1%} of duplicates)")
+    print(f"Businesses merged away: {lost:,} ({lost / len(entities):.2%} of businesses)")
+
+    start = time.perf_counter()
+    golden = LeadDeduplicator(threshold=args.threshold).merge_duplicates(records)
+    elapsed = time.perf_counter() - start
+    print(f"Golden-record merge:    {elapsed:.2f}s ({elapsed / len(records) * 1e6:.1f} us/record, {len(golden):,} records)")
+
+
+if __name__ == "__main__":
+    main()
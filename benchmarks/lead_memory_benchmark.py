@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Lead memory and construction benchmark
+Measures per-object memory and construction time of Lead for large result sets
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.lead import Lead
+
+PLATFORMS = ['yelp', 'facebook', 'instagram']
+INDUSTRIES = ['Restaurants', 'Cafes', 'Hair Salons', 'Fitness', 'Dentists', None]
+
+
+def build_leads(count: int) -> list:
+    """Construct count leads with a realistic mix of filled fields"""
+    leads = []
+    for i in range(count):
+        leads.append(Lead(
+            name=f"  Business {i}  ",
+            platform=PLATFORMS[i % len(PLATFORMS)],
+            source_url=f"https://www.yelp.com/biz/business-{i}",
+            website=f"business{i}.de" if i % 2 else None,
+            email=f"Info@Business{i}.de" if i % 3 else None,
+            phone=f"+49 30 {i:07d}" if i % 4 else None,
+            followers=i % 20000 if i % 5 else None,
+            industry=INDUSTRIES[i % len(INDUSTRIES)],
+            social_handles={'yelp': f"https://www.yelp.com/biz/business-{i}"}
+        ))
+    return leads
+
+
+def measure_memory(count: int) -> float:
+    """Return traced bytes allocated per lead"""
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    leads = build_leads(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_lead = (current - baseline) / count
+    del leads
+    return per_lead
+
+
+def measure_construction(count: int) -> tuple:
+    """Return wall-clock seconds needed to construct count leads and to score them"""
+    start = time.perf_counter()
+    leads = build_leads(count)
+    constructed = time.perf_counter()
+    Lead.finalize_all(leads)
+    scored = time.perf_counter()
+    del leads
+    return constructed - start, scored - constructed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1_000_000, help='number of leads to construct')
+    parser.add_argument('--memory-sample', type=int, default=100_000,
+                        help='number of leads traced for the per-object memory figure')
+    args = parser.parse_args()
+
+    sample = min(args.memory_sample, args.count)
+    per_lead = measure_memory(sample)
+    elapsed, scoring = measure_construction(args.count)
+
+    shallow = sys.getsizeof(build_leads(1)[0])
+    print(f"Leads constructed:      {args.count:,}")
+    print(f"Construction time:      {elapsed:.2f}s ({elapsed / args.count * 1e6:.2f} us/lead)")
+    print(f"Scoring (finalize_all): {scoring:.2f}s ({scoring / args.count * 1e6:.2f} us/lead)")
+    print(f"Memory per lead (deep): {per_lead:,.0f} bytes (traced over {sample:,} leads)")
+    print(f"Memory per lead (shallow object): {shallow} bytes")
+    print(f"Projected memory for {args.count:,} leads: {per_lead * args.count / 1024 ** 2:,.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
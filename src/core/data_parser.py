@@ -7,6 +7,16 @@ from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin, urlparse
 from loguru import logger
 from config.settings import PAIN_POINT_KEYWORDS, TARGET_FIELDS
+from src.utils.phone import normalize_phone
+
+# German phone number patterns
+PHONE_PATTERNS = [
+    re.compile(r'\+49\s?[0-9\s\-\(\)]{10,}'),  # German international format
+    re.compile(r'0[0-9\s\-\(\)]{10,}'),        # German national format
+    re.compile(r'\([0-9]{3,5}\)\s?[0-9\s\-]{6,}'),  # Format with area code in parentheses
+    re.compile(r'[0-9]{3,5}[\s\-][0-9]{6,}'),  # Simple format with separator
+]
+PHONE_DIGITS_PATTERN = re.compile(r'[\d+]')
 
 
 class DataParser:
@@ -81,31 +91,21 @@ class DataParser:
         return list(set(filtered_emails))  # Remove duplicates
     
     def find_phone_numbers(self, text: str = None) -> List[str]:
-        """Find phone numbers in text or entire page"""
+        """Find phone numbers in text or entire page, normalized to E.164 in order of appearance"""
         if text is None:
             text = self.soup.get_text()
         
-        # German phone number patterns
-        phone_patterns = [
-            r'\+49\s?[0-9\s\-\(\)]{10,}',  # German international format
-            r'0[0-9\s\-\(\)]{10,}',        # German national format
-            r'\([0-9]{3,5}\)\s?[0-9\s\-]{6,}',  # Format with area code in parentheses
-            r'[0-9]{3,5}[\s\-][0-9]{6,}',  # Simple format with separator
-        ]
-        
         phones = []
-        for pattern in phone_patterns:
-            matches = re.findall(pattern, text)
-            phones.extend(matches)
+        for pattern in PHONE_PATTERNS:
+            phones.extend(pattern.findall(text))
         
-        # Clean phone numbers
+        # Normalize and drop duplicates; require a minimum length for valid phones
         cleaned_phones = []
         for phone in phones:
-            cleaned = re.sub(r'[^\d+]', '', phone)
-            if len(cleaned) >= 10:  # Minimum length for valid phone
-                cleaned_phones.append(phone.strip())
+            if len(PHONE_DIGITS_PATTERN.findall(phone)) >= 10:
+                cleaned_phones.append(normalize_phone(phone))
         
-        return list(set(cleaned_phones))
+        return list(dict.fromkeys(phone for phone in cleaned_phones if phone))
     
     def find_social_handles(self) -> Dict[str, str]:
         """Find social media handles and profiles"""
@@ -0,0 +1,129 @@
+"""
+Geo-tiled crawl planner for large-area location searches
+"""
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+from loguru import logger
+
+from src.models.lead import Lead
+
+DEFAULT_GAZETTEER = Path(__file__).resolve().parent.parent / 'data' / 'gazetteer_de.json'
+
+
+@dataclass
+class GeoTile:
+    """A sub-area of a location that is searched as one query"""
+
+    query: str
+    level: str
+    children: List['GeoTile'] = field(default_factory=list)
+
+
+class GeoCrawlPlanner:
+    """Splits a location into gazetteer tiles and crawls them with adaptive subdivision"""
+
+    def __init__(self, gazetteer_path: Path = DEFAULT_GAZETTEER):
+        self.gazetteer = self._load_gazetteer(Path(gazetteer_path))
+        self._aliases = {}
+        for key, city in self.gazetteer.items():
+            for alias in [key, city['name']] + city.get('aliases', []):
+                self._aliases[self._normalize(alias)] = key
+
+    def plan(self, location: str) -> List[GeoTile]:
+        """Return the top-level tiles for a location (districts, each holding postcode tiles)"""
+        city_key = self._aliases.get(self._normalize(location))
+        if not city_key:
+            logger.info(f"Location '{location}' not in gazetteer - searching it as a single tile")
+            return [GeoTile(query=location, level='location')]
+
+        city = self.gazetteer[city_key]
+        tiles = []
+        for district, postcodes in city['districts'].items():
+            children = [GeoTile(query=f"{postcode} {city['name']}", level='postcode') for postcode in postcodes]
+            tiles.append(GeoTile(query=f"{district}, {city['name']}", level='district', children=children))
+
+        logger.info(f"Planned {len(tiles)} district tiles for {city['name']}")
+        return tiles
+
+    def crawl(self, location: str, search: Callable[[str], List[Lead]], result_cap: int,
+              max_workers: int = 3, max_queries: int = 100, saturation: float = 0.9) -> List[Lead]:
+        """Search every tile of a location in parallel and return the deduplicated leads
+
+        A tile whose result count reaches ``saturation * result_cap`` probably lost
+        results to the platform's cap, so its child tiles are queued as well.
+        ``max_queries`` bounds the total number of searches issued.
+        """
+        threshold = max(1, math.ceil(result_cap * saturation))
+        leads: List[Lead] = []
+        seen_keys: Set[str] = set()
+        queried: Set[str] = set()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+
+            def submit(tile: GeoTile):
+                if tile.query in queried:
+                    return
+                if len(queried) >= max_queries:
+                    logger.warning(f"Query budget of {max_queries} exhausted - skipping tile {tile.query}")
+                    return
+                queried.add(tile.query)
+                futures[executor.submit(search, tile.query)] = tile
+
+            for tile in self.plan(location):
+                submit(tile)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tile = futures.pop(future)
+                    try:
+                        results = future.result() or []
+                    except Exception as e:
+                        logger.error(f"Error searching tile {tile.query}: {e}")
+                        results = []
+
+                    new_leads = 0
+                    for lead in results:
+                        key = self._dedup_key(lead)
+                        if key not in seen_keys:
+                            seen_keys.add(key)
+                            leads.append(lead)
+                            new_leads += 1
+
+                    logger.info(f"Tile {tile.query}: {len(results)} results, {new_leads} new")
+
+                    if len(results) >= threshold and tile.children:
+                        logger.info(f"Tile {tile.query} hit the result cap - subdividing into {len(tile.children)} tiles")
+                        for child in tile.children:
+                            submit(child)
+
+        logger.info(f"Geo crawl of {location} issued {len(queried)} queries and found {len(leads)} unique leads")
+        return leads
+
+    def _dedup_key(self, lead: Lead) -> str:
+        """Identify the same business returned by overlapping tiles"""
+        if lead.source_url:
+            return lead.source_url.split('?')[0].rstrip('/').lower()
+        return f"{lead.platform}:{(lead.name or '').strip().lower()}"
+
+    def _load_gazetteer(self, path: Path) -> Dict[str, Dict]:
+        """Load the bundled gazetteer file"""
+        try:
+            with open(path, encoding='utf-8') as gazetteer_file:
+                return json.load(gazetteer_file)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load gazetteer {path}: {e}")
+            return {}
+
+    @staticmethod
+    def _normalize(name: Optional[str]) -> str:
+        """Normalize a place name for alias lookup"""
+        name = (name or '').strip().casefold()
+        for umlaut, replacement in (('ä', 'ae'), ('ö', 'oe'), ('ü', 'ue'), ('ß', 'ss')):
+            name = name.replace(umlaut, replacement)
+        return name
@@ -0,0 +1,46 @@
+"""
+Thread-local pool of scraper instances for concurrent browser work
+"""
+import threading
+from typing import Any, Callable, List, Optional
+from loguru import logger
+
+
+class ScraperPool:
+    """Hands every worker thread its own scraper (and browser) and closes them all on exit"""
+
+    def __init__(self, factory: Callable[[], Any], setup: Optional[Callable[[Any], Any]] = None):
+        self.factory = factory
+        self.setup = setup
+        self._local = threading.local()
+        self._scrapers: List[Any] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Return the scraper bound to the calling thread, starting one if needed"""
+        scraper = getattr(self._local, 'scraper', None)
+        if scraper is None:
+            scraper = self.factory().__enter__()
+            with self._lock:
+                self._scrapers.append(scraper)
+            if self.setup:
+                self.setup(scraper)
+            self._local.scraper = scraper
+        return scraper
+
+    def close(self):
+        """Close every scraper started by the pool"""
+        with self._lock:
+            scrapers, self._scrapers = self._scrapers, []
+
+        for scraper in scrapers:
+            try:
+                scraper.__exit__(None, None, None)
+            except Exception as e:
+                logger.warning(f"Error closing pooled scraper: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -3,7 +3,7 @@ Selenium WebDriver handler for dynamic content scraping
 """
 import time
 import random
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -226,6 +226,78 @@ class SeleniumHandler:
             logger.error(f"Instagram login error: {e}")
             return False
     
+    def open_tab(self, url: str) -> Optional[str]:
+        """Start loading a URL in a new background tab and return its window handle"""
+        try:
+            known_handles = set(self.driver.window_handles)
+            # window.open returns immediately, so the page loads while we keep working
+            self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+            new_handles = [handle for handle in self.driver.window_handles if handle not in known_handles]
+            return new_handles[0] if new_handles else None
+        except Exception as e:
+            logger.error(f"Failed to open tab for {url}: {e}")
+            return None
+    
+    def wait_for_page_ready(self, timeout: int = 30) -> bool:
+        """Wait until the current tab has finished loading"""
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
+            return True
+        except TimeoutException:
+            logger.warning("Page did not finish loading within timeout")
+            return False
+    
+    def iter_pages_pipelined(self, urls: Iterable[str], settle_time: float = 3) -> Iterator[Tuple[str, str]]:
+        """Yield (url, page_source) pairs while the following URL already loads in another tab
+        
+        The caller parses page N while page N+1 is fetched, so parse time is hidden
+        behind network latency. At most two tabs are open besides the main window.
+        """
+        urls = list(urls)
+        if not urls:
+            return
+        
+        main_handle = self.driver.current_window_handle
+        pending = (self.open_tab(urls[0]), time.monotonic())
+        
+        try:
+            for index, url in enumerate(urls):
+                handle, opened_at = pending
+                pending = (None, 0.0)
+                html_content = None
+                
+                if handle:
+                    logger.info(f"Reading prefetched page: {url}")
+                    self.driver.switch_to.window(handle)
+                    self.wait_for_page_ready()
+                    
+                    # Give client-side rendering the same head start as a regular navigation
+                    remaining = settle_time - (time.monotonic() - opened_at)
+                    if remaining > 0:
+                        time.sleep(remaining)
+                    
+                    html_content = self.driver.page_source
+                    self.driver.close()
+                    self.driver.switch_to.window(main_handle)
+                
+                # Start loading the next page before handing this one to the caller
+                if index + 1 < len(urls):
+                    pending = (self.open_tab(urls[index + 1]), time.monotonic())
+                
+                if html_content is not None:
+                    yield url, html_content
+        finally:
+            handle, _ = pending
+            if handle:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                    self.driver.switch_to.window(main_handle)
+                except Exception as e:
+                    logger.warning(f"Failed to close prefetch tab: {e}")
+    
     def get_page_source(self) -> str:
         """Get current page source"""
         return self.driver.page_source if self.driver else ""
@@ -0,0 +1,199 @@
+"""
+Asana tasks client with cached workspace/project lookup and concurrent task creation
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+import requests
+from loguru import logger
+
+from src.exporters.crm_http import (
+    BatchResult, ItemError, RateLimitGate, create_session, request_with_backoff
+)
+
+ASANA_API_URL = 'https://app.asana.com/api/1.0'
+
+# Asana's batch API runs at most 10 actions per request; list endpoints return at most 100 items per page
+MAX_BATCH_ACTIONS = 10
+PAGE_SIZE = 100
+
+
+class AsanaError(Exception):
+    """Asana answered a lookup request with an error"""
+
+
+class AsanaClient:
+    """Creates Asana tasks concurrently, resolving workspace and project GIDs once
+
+    GIDs are cached on the client, so repeated exports through one client go
+    straight to task creation. Project lookup follows Asana's pagination.
+    Tasks are created max_workers at a time, either one request per task or,
+    with use_batch_api, ten per /batch request. A 429 Retry-After pauses every
+    worker (Asana's limits apply per token, not per connection).
+
+    base_url can point at a local mock of the Asana API.
+    """
+
+    def __init__(self, access_token: str, base_url: str = ASANA_API_URL, max_workers: int = 8,
+                 session: Optional[requests.Session] = None, max_retries: int = 5, backoff: float = 1.0):
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = session or create_session(max_workers)
+        self.session.headers.update({
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json',
+        })
+        self.rate_limit = RateLimitGate()
+
+        self._workspace_gid: Optional[str] = None
+        self._project_gids: Dict[tuple, str] = {}
+        self._project_locks: Dict[tuple, threading.Lock] = {}
+        self._workspace_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def workspace_gid(self, workspace_gid: Optional[str] = None) -> str:
+        """The given workspace, or the user's first workspace (looked up once)"""
+        if workspace_gid:
+            return workspace_gid
+        with self._workspace_lock:
+            if self._workspace_gid is None:
+                workspace = next(self._paginate('/workspaces', {'opt_fields': 'name'}), None)
+                if workspace is None:
+                    raise AsanaError("No Asana workspaces found")
+                logger.info(f"Using workspace: {workspace['name']}")
+                self._workspace_gid = workspace['gid']
+            return self._workspace_gid
+
+    def project_gid(self, name: str, workspace_gid: str, notes: str = '') -> str:
+        """GID of the workspace's project with this name, created if missing (cached)"""
+        key = (workspace_gid, name)
+        with self._lock:
+            if key in self._project_gids:
+                return self._project_gids[key]
+            key_lock = self._project_locks.setdefault(key, threading.Lock())
+
+        # Concurrent callers asking for the same project wait for the first one; others are not held up
+        with key_lock:
+            with self._lock:
+                if key in self._project_gids:
+                    return self._project_gids[key]
+            gid = self._find_project(name, workspace_gid) or self._create_project(name, workspace_gid, notes)
+            with self._lock:
+                self._project_gids[key] = gid
+            return gid
+
+    def _find_project(self, name: str, workspace_gid: str) -> Optional[str]:
+        params = {'workspace': workspace_gid, 'archived': 'false', 'opt_fields': 'name'}
+        gid = next((project['gid'] for project in self._paginate('/projects', params)
+                    if project['name'] == name), None)
+        if gid:
+            logger.info(f"Found existing project: {name}")
+        return gid
+
+    def _create_project(self, name: str, workspace_gid: str, notes: str) -> str:
+        response = self._request('POST', '/projects',
+                                 json={'data': {'name': name, 'workspace': workspace_gid, 'notes': notes}})
+        if response.status_code != 201:
+            raise AsanaError(f"Failed to create project {name}: {response.status_code}")
+        logger.info(f"Created new project: {name}")
+        return response.json()['data']['gid']
+
+    def create_tasks(self, tasks: List[Dict[str, Any]], use_batch_api: bool = False) -> BatchResult:
+        """Create tasks (Asana task data dicts) concurrently; ItemError.index is a task's position in tasks"""
+        if not tasks:
+            return BatchResult(0, [])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            if use_batch_api:
+                starts = range(0, len(tasks), MAX_BATCH_ACTIONS)
+                chunks = [tasks[start:start + MAX_BATCH_ACTIONS] for start in starts]
+                result = BatchResult.combine(executor.map(self._create_batch, starts, chunks))
+            else:
+                errors = [error for error in executor.map(self._create_task, range(len(tasks)), tasks)
+                          if error is not None]
+                result = BatchResult(len(tasks) - len(errors), errors)
+
+        logger.info(f"Asana: {result.succeeded} tasks created, {len(result.errors)} errors")
+        return result
+
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _create_task(self, index: int, task: Dict[str, Any]) -> Optional[ItemError]:
+        """Create one task (tasks[index]); returns an ItemError if that failed"""
+        try:
+            response = self._request('POST', '/tasks', json={'data': task})
+        except requests.RequestException as e:
+            return ItemError(task.get('name'), None, str(e), index)
+        if response.status_code != 201:
+            return ItemError(task.get('name'), response.status_code, self._error_message(self._body(response)),
+                             index)
+        return None
+
+    def _create_batch(self, start: int, tasks: List[Dict[str, Any]]) -> BatchResult:
+        """Create up to 10 tasks (starting at position start) through one /batch request"""
+        actions = [{'method': 'post', 'relative_path': '/tasks', 'data': task} for task in tasks]
+        try:
+            response = self._request('POST', '/batch', json={'data': {'actions': actions}})
+        except requests.RequestException as e:
+            return BatchResult(0, [ItemError(task.get('name'), None, str(e), start + i)
+                                   for i, task in enumerate(tasks)])
+
+        if response.status_code != 200:
+            message = self._error_message(self._body(response))
+            return BatchResult(0, [ItemError(task.get('name'), response.status_code, message, start + i)
+                                   for i, task in enumerate(tasks)])
+
+        # One result per action, in order, each with its own status code; an action without one is not known
+        # to have been created
+        outcomes = self._body(response).get('data') or []
+        succeeded, errors = 0, []
+        for i, task in enumerate(tasks):
+            if i >= len(outcomes):
+                errors.append(ItemError(task.get('name'), None, "No result for batch action", start + i))
+            elif outcomes[i].get('status_code') == 201:
+                succeeded += 1
+            else:
+                errors.append(ItemError(task.get('name'), outcomes[i].get('status_code'),
+                                        self._error_message(outcomes[i].get('body') or {}), start + i))
+        return BatchResult(succeeded, errors)
+
+    def _paginate(self, path: str, params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Items of a list endpoint, following next_page offsets"""
+        params = dict(params, limit=PAGE_SIZE)
+        while True:
+            response = self._request('GET', path, params=params)
+            if response.status_code != 200:
+                raise AsanaError(f"Asana request {path} failed: {response.status_code}")
+            body = response.json()
+            yield from body['data']
+            next_page = body.get('next_page')
+            if not next_page or not next_page.get('offset'):
+                return
+            params['offset'] = next_page['offset']
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        return request_with_backoff(self.session, method, f"{self.base_url}{path}", max_retries=self.max_retries,
+                                    backoff=self.backoff, rate_limit=self.rate_limit, **kwargs)
+
+    @staticmethod
+    def _body(response: requests.Response) -> Dict[str, Any]:
+        try:
+            return response.json() if response.content else {}
+        except ValueError:
+            return {'errors': [{'message': response.text[:200]}]}
+
+    @staticmethod
+    def _error_message(body: Dict[str, Any]) -> str:
+        """Asana's error messages ({"errors": [{"message": ...}]}) joined"""
+        errors = body.get('errors') or []
+        return '; '.join(error.get('message', '') for error in errors) or 'Unknown error'
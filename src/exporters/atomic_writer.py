@@ -0,0 +1,276 @@
+"""
+Atomic, optionally compressed file writes with a manifest for exporter outputs
+"""
+import io
+import os
+import bz2
+import gzip
+import json
+import lzma
+import stat
+import shutil
+import hashlib
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Supported compressions and the suffix they add to a file name
+COMPRESSIONS = {
+    'gzip': '.gz',
+    'bz2': '.bz2',
+    'xz': '.xz',
+    'zstd': '.zst',
+}
+
+MANIFEST_SUFFIX = '.manifest.json'
+
+BUFFER_SIZE = 1 << 20
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstandard not installed. Run: pip install zstandard")
+    return zstandard
+
+
+def compressed_path(path: Union[str, Path], compression: Optional[str]) -> Path:
+    """Path with the compression's suffix appended (once)"""
+    path = Path(path)
+    if compression is None:
+        return path
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compression} (use one of {', '.join(COMPRESSIONS)})")
+    suffix = COMPRESSIONS[compression]
+    return path if path.name.endswith(suffix) else path.with_name(path.name + suffix)
+
+
+def _fsync_directory(directory: Path):
+    """Persist a rename by syncing its directory (not possible on every platform)"""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _read_umask() -> int:
+    """The process umask (it can only be read by setting it)"""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import: flipping the umask later could race file creation in other threads
+_UMASK = _read_umask()
+
+
+def _publish_mode(path: Path) -> int:
+    """Permissions for a file about to replace path: the existing file's, else what open() would create"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def write_manifest(path: Path, manifest: Dict[str, Any]) -> Path:
+    """Atomically write a JSON manifest next to path"""
+    manifest_path = path.with_name(path.name + MANIFEST_SUFFIX)
+    with AtomicWriter(manifest_path, manifest=False) as out:
+        json.dump(manifest, out.file, indent=2, ensure_ascii=False)
+    return manifest_path
+
+
+class _HashingFile(io.RawIOBase):
+    """Write-only raw stream that counts and hashes the bytes passed to the file below"""
+
+    def __init__(self, raw: io.FileIO):
+        self.raw = raw
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        written = self.raw.write(data)
+        self.sha256.update(memoryview(data)[:written])
+        self.size += written
+        return written
+
+
+class AtomicWriter:
+    """Writes a file through a temp file that replaces the target only when complete
+
+    Data is streamed (and optionally compressed) into a hidden temp file in the
+    target's directory; on success the file is fsynced and renamed over the
+    target with os.replace, so readers see either the old file or the complete
+    new one, never a partial write. If the block raises, the temp file is
+    removed and the target is left untouched. Unless manifest=False, a
+    <name>.manifest.json with byte size, SHA-256 and row count is written next
+    to the file.
+
+        with AtomicWriter(path, compression='gzip') as out:
+            writer = csv.writer(out.file)
+            ...
+            out.rows = count
+    """
+
+    def __init__(self, path: Union[str, Path], text: bool = True, compression: Optional[str] = None,
+                 manifest: bool = True, encoding: str = 'utf-8'):
+        self.path = compressed_path(path, compression)
+        self.text = text
+        self.compression = compression
+        self.manifest = manifest
+        self.encoding = encoding
+        self.rows: Optional[int] = None
+        self.file = None
+
+        self._tmp_path: Optional[Path] = None
+        self._raw: Optional[io.FileIO] = None
+        self._hashing: Optional[_HashingFile] = None
+        self._buffer: Optional[io.BufferedWriter] = None
+        self._compressor = None
+
+    def __enter__(self) -> 'AtomicWriter':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix='.tmp', dir=str(self.path.parent))
+        self._tmp_path = Path(tmp_name)
+        try:
+            self._raw = io.FileIO(fd, 'wb')
+            self._hashing = _HashingFile(self._raw)
+            self._buffer = io.BufferedWriter(self._hashing, buffer_size=BUFFER_SIZE)
+            self._compressor = self._open_compressor(self._buffer)
+            binary = self._buffer if self._compressor is None else self._compressor
+            self.file = io.TextIOWrapper(binary, encoding=self.encoding, newline='') if self.text else binary
+        except Exception:
+            if self._raw is None:
+                os.close(fd)
+            self._discard()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self._discard()
+            return False
+        try:
+            self._finish()
+        except BaseException:
+            self._discard()
+            raise
+        # mkstemp creates the file as 0600; give it the mode a plain open() would have
+        os.chmod(self._tmp_path, _publish_mode(self.path))
+        os.replace(self._tmp_path, self.path)
+        _fsync_directory(self.path.parent)
+        if self.manifest:
+            write_manifest(self.path, self.manifest_data())
+        return False
+
+    def manifest_data(self) -> Dict[str, Any]:
+        """Manifest of the written file: name, size on disk, checksum, rows and compression"""
+        return {
+            'file': self.path.name,
+            'bytes': self._hashing.size,
+            'sha256': self._hashing.sha256.hexdigest(),
+            'rows': self.rows,
+            'compression': self.compression,
+            'created_at': datetime.now().isoformat(),
+        }
+
+    def _open_compressor(self, stream: io.BufferedWriter):
+        """Compressing binary stream over stream (which it leaves open), or None"""
+        if self.compression is None:
+            return None
+        if self.compression == 'gzip':
+            return gzip.GzipFile(filename=self.path.stem, mode='wb', fileobj=stream)
+        if self.compression == 'bz2':
+            return bz2.BZ2File(stream, mode='wb')
+        if self.compression == 'xz':
+            return lzma.LZMAFile(stream, mode='wb')
+        return _zstandard().ZstdCompressor().stream_writer(stream, closefd=False)
+
+    def _finish(self):
+        """Flush every layer down to disk and close the temp file"""
+        if self.text:
+            self.file.flush()
+            self.file.detach()
+        if self._compressor is not None:
+            self._compressor.close()
+        self._buffer.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+
+    def _discard(self):
+        """Close every layer, ignoring errors, and delete the temp file"""
+        for layer in (self.file if self.text else None, self._compressor, self._buffer, self._raw):
+            if layer is not None:
+                try:
+                    layer.close()
+                except Exception:
+                    pass
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class AtomicDirectory:
+    """Stages files written by another library, then moves them into place file by file
+
+    The staging directory is hidden (dot-prefixed) inside the target directory,
+    so dataset readers ignore it. On success each staged file is renamed into
+    the same relative location under the target and a manifest listing the
+    files is written as _manifest_<name>.json; on failure nothing is moved.
+    """
+
+    def __init__(self, path: Union[str, Path], manifest_name: Optional[str] = None):
+        self.path = Path(path)
+        self.manifest_name = manifest_name or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.rows: Optional[int] = None
+        self.staging_dir: Optional[Path] = None
+        self.files: List[Path] = []
+
+    def __enter__(self) -> 'AtomicDirectory':
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.staging_dir = Path(tempfile.mkdtemp(prefix='.staging_', dir=str(self.path)))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self._publish()
+        finally:
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+        return False
+
+    def _publish(self):
+        staged = sorted(p for p in self.staging_dir.rglob('*') if p.is_file())
+        if not staged:
+            return
+        entries = []
+        for source in staged:
+            with open(source, 'rb') as fh:
+                os.fsync(fh.fileno())
+            relative = source.relative_to(self.staging_dir)
+            target = self.path / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.chmod(source, _publish_mode(target))
+            os.replace(source, target)
+            _fsync_directory(target.parent)
+            self.files.append(target)
+            entries.append({'file': relative.as_posix(), 'bytes': target.stat().st_size})
+
+        manifest = {
+            'files': entries,
+            'bytes': sum(entry['bytes'] for entry in entries),
+            'rows': self.rows,
+            'created_at': datetime.now().isoformat(),
+        }
+        manifest_path = self.path / f"_manifest_{self.manifest_name}.json"
+        with AtomicWriter(manifest_path, manifest=False) as out:
+            json.dump(manifest, out.file, indent=2, ensure_ascii=False)
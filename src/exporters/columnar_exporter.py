@@ -0,0 +1,177 @@
+"""
+Columnar (Parquet / Arrow IPC) dataset export for leads
+"""
+import uuid
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence
+from datetime import datetime
+from loguru import logger
+
+from src.models.lead import Lead
+from src.exporters.atomic_writer import AtomicDirectory
+from config.settings import EXPORTS_DIR
+
+# Hive-style partition directories: platform=<platform>/scrape_date=<YYYY-MM-DD>
+PARTITION_COLUMNS = ('platform', 'scrape_date')
+
+# Export format -> (pyarrow dataset format, file extension)
+DATASET_FORMATS = {
+    'parquet': ('parquet', '.parquet'),
+    'arrow': ('ipc', '.arrow'),
+}
+
+# Leads converted to Arrow per record batch
+BATCH_SIZE = 50000
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError:
+        raise ImportError("pyarrow not installed. Run: pip install pyarrow")
+    return pyarrow
+
+
+@lru_cache(maxsize=1)
+def lead_schema():
+    """Arrow schema of an exported lead: typed lists and maps instead of joined strings"""
+    pa = _pyarrow()
+    return pa.schema([
+        ('name', pa.string()),
+        ('platform', pa.string()),
+        ('source_url', pa.string()),
+        ('website', pa.string()),
+        ('email', pa.string()),
+        ('phone', pa.string()),
+        ('address', pa.string()),
+        ('followers', pa.int64()),
+        ('engagement_rate', pa.float64()),
+        ('social_handles', pa.map_(pa.string(), pa.string())),
+        ('industry', pa.string()),
+        ('business_type', pa.string()),
+        ('pain_points', pa.list_(pa.string())),
+        ('lead_score', pa.int64()),
+        ('score_breakdown', pa.map_(pa.string(), pa.int64())),
+        ('scraped_at', pa.timestamp('us')),
+        ('last_updated', pa.timestamp('us')),
+        ('notes', pa.string()),
+        ('tags', pa.list_(pa.string())),
+        ('sources', pa.list_(pa.string())),
+        # Partition key derived from scraped_at
+        ('scrape_date', pa.date32()),
+    ])
+
+
+def leads_to_record_batch(leads: Sequence[Lead]):
+    """Convert leads to an Arrow record batch with lead_schema()"""
+    pa = _pyarrow()
+    schema = lead_schema()
+    columns = {name: [getattr(lead, name) for lead in leads] for name in Lead.FIELDS}
+    columns['social_handles'] = [
+        {key: str(value) for key, value in handles.items()} if handles else {}
+        for handles in columns['social_handles']
+    ]
+    columns['scrape_date'] = [scraped_at.date() for scraped_at in columns['scraped_at']]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(columns[field.name], type=field.type) for field in schema],
+        schema=schema
+    )
+
+
+class ColumnarExporter:
+    """Writes leads as a partitioned Parquet or Arrow IPC dataset
+
+    Each export adds files under output_dir/<dataset_name>/platform=.../scrape_date=...,
+    so repeated runs accumulate into one dataset and readers can prune by
+    partition and read only the columns they need. Files are staged in a hidden
+    directory and only moved into place, with a _manifest_<run id>.json,
+    once the whole export succeeded.
+    """
+
+    def __init__(self, output_dir: Path = EXPORTS_DIR):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+
+    def export_dataset(self, leads: Iterable[Lead], dataset_name: str = "leads_dataset",
+                       format: str = 'parquet', partition_by: Sequence[str] = PARTITION_COLUMNS,
+                       batch_size: int = BATCH_SIZE) -> str:
+        """Export leads from any iterable to a partitioned dataset, one record batch at a time"""
+        if format not in DATASET_FORMATS:
+            raise ValueError(f"Unsupported format: {format} (use one of {', '.join(DATASET_FORMATS)})")
+
+        pa = _pyarrow()
+        dataset_format, extension = DATASET_FORMATS[format]
+        dataset_path = self.output_dir / dataset_name
+        # Timestamp for ordering, random suffix so runs within one second never share file names
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex}"
+
+        try:
+            count = 0
+
+            def batches() -> Iterator:
+                nonlocal count
+                for batch in self._record_batches(leads, batch_size):
+                    count += batch.num_rows
+                    yield batch
+
+            # Files are staged and moved into the partitions only once all were written
+            with AtomicDirectory(dataset_path, manifest_name=run_id) as stage:
+                pa.dataset.write_dataset(
+                    batches(),
+                    str(stage.staging_dir),
+                    schema=lead_schema(),
+                    format=dataset_format,
+                    partitioning=self._partitioning(partition_by),
+                    # Unique file names per run, so exports append to the dataset instead of replacing it
+                    basename_template=f"leads_{run_id}_{{i}}{extension}",
+                    existing_data_behavior='overwrite_or_ignore'
+                )
+                stage.rows = count
+
+            if not count:
+                logger.warning("No leads to export")
+            else:
+                logger.info(f"Exported {count} leads to {format} dataset: {dataset_path}")
+            return str(dataset_path)
+
+        except Exception as e:
+            logger.error(f"Error exporting {format} dataset: {e}")
+            raise
+
+    def export_to_parquet(self, leads: Iterable[Lead], dataset_name: str = "leads_dataset") -> str:
+        """Export leads to a Parquet dataset partitioned by platform and scrape date"""
+        return self.export_dataset(leads, dataset_name, format='parquet')
+
+    def export_to_arrow(self, leads: Iterable[Lead], dataset_name: str = "leads_dataset") -> str:
+        """Export leads to an Arrow IPC dataset partitioned by platform and scrape date"""
+        return self.export_dataset(leads, dataset_name, format='arrow')
+
+    def open_dataset(self, dataset_name: str = "leads_dataset", format: str = 'parquet',
+                     partition_by: Sequence[str] = PARTITION_COLUMNS):
+        """Open an exported dataset for partition- and column-pruned reads"""
+        pa = _pyarrow()
+        return pa.dataset.dataset(
+            str(self.output_dir / dataset_name),
+            format=DATASET_FORMATS[format][0],
+            partitioning=self._partitioning(partition_by)
+        )
+
+    @staticmethod
+    def _partitioning(partition_by: Sequence[str]):
+        """Hive partitioning over the given lead_schema() columns"""
+        pa = _pyarrow()
+        schema = lead_schema()
+        return pa.dataset.partitioning(pa.schema([schema.field(name) for name in partition_by]), flavor='hive')
+
+    @staticmethod
+    def _record_batches(leads: Iterable[Lead], batch_size: int) -> Iterator:
+        """Record batches of up to batch_size leads"""
+        leads = iter(leads)
+        while True:
+            chunk: List[Lead] = list(islice(leads, batch_size))
+            if not chunk:
+                return
+            yield leads_to_record_batch(chunk)
@@ -2,12 +2,18 @@
 CRM integration for exporting leads to various CRM systems
 """
 import json
-import requests
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from loguru import logger
 
 from src.models.lead import Lead
+from src.exporters.export_state import ExportState
+from src.exporters.atomic_writer import AtomicWriter
+from src.exporters.crm_http import BatchResult, ItemError
+from src.exporters.hubspot_client import HubSpotClient, HUBSPOT_API_URL
+from src.exporters.pipedrive_client import PipedriveClient, PersonInput
+from src.exporters.asana_client import AsanaClient, ASANA_API_URL
+from src.utils.deduplication import is_shared_host, normalize_domain, normalize_name
 from config.settings import CRM_CONFIGS
 
 
@@ -16,42 +22,18 @@ class CRMExporter:
     
     def __init__(self):
         self.crm_configs = CRM_CONFIGS
+        self._pipedrive_clients: Dict[tuple, PipedriveClient] = {}
+        self._asana_clients: Dict[tuple, AsanaClient] = {}
     
     def export_to_airtable(self, leads: List[Lead], base_id: str = None, table_name: str = "Leads") -> bool:
         """Export leads to Airtable"""
         try:
-            from airtable import Airtable
-            
-            api_key = self.crm_configs['airtable']['api_key']
-            base_id = base_id or self.crm_configs['airtable']['base_id']
-            
-            if not api_key or not base_id:
-                logger.error("Airtable API key or base ID not configured")
+            result = self.insert_airtable_records(leads, base_id, table_name)
+            if result is None:
                 return False
             
-            airtable = Airtable(base_id, table_name, api_key)
-            
-            # Convert leads to Airtable format
-            records = []
-            for lead in leads:
-                record = self._format_lead_for_airtable(lead)
-                records.append(record)
-            
-            # Batch insert (Airtable allows max 10 records per batch)
-            batch_size = 10
-            total_inserted = 0
-            
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                try:
-                    result = airtable.batch_insert(batch)
-                    total_inserted += len(result)
-                    logger.info(f"Inserted batch of {len(result)} records to Airtable")
-                except Exception as e:
-                    logger.error(f"Error inserting batch to Airtable: {e}")
-            
-            logger.info(f"Successfully exported {total_inserted} leads to Airtable")
-            return total_inserted > 0
+            logger.info(f"Successfully exported {result.succeeded} leads to Airtable")
+            return result.succeeded > 0
             
         except ImportError:
             logger.error("airtable-python-wrapper not installed. Run: pip install airtable-python-wrapper")
@@ -60,193 +42,170 @@ class CRMExporter:
             logger.error(f"Error exporting to Airtable: {e}")
             return False
     
+    def insert_airtable_records(self, leads: List[Lead], base_id: str = None,
+                                table_name: str = "Leads") -> Optional[BatchResult]:
+        """Insert leads as Airtable records; None if Airtable is not configured"""
+        from airtable import Airtable
+        
+        api_key = self.crm_configs['airtable'].get('api_key')
+        base_id = base_id or self.crm_configs['airtable'].get('base_id')
+        
+        if not api_key or not base_id:
+            logger.error("Airtable API key or base ID not configured")
+            return None
+        
+        airtable = Airtable(base_id, table_name, api_key)
+        records = [self._format_lead_for_airtable(lead) for lead in leads]
+        
+        # Batch insert (Airtable allows max 10 records per batch)
+        batch_size = 10
+        total_inserted = 0
+        errors = []
+        
+        for i in range(0, len(records), batch_size):
+            batch = records[i:i + batch_size]
+            try:
+                result = airtable.batch_insert(batch)
+                total_inserted += len(result)
+                logger.info(f"Inserted batch of {len(result)} records to Airtable")
+            except Exception as e:
+                logger.error(f"Error inserting batch to Airtable: {e}")
+                errors.extend(ItemError(record['Name'], None, str(e), i + j) for j, record in enumerate(batch))
+        
+        return BatchResult(total_inserted, errors)
+    
     def export_to_hubspot(self, leads: List[Lead]) -> bool:
         """Export leads to HubSpot"""
         try:
-            import hubspot
-            from hubspot.crm.contacts import SimplePublicObjectInput
-            
-            api_key = self.crm_configs['hubspot']['api_key']
-            
-            if not api_key:
-                logger.error("HubSpot API key not configured")
+            result = self.upsert_hubspot_contacts(leads)
+            if result is None:
                 return False
             
-            client = hubspot.Client.create(access_token=api_key)
-            
-            total_inserted = 0
-            
-            for lead in leads:
-                try:
-                    contact_data = self._format_lead_for_hubspot(lead)
-                    simple_public_object_input = SimplePublicObjectInput(properties=contact_data)
-                    
-                    api_response = client.crm.contacts.basic_api.create(
-                        simple_public_object_input=simple_public_object_input
-                    )
-                    
-                    total_inserted += 1
-                    logger.debug(f"Created HubSpot contact: {lead.name}")
-                    
-                except Exception as e:
-                    logger.warning(f"Error creating HubSpot contact for {lead.name}: {e}")
+            for error in result.errors:
+                logger.warning(f"HubSpot rejected contact {error.key or '(unnamed)'}: {error.message}")
             
-            logger.info(f"Successfully exported {total_inserted} leads to HubSpot")
-            return total_inserted > 0
+            logger.info(f"Successfully exported {result.succeeded} leads to HubSpot")
+            return result.succeeded > 0
             
-        except ImportError:
-            logger.error("hubspot-api-client not installed. Run: pip install hubspot-api-client")
-            return False
         except Exception as e:
             logger.error(f"Error exporting to HubSpot: {e}")
             return False
     
-    def export_to_pipedrive(self, leads: List[Lead]) -> bool:
+    def upsert_hubspot_contacts(self, leads: List[Lead], max_workers: int = 4) -> Optional[BatchResult]:
+        """Upsert leads as HubSpot contacts in batches, keyed by email; None if HubSpot is not configured
+        
+        Set crm_configs['hubspot']['base_url'] to send the requests elsewhere, e.g. to a local mock.
+        """
+        config = self.crm_configs['hubspot']
+        api_key = config.get('api_key')
+        
+        if not api_key:
+            logger.error("HubSpot API key not configured")
+            return None
+        
+        with HubSpotClient(api_key, config.get('base_url') or HUBSPOT_API_URL, max_workers=max_workers) as client:
+            return client.upsert_contacts([self._format_lead_for_hubspot(lead) for lead in leads])
+    
+    def export_to_pipedrive(self, leads: List[Lead], max_workers: int = 8) -> bool:
         """Export leads to Pipedrive"""
         try:
-            api_token = self.crm_configs['pipedrive']['api_token']
-            company_domain = self.crm_configs['pipedrive']['company_domain']
-            
-            if not api_token or not company_domain:
-                logger.error("Pipedrive API token or domain not configured")
+            result = self.create_pipedrive_persons(leads, max_workers)
+            if result is None:
                 return False
             
-            base_url = f"https://{company_domain}.pipedrive.com/api/v1"
-            headers = {'Content-Type': 'application/json'}
+            for error in result.errors:
+                logger.warning(f"Failed to create Pipedrive person for {error.key}: {error.message}")
             
-            total_inserted = 0
-            
-            for lead in leads:
-                try:
-                    person_data = self._format_lead_for_pipedrive(lead)
-                    
-                    # Create person in Pipedrive
-                    response = requests.post(
-                        f"{base_url}/persons?api_token={api_token}",
-                        headers=headers,
-                        json=person_data
-                    )
-                    
-                    if response.status_code == 201:
-                        total_inserted += 1
-                        logger.debug(f"Created Pipedrive person: {lead.name}")
-                    else:
-                        logger.warning(f"Failed to create Pipedrive person for {lead.name}: {response.text}")
-                        
-                except Exception as e:
-                    logger.warning(f"Error creating Pipedrive person for {lead.name}: {e}")
-            
-            logger.info(f"Successfully exported {total_inserted} leads to Pipedrive")
-            return total_inserted > 0
+            logger.info(f"Successfully exported {result.succeeded} leads to Pipedrive")
+            return result.succeeded > 0
             
         except Exception as e:
             logger.error(f"Error exporting to Pipedrive: {e}")
             return False
     
-    def export_to_asana(self, leads: List[Lead], project_name: str = "Lead Generation") -> bool:
+    def create_pipedrive_persons(self, leads: List[Lead], max_workers: int = 8) -> Optional[BatchResult]:
+        """Create leads as Pipedrive persons linked to their organizations; None if Pipedrive is not configured
+        
+        The client is kept per exporter, so organizations resolved by one export
+        are reused by the next. Set crm_configs['pipedrive']['base_url'] to send
+        the requests elsewhere, e.g. to a local mock.
+        """
+        config = self.crm_configs['pipedrive']
+        api_token = config.get('api_token')
+        company_domain = config.get('company_domain')
+        
+        if not api_token or not (company_domain or config.get('base_url')):
+            logger.error("Pipedrive API token or domain not configured")
+            return None
+        
+        persons = [
+            PersonInput(self._format_lead_for_pipedrive(lead), self._pipedrive_org_key(lead), lead.name)
+            for lead in leads
+        ]
+        
+        client = self._pipedrive_client(api_token, company_domain, config.get('base_url'), max_workers)
+        return client.create_persons(persons)
+    
+    def _pipedrive_client(self, api_token: str, company_domain: Optional[str], base_url: Optional[str],
+                          max_workers: int) -> PipedriveClient:
+        """Client kept for the exporter's lifetime, so its organization cache carries over"""
+        key = (api_token, company_domain, base_url, max_workers)
+        if key not in self._pipedrive_clients:
+            self._pipedrive_clients[key] = PipedriveClient(api_token, company_domain, base_url=base_url,
+                                                           max_workers=max_workers)
+        return self._pipedrive_clients[key]
+    
+    def export_to_asana(self, leads: List[Lead], project_name: str = "Lead Generation", max_workers: int = 8,
+                        use_batch_api: bool = False) -> bool:
         """Export leads to Asana as tasks using REST API"""
         try:
-            access_token = self.crm_configs['asana']['access_token']
-
-            if not access_token:
-                logger.error("Asana access token not configured")
-                return False
-
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-
-            # Get user info
-            me_response = requests.get('https://app.asana.com/api/1.0/users/me', headers=headers)
-            if me_response.status_code != 200:
-                logger.error(f"Failed to connect to Asana: {me_response.status_code}")
-                return False
-
-            me = me_response.json()['data']
-            logger.info(f"Connected to Asana as: {me['name']}")
-
-            # Get workspaces
-            workspaces_response = requests.get('https://app.asana.com/api/1.0/workspaces', headers=headers)
-            if workspaces_response.status_code != 200:
-                logger.error("Failed to get Asana workspaces")
+            result = self.create_asana_tasks(leads, project_name, max_workers, use_batch_api)
+            if result is None:
                 return False
 
-            workspaces = workspaces_response.json()['data']
-            if not workspaces:
-                logger.error("No Asana workspaces found")
-                return False
-
-            workspace_gid = workspaces[0]['gid']
-            logger.info(f"Using workspace: {workspaces[0]['name']}")
-
-            # Find or create project
-            projects_response = requests.get(
-                f'https://app.asana.com/api/1.0/projects?workspace={workspace_gid}',
-                headers=headers
-            )
-
-            project_gid = None
-            if projects_response.status_code == 200:
-                projects = projects_response.json()['data']
-                for project in projects:
-                    if project['name'] == project_name:
-                        project_gid = project['gid']
-                        logger.info(f"Found existing project: {project_name}")
-                        break
-
-            if not project_gid:
-                # Create new project
-                project_data = {
-                    'data': {
-                        'name': project_name,
-                        'workspace': workspace_gid,
-                        'notes': 'Automatically generated leads from Instant Data Scraper'
-                    }
-                }
-
-                create_response = requests.post(
-                    'https://app.asana.com/api/1.0/projects',
-                    headers=headers,
-                    json=project_data
-                )
-
-                if create_response.status_code == 201:
-                    project_gid = create_response.json()['data']['gid']
-                    logger.info(f"Created new project: {project_name}")
-                else:
-                    logger.error(f"Failed to create project: {create_response.status_code}")
-                    return False
-
-            # Create tasks for each lead
-            total_created = 0
-
-            for lead in leads:
-                try:
-                    task_data = self._format_lead_for_asana_api(lead, project_gid)
-
-                    task_response = requests.post(
-                        'https://app.asana.com/api/1.0/tasks',
-                        headers=headers,
-                        json={'data': task_data}
-                    )
-
-                    if task_response.status_code == 201:
-                        total_created += 1
-                        logger.debug(f"Created Asana task: {lead.name}")
-                    else:
-                        logger.warning(f"Failed to create task for {lead.name}: {task_response.status_code}")
-
-                except Exception as e:
-                    logger.warning(f"Error creating Asana task for {lead.name}: {e}")
+            for error in result.errors:
+                logger.warning(f"Failed to create Asana task {error.key}: {error.status} {error.message}")
 
-            logger.info(f"Successfully exported {total_created} leads to Asana project: {project_name}")
-            return total_created > 0
+            logger.info(f"Successfully exported {result.succeeded} leads to Asana project: {project_name}")
+            return result.succeeded > 0
 
         except Exception as e:
             logger.error(f"Error exporting to Asana: {e}")
             return False
 
+    def create_asana_tasks(self, leads: List[Lead], project_name: str = "Lead Generation", max_workers: int = 8,
+                           use_batch_api: bool = False) -> Optional[BatchResult]:
+        """Create one Asana task per lead in a project; None if Asana is not configured
+
+        The workspace (crm_configs['asana']['workspace_gid'], else the first one)
+        and project GIDs are looked up once per exporter and reused by later
+        exports. Tasks are created max_workers at a time, or ten per request with
+        use_batch_api. Set crm_configs['asana']['base_url'] to send the requests
+        elsewhere, e.g. to a local mock.
+        """
+        config = self.crm_configs['asana']
+        access_token = config.get('access_token')
+
+        if not access_token:
+            logger.error("Asana access token not configured")
+            return None
+
+        client = self._asana_client(access_token, config.get('base_url') or ASANA_API_URL, max_workers)
+        workspace_gid = client.workspace_gid(config.get('workspace_gid'))
+        project_gid = client.project_gid(project_name, workspace_gid,
+                                         notes='Automatically generated leads from Instant Data Scraper')
+
+        today = datetime.now()
+        tasks = [self._format_lead_for_asana(lead, project_gid, today) for lead in leads]
+        return client.create_tasks(tasks, use_batch_api=use_batch_api)
+
+    def _asana_client(self, access_token: str, base_url: str, max_workers: int) -> AsanaClient:
+        """Client kept for the exporter's lifetime, so its workspace/project GID cache carries over"""
+        key = (access_token, base_url, max_workers)
+        if key not in self._asana_clients:
+            self._asana_clients[key] = AsanaClient(access_token, base_url, max_workers=max_workers)
+        return self._asana_clients[key]
+
     def export_to_google_sheets(self, leads: List[Lead], spreadsheet_id: str, sheet_name: str = "Leads") -> bool:
         """Export leads to Google Sheets"""
         try:
@@ -282,9 +241,10 @@ class CRMExporter:
             csv_path = Path("exports") / f"google_sheets_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
             csv_path.parent.mkdir(exist_ok=True)
             
-            with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
+            with AtomicWriter(csv_path) as out:
+                writer = csv.writer(out.file)
                 writer.writerows(rows)
+                out.rows = len(rows) - 1
             
             logger.info(f"Created CSV for Google Sheets import: {csv_path}")
             return True
@@ -340,162 +300,59 @@ class CRMExporter:
         # Remove empty values
         return {k: v for k, v in properties.items() if v}
     
-    def _format_lead_for_asana_api(self, lead: Lead, project_gid: str) -> Dict[str, Any]:
-        """Format lead data for Asana REST API"""
-        # Create task name
-        task_name = f"Lead: {lead.name}"
-
-        # Create task notes with all lead information
-        notes_parts = [
-            f"**Lead Information**",
-            f"Name: {lead.name}",
-            f"Platform: {lead.platform}",
-            f"Industry: {lead.industry or 'Not specified'}",
-            f"Lead Score: {lead.lead_score}/100",
-            "",
-            f"**Contact Information**",
-            f"Email: {lead.email or 'Not available'}",
-            f"Phone: {lead.phone or 'Not available'}",
-            f"Website: {lead.website or 'Not available'}",
-            f"Address: {lead.address or 'Not available'}",
-            "",
-            f"**Social Media**",
-            f"Followers: {lead.followers or 'Unknown'}",
-            f"Engagement Rate: {lead.engagement_rate*100:.1f}%" if lead.engagement_rate else "Engagement Rate: Unknown",
-        ]
-
-        if lead.social_handles:
-            notes_parts.append("Social Handles:")
-            for platform, handle in lead.social_handles.items():
-                notes_parts.append(f"  - {platform.title()}: {handle}")
-
-        if lead.pain_points:
-            notes_parts.extend([
-                "",
-                f"**Pain Points**",
-                ", ".join([pp.replace('_', ' ').title() for pp in lead.pain_points])
-            ])
-
-        notes_parts.extend([
-            "",
-            f"**Source**",
-            f"URL: {lead.source_url}",
-            f"Scraped: {lead.scraped_at.strftime('%Y-%m-%d %H:%M')}",
-        ])
-
-        if lead.notes:
-            notes_parts.extend([
-                "",
-                f"**Additional Notes**",
-                lead.notes
-            ])
-
-        notes = "\n".join(notes_parts)
-
-        # Create task data for API
-        task_data = {
-            'name': task_name,
-            'notes': notes,
-            'projects': [project_gid]
-        }
-
-        # Add due date (7 days from now for high priority, 14 days for others)
-        from datetime import datetime, timedelta
-        if lead.lead_score >= 70:
-            due_date = datetime.now() + timedelta(days=7)
-        else:
-            due_date = datetime.now() + timedelta(days=14)
-
-        task_data['due_on'] = due_date.strftime('%Y-%m-%d')
-
-        return task_data
-
-    def _format_lead_for_asana(self, lead: Lead, project_gid: str) -> Dict[str, Any]:
-        """Format lead data for Asana task"""
-        # Create task name
-        task_name = f"Lead: {lead.name}"
-
-        # Create task notes with all lead information
+    def _format_lead_for_asana(self, lead: Lead, project_gid: str, today: Optional[datetime] = None) -> Dict[str, Any]:
+        """Format lead data for an Asana task (pass today to share one clock read across a batch)"""
         notes_parts = [
-            f"**Lead Information**",
+            "**Lead Information**",
             f"Name: {lead.name}",
             f"Platform: {lead.platform}",
             f"Industry: {lead.industry or 'Not specified'}",
             f"Lead Score: {lead.lead_score}/100",
             "",
-            f"**Contact Information**",
+            "**Contact Information**",
             f"Email: {lead.email or 'Not available'}",
             f"Phone: {lead.phone or 'Not available'}",
             f"Website: {lead.website or 'Not available'}",
             f"Address: {lead.address or 'Not available'}",
             "",
-            f"**Social Media**",
+            "**Social Media**",
             f"Followers: {lead.followers or 'Unknown'}",
             f"Engagement Rate: {lead.engagement_rate*100:.1f}%" if lead.engagement_rate else "Engagement Rate: Unknown",
         ]
 
         if lead.social_handles:
             notes_parts.append("Social Handles:")
-            for platform, handle in lead.social_handles.items():
-                notes_parts.append(f"  - {platform.title()}: {handle}")
+            notes_parts.extend(f"  - {platform.title()}: {handle}" for platform, handle in lead.social_handles.items())
 
         if lead.pain_points:
-            notes_parts.extend([
-                "",
-                f"**Pain Points**",
-                ", ".join([pp.replace('_', ' ').title() for pp in lead.pain_points])
-            ])
+            notes_parts.extend(["", "**Pain Points**", ", ".join(pp.replace('_', ' ').title() for pp in lead.pain_points)])
 
         notes_parts.extend([
             "",
-            f"**Source**",
+            "**Source**",
             f"URL: {lead.source_url}",
             f"Scraped: {lead.scraped_at.strftime('%Y-%m-%d %H:%M')}",
         ])
 
         if lead.notes:
-            notes_parts.extend([
-                "",
-                f"**Additional Notes**",
-                lead.notes
-            ])
-
-        notes = "\n".join(notes_parts)
+            notes_parts.extend(["", "**Additional Notes**", lead.notes])
 
-        # Determine task priority based on lead score
-        if lead.lead_score >= 80:
-            priority = "high"
-        elif lead.lead_score >= 60:
-            priority = "medium"
-        else:
-            priority = "low"
+        # Due in 7 days for high-scoring leads, 14 for others
+        due_date = (today or datetime.now()) + timedelta(days=7 if lead.lead_score >= 70 else 14)
 
-        # Create task data
-        task_data = {
-            'name': task_name,
-            'notes': notes,
+        return {
+            'name': f"Lead: {lead.name}",
+            'notes': "\n".join(notes_parts),
             'projects': [project_gid],
-            'priority': priority
+            'due_on': due_date.strftime('%Y-%m-%d'),
         }
 
-        # Add due date (7 days from now for high priority, 14 days for others)
-        from datetime import datetime, timedelta
-        if lead.lead_score >= 70:
-            due_date = datetime.now() + timedelta(days=7)
-        else:
-            due_date = datetime.now() + timedelta(days=14)
-
-        task_data['due_on'] = due_date.strftime('%Y-%m-%d')
-
-        return task_data
-
     def _format_lead_for_pipedrive(self, lead: Lead) -> Dict[str, Any]:
         """Format lead data for Pipedrive"""
         return {
             'name': lead.name,
             'email': [{'value': lead.email, 'primary': True}] if lead.email else [],
             'phone': [{'value': lead.phone, 'primary': True}] if lead.phone else [],
-            'org_id': None,  # Would need to create/find organization first
             'visible_to': '3',  # Visible to entire company
             'add_time': lead.scraped_at.isoformat(),
             'custom_fields': {
@@ -508,6 +365,15 @@ class CRMExporter:
             }
         }
     
+    @staticmethod
+    def _pipedrive_org_key(lead: Lead) -> Optional[str]:
+        """Organization key of a lead: its own website domain, else its normalized business name"""
+        domain = normalize_domain(lead.website)
+        if domain and not is_shared_host(domain):
+            return f"domain:{domain}"
+        name = normalize_name(lead.name)
+        return f"name:{name}" if name else None
+    
     def export_to_multiple_crms(self, leads: List[Lead], crm_list: List[str]) -> Dict[str, bool]:
         """Export leads to multiple CRM systems"""
         results = {}
@@ -534,6 +400,67 @@ class CRMExporter:
 
         return results
     
+    def export_batch(self, leads: List[Lead], crm_name: str) -> BatchResult:
+        """Export leads to one CRM and report which of them were not delivered
+        
+        Each ItemError's index is the position of its lead in leads. If the CRM
+        is unknown or not configured, or the export fails as a whole, every lead
+        is reported.
+        """
+        crm = crm_name.lower()
+        message = f"Export to {crm_name} failed"
+        try:
+            if crm == 'airtable':
+                result = self.insert_airtable_records(leads)
+            elif crm == 'hubspot':
+                result = self.upsert_hubspot_contacts(leads)
+            elif crm == 'pipedrive':
+                result = self.create_pipedrive_persons(leads)
+            elif crm == 'asana':
+                result = self.create_asana_tasks(leads)
+            elif crm == 'google_sheets':
+                result = BatchResult(len(leads), []) if self.export_to_google_sheets(leads, '') else None
+            else:
+                logger.warning(f"Unknown CRM system: {crm_name}")
+                result = None
+        except Exception as e:
+            logger.error(f"Error exporting to {crm_name}: {e}")
+            message = str(e)
+            result = None
+        
+        if result is None:
+            return BatchResult(0, [ItemError(lead.name, None, message, i) for i, lead in enumerate(leads)])
+        return result
+    
+    def export_delta(self, leads: List[Lead], crm_name: str, state: Optional[ExportState] = None) -> bool:
+        """Export only leads that are new or changed since the last export to a CRM
+        
+        Only the leads the CRM accepted are recorded as shipped; rejected or
+        failed ones stay pending and are retried by the next delta export.
+        """
+        target = f"crm:{crm_name.lower()}"
+        owns_state = state is None
+        state = state or ExportState()
+        try:
+            delta = state.pending(target, leads)
+            if not delta:
+                logger.info(f"No new or changed leads to export to {crm_name}")
+                return True
+            
+            result = self.export_batch(delta, crm_name)
+            failed = {error.index for error in result.errors}
+            # An error that names no lead cannot be attributed: keep the whole delta pending
+            shipped = [] if None in failed else [lead for i, lead in enumerate(delta) if i not in failed]
+            if shipped:
+                state.mark_shipped(target, shipped, crm_name)
+            if len(shipped) < len(delta):
+                logger.warning(f"{len(delta) - len(shipped)} of {len(delta)} leads were not delivered to {crm_name} "
+                               f"and stay pending")
+            return bool(shipped)
+        finally:
+            if owns_state:
+                state.close()
+    
     def validate_crm_config(self, crm_name: str) -> bool:
         """Validate CRM configuration"""
         if crm_name.lower() not in self.crm_configs:
@@ -0,0 +1,178 @@
+"""
+Shared HTTP plumbing for CRM exporters: pooled sessions, retries with backoff, batch results
+"""
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, NamedTuple, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from loguru import logger
+
+# Statuses worth retrying: rate limits and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Statuses that mean the server did not act on a request, so even a create can be resent
+NOT_APPLIED_STATUSES = {429}
+
+# Methods that can be repeated without changing the outcome
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+# Longest wait between attempts (seconds), whatever Retry-After asks for
+MAX_BACKOFF = 60
+
+
+class ItemError(NamedTuple):
+    """An item a CRM rejected: its key (email, name, ...), the HTTP status, the reason and its input position
+
+    index is the item's position in the list passed to the client, so callers
+    can tell exactly which of their records were not delivered.
+    """
+
+    key: Optional[str]
+    status: Optional[int]
+    message: str
+    index: Optional[int] = None
+
+
+class BatchResult(NamedTuple):
+    """Outcome of a batched export"""
+
+    succeeded: int
+    errors: List[ItemError]
+
+    @classmethod
+    def combine(cls, results: Iterable['BatchResult']) -> 'BatchResult':
+        succeeded, errors = 0, []
+        for result in results:
+            succeeded += result.succeeded
+            errors.extend(result.errors)
+        return cls(succeeded, errors)
+
+
+class RateLimitGate:
+    """Pauses every thread sharing it once the server reports its request quota used up
+
+    Reads the X-RateLimit-Remaining / X-RateLimit-Reset headers (reset in
+    seconds) that Pipedrive and similar APIs send, and holds new requests until
+    the window resets instead of letting them fail with 429.
+    """
+
+    def __init__(self, min_remaining: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.min_remaining = min_remaining
+        self.clock = clock
+        self.sleep = sleep
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the current rate-limit window allows requests again"""
+        while True:
+            with self._lock:
+                delay = self._resume_at - self.clock()
+            if delay <= 0:
+                return
+            self.sleep(min(delay, MAX_BACKOFF))
+
+    def pause(self, seconds: float):
+        """Hold all requests for seconds (e.g. after a Retry-After)"""
+        with self._lock:
+            self._resume_at = max(self._resume_at, self.clock() + seconds)
+
+    def update(self, response: requests.Response):
+        """Track the quota reported by a response"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            if int(remaining) < self.min_remaining:
+                self.pause(float(reset))
+        except ValueError:
+            pass
+
+
+def create_session(pool_size: int = 8, headers: Optional[dict] = None) -> requests.Session:
+    """Keep-alive session whose connection pool serves pool_size concurrent requests"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header (delta seconds or HTTP date)"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _not_sent(error: requests.RequestException) -> bool:
+    """Whether a request failed while connecting, i.e. before the server could see it"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def request_with_backoff(session: requests.Session, method: str, url: str, max_retries: int = 5,
+                         backoff: float = 1.0, timeout: float = 30,
+                         sleep: Callable[[float], None] = time.sleep,
+                         rate_limit: Optional[RateLimitGate] = None, idempotent: Optional[bool] = None,
+                         **kwargs) -> requests.Response:
+    """Send a request, retrying rate limits, transient errors and connection failures
+
+    Waits as long as Retry-After says when the server sends it, otherwise
+    backoff * 2^attempt with jitter. With a rate_limit gate, requests also wait
+    out an exhausted quota and a Retry-After pauses every thread sharing the
+    gate. Returns the last response (which may still be an error) or raises the
+    last connection error once retries run out.
+
+    Requests that are not idempotent (by default every POST/PATCH; pass
+    idempotent=True for e.g. an upsert) are retried only when the server cannot
+    have applied them: on 429 and on failures to connect. A timeout, dropped
+    connection or 5xx after sending may have created the record already, so
+    resending could duplicate it.
+    """
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+    retry_statuses = RETRY_STATUSES if idempotent else NOT_APPLIED_STATUSES
+
+    for attempt in range(max_retries + 1):
+        if rate_limit is not None:
+            rate_limit.wait()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == max_retries or not (idempotent or _not_sent(e)):
+                raise
+            delay = backoff * 2 ** attempt
+            logger.debug(f"{method} {url} failed ({e}), retrying in {delay:.1f}s")
+        else:
+            if rate_limit is not None:
+                rate_limit.update(response)
+            if response.status_code not in retry_statuses or attempt == max_retries:
+                return response
+            delay = retry_after(response)
+            if delay is None:
+                delay = backoff * 2 ** attempt
+            elif rate_limit is not None:
+                rate_limit.pause(delay)
+            logger.debug(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+
+        sleep(min(delay * (1 + random.random() * 0.1), MAX_BACKOFF))
@@ -4,13 +4,26 @@ CSV and Excel export functionality for leads
 import csv
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Union
 from datetime import datetime
 from loguru import logger
 
 from src.models.lead import Lead
+from src.utils.lead_analytics import LeadAnalytics
+from src.exporters.export_state import ExportState
+from src.exporters.atomic_writer import AtomicWriter, compressed_path
 from config.settings import EXPORTS_DIR
 
+# Columns of a CSV export: the full Lead schema, sorted as earlier exports were
+CSV_FIELDNAMES = tuple(sorted(Lead.FIELDS))
+
+# Rows written per writerows() call for streamed exports
+CSV_CHUNK_SIZE = 5000
+
+# Excel column width cap (characters) and rows converted per chunk when streaming sheets
+EXCEL_MAX_COLUMN_WIDTH = 50
+EXCEL_CHUNK_SIZE = 5000
+
 
 class CSVExporter:
     """Handles CSV and Excel export of leads"""
@@ -21,42 +34,97 @@ class CSVExporter:
     
     def export_to_csv(self, leads: List[Lead], filename: str = None) -> str:
         """Export leads to CSV file"""
+        return self.export_to_csv_stream(leads, filename)
+    
+    def export_to_csv_stream(self, leads: Iterable[Union[Lead, Dict[str, Any]]], filename: str = None,
+                             compression: Optional[str] = None, chunk_size: int = CSV_CHUNK_SIZE) -> str:
+        """Export leads from any iterable or generator to CSV in constant memory
+        
+        The header is the fixed Lead schema, so nothing has to be scanned up front;
+        rows are written in chunks of chunk_size. compression ('gzip', 'bz2', 'xz'
+        or 'zstd') compresses on the fly and appends the matching suffix to the
+        filename. The file is written atomically with a manifest alongside.
+        """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"leads_export_{timestamp}.csv"
         
-        filepath = self.output_dir / filename
+        filepath = compressed_path(self.output_dir / filename, compression)
         
         try:
-            # Convert leads to dictionaries
-            lead_data = [lead.to_dict() for lead in leads]
-            
-            if not lead_data:
+            rows = (self._csv_row(lead) for lead in leads)
+            first = next(rows, None)
+            if first is None:
                 logger.warning("No leads to export")
                 return str(filepath)
             
-            # Get all possible fieldnames
-            fieldnames = set()
-            for lead_dict in lead_data:
-                fieldnames.update(lead_dict.keys())
+            count = 0
+            with AtomicWriter(filepath, compression=compression) as out:
+                writer = csv.writer(out.file)
+                writer.writerow(CSV_FIELDNAMES)
+                chunk = [first]
+                for row in rows:
+                    chunk.append(row)
+                    if len(chunk) >= chunk_size:
+                        writer.writerows(chunk)
+                        count += len(chunk)
+                        chunk = []
+                writer.writerows(chunk)
+                count += len(chunk)
+                out.rows = count
             
-            fieldnames = sorted(list(fieldnames))
-            
-            # Write CSV
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(lead_data)
-            
-            logger.info(f"Exported {len(leads)} leads to CSV: {filepath}")
+            logger.info(f"Exported {count} leads to CSV: {filepath}")
             return str(filepath)
             
         except Exception as e:
             logger.error(f"Error exporting to CSV: {e}")
             raise
     
+    def export_delta_to_csv(self, leads: List[Lead], target: str = 'csv', filename: str = None,
+                            compression: Optional[str] = None, state: Optional[ExportState] = None) -> Optional[str]:
+        """Export only leads that are new or changed since the last export to target
+        
+        Shipped leads are recorded in the export state once the file is written;
+        returns None when there is nothing to export.
+        """
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"leads_delta_{target}_{timestamp}.csv"
+        
+        owns_state = state is None
+        state = state or ExportState()
+        try:
+            delta = state.pending(target, leads)
+            if not delta:
+                logger.info(f"No new or changed leads to export to {target}")
+                return None
+            
+            filepath = self.export_to_csv_stream(delta, filename, compression)
+            state.mark_shipped(target, delta, filepath)
+            return filepath
+        finally:
+            if owns_state:
+                state.close()
+    
+    @staticmethod
+    def _csv_row(lead: Union[Lead, Dict[str, Any]]) -> tuple:
+        """Values of a lead (or its to_dict() form) in header order"""
+        data = lead.to_dict() if isinstance(lead, Lead) else lead
+        return tuple(data.get(name) for name in CSV_FIELDNAMES)
+    
     def export_to_excel(self, leads: List[Lead], filename: str = None, include_analytics: bool = True) -> str:
         """Export leads to Excel file with multiple sheets"""
+        # Convert leads to DataFrame
+        df_leads = pd.DataFrame([lead.to_dict() for lead in leads])
+        return self.export_frame_to_excel(df_leads, filename, include_analytics)
+    
+    def export_frame_to_excel(self, df_leads: pd.DataFrame, filename: str = None, include_analytics: bool = True,
+                              analytics: Optional[LeadAnalytics] = None) -> str:
+        """Export leads already converted to a DataFrame of to_dict() rows to Excel
+        
+        Pass the leads' analytics aggregate if it is already maintained; otherwise
+        it is computed from the DataFrame.
+        """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"leads_export_{timestamp}.xlsx"
@@ -64,27 +132,17 @@ class CSVExporter:
         filepath = self.output_dir / filename
         
         try:
-            # Convert leads to DataFrame
-            lead_data = [lead.to_dict() for lead in leads]
-            df_leads = pd.DataFrame(lead_data)
-            
             if df_leads.empty:
                 logger.warning("No leads to export")
                 return str(filepath)
             
-            # Create Excel writer
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Main leads sheet
-                df_leads.to_excel(writer, sheet_name='Leads', index=False)
-                
-                if include_analytics:
-                    # Analytics sheets
-                    self._add_analytics_sheets(writer, df_leads)
-                
-                # Format sheets
-                self._format_excel_sheets(writer, df_leads)
+            sheets = {'Leads': df_leads}
+            if include_analytics:
+                sheets.update(self._analytics_frames(analytics or LeadAnalytics.from_frame(df_leads)))
             
-            logger.info(f"Exported {len(leads)} leads to Excel: {filepath}")
+            self._write_workbook(filepath, sheets, formatted={'Leads'}, rows=len(df_leads))
+            
+            logger.info(f"Exported {len(df_leads)} leads to Excel: {filepath}")
             return str(filepath)
             
         except Exception as e:
@@ -127,107 +185,98 @@ class CSVExporter:
         logger.info(f"Exporting {len(high_score_leads)} leads with score >= {min_score}")
         return self.export_to_excel(high_score_leads, filename)
     
-    def _add_analytics_sheets(self, writer: pd.ExcelWriter, df_leads: pd.DataFrame):
-        """Add analytics sheets to Excel export"""
-        try:
-            if 'platform' in df_leads.columns:
-                # Platform distribution
-                platform_stats = df_leads['platform'].value_counts().reset_index()
-                platform_stats.columns = ['Platform', 'Count']
-                platform_stats.to_excel(writer, sheet_name='Platform Stats', index=False)
-            else:
-                pd.DataFrame({'Platform': [], 'Count': []}).to_excel(writer, sheet_name='Platform Stats', index=False)
-            
-            # Lead score distribution
-            if 'lead_score' in df_leads.columns:
-                score_ranges = pd.cut(df_leads['lead_score'], bins=[0, 20, 40, 60, 80, 100], 
-                                    labels=['0-20', '21-40', '41-60', '61-80', '81-100'])
-                score_stats = score_ranges.value_counts().reset_index()
-                score_stats.columns = ['Score Range', 'Count']
-                score_stats.to_excel(writer, sheet_name='Score Distribution', index=False)
-            else:
-                pd.DataFrame({'Score Range': [], 'Count': []}).to_excel(writer, sheet_name='Score Distribution', index=False)
-            
-            # Industry distribution (if available)
-            if 'industry' in df_leads.columns and not df_leads['industry'].isna().all():
-                industry_stats = df_leads['industry'].value_counts().head(10).reset_index()
-                industry_stats.columns = ['Industry', 'Count']
-                industry_stats.to_excel(writer, sheet_name='Top Industries', index=False)
+    def _analytics_frames(self, analytics: LeadAnalytics) -> Dict[str, pd.DataFrame]:
+        """Analytics tables keyed by sheet name, read from the aggregate"""
+        frames = {
+            'Platform Stats': pd.DataFrame(analytics.platform_counts(), columns=['Platform', 'Count']),
+            'Score Distribution': pd.DataFrame(analytics.score_distribution(), columns=['Score Range', 'Count']),
+            'Top Industries': pd.DataFrame(analytics.top_industries(10), columns=['Industry', 'Count']),
+            'Contact Info Stats': pd.DataFrame(list(analytics.contact_coverage().items()),
+                                               columns=['Contact Type', 'Count']),
+        }
+        
+        top_pain_points = analytics.top_pain_points(10)
+        if top_pain_points:
+            frames['Top Pain Points'] = pd.DataFrame(top_pain_points, columns=['Pain Point', 'Count'])
+        
+        return frames
+    
+    def _write_workbook(self, filepath: Path, sheets: Dict[str, pd.DataFrame], formatted: Iterable[str] = (),
+                        rows: Optional[int] = None):
+        """Write DataFrames as sheets through openpyxl's write-only (streaming) workbook
+        
+        Cells are streamed to disk as rows are appended instead of being kept as
+        objects, so sheets named in formatted get their styled header, column
+        widths and frozen header row decided from the data before writing. The
+        workbook is saved atomically, with rows (the lead count) in its manifest.
+        """
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        for title, df in sheets.items():
+            worksheet = workbook.create_sheet(title)
+            if title in formatted:
+                self._write_formatted_sheet(worksheet, df)
             else:
-                pd.DataFrame({'Industry': [], 'Count': []}).to_excel(writer, sheet_name='Top Industries', index=False)
-            
-            # Contact information availability
-            contact_stats = {
-                'Has Email': int(df_leads['email'].notna().sum()) if 'email' in df_leads.columns else 0,
-                'Has Phone': int(df_leads['phone'].notna().sum()) if 'phone' in df_leads.columns else 0,
-                'Has Website': int(df_leads['website'].notna().sum()) if 'website' in df_leads.columns else 0,
-                'Has Address': int(df_leads['address'].notna().sum()) if 'address' in df_leads.columns else 0,
-                'Has Social Handles': int(df_leads['social_handles'].notna().sum()) if 'social_handles' in df_leads.columns else 0
-            }
-            
-            contact_df = pd.DataFrame(list(contact_stats.items()), 
-                                    columns=['Contact Type', 'Count'])
-            contact_df.to_excel(writer, sheet_name='Contact Info Stats', index=False)
-            
-            # Top pain points
-            all_pain_points = []
-            if 'pain_points' in df_leads.columns:
-                for pain_points_str in df_leads['pain_points'].dropna():
-                    if pain_points_str:
-                        all_pain_points.extend(pain_points_str.split(', '))
-            
-            if all_pain_points:
-                pain_point_stats = pd.Series(all_pain_points).value_counts().head(10).reset_index()
-                pain_point_stats.columns = ['Pain Point', 'Count']
-                pain_point_stats.to_excel(writer, sheet_name='Top Pain Points', index=False)
-            
-        except Exception as e:
-            logger.warning(f"Error creating analytics sheets: {e}")
+                worksheet.append([str(name) for name in df.columns])
+                for row in self._excel_rows(df):
+                    worksheet.append(row)
+        with AtomicWriter(filepath, text=False) as out:
+            workbook.save(out.file)
+            out.rows = rows
     
-    def _format_excel_sheets(self, writer: pd.ExcelWriter, df_leads: pd.DataFrame):
-        """Format Excel sheets for better readability"""
-        try:
-            from openpyxl.styles import Font, PatternFill, Alignment
-            from openpyxl.utils.dataframe import dataframe_to_rows
-            
-            workbook = writer.book
-            
-            # Format main leads sheet
-            if 'Leads' in workbook.sheetnames:
-                worksheet = workbook['Leads']
-                
-                # Header formatting
-                header_font = Font(bold=True, color="FFFFFF")
-                header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                
-                for cell in worksheet[1]:
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(horizontal="center")
-                
-                # Auto-adjust column widths
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    
-                    adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-                # Freeze header row
-                worksheet.freeze_panes = "A2"
-            
-        except Exception as e:
-            logger.warning(f"Error formatting Excel sheets: {e}")
+    def _write_formatted_sheet(self, worksheet, df: pd.DataFrame):
+        """Write a sheet with a styled, frozen header row and auto-sized columns"""
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+        
+        # Column dimensions and panes must be set before the first row is written
+        for index, width in enumerate(self._column_widths(df), start=1):
+            worksheet.column_dimensions[get_column_letter(index)].width = width
+        worksheet.freeze_panes = "A2"
+        
+        # Header formatting
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_alignment = Alignment(horizontal="center")
+        
+        header = []
+        for name in df.columns:
+            cell = WriteOnlyCell(worksheet, value=str(name))
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            header.append(cell)
+        worksheet.append(header)
+        
+        for row in self._excel_rows(df):
+            worksheet.append(row)
+    
+    @staticmethod
+    def _column_widths(df: pd.DataFrame) -> List[int]:
+        """Width of each column: its longest value or header plus padding, capped at EXCEL_MAX_COLUMN_WIDTH"""
+        widths = []
+        for name in df.columns:
+            values = df[name].dropna()
+            longest = int(values.astype(str).str.len().max()) if not values.empty else 0
+            widths.append(min(max(longest, len(str(name))) + 2, EXCEL_MAX_COLUMN_WIDTH))
+        return widths
+    
+    @staticmethod
+    def _excel_rows(df: pd.DataFrame) -> Iterable[list]:
+        """Rows of a DataFrame as Python values with missing values as None, converted in chunks"""
+        for start in range(0, len(df), EXCEL_CHUNK_SIZE):
+            chunk = df.iloc[start:start + EXCEL_CHUNK_SIZE]
+            yield from chunk.to_numpy(dtype=object, na_value=None).tolist()
     
     def create_lead_summary_report(self, leads: List[Lead], filename: str = None) -> str:
         """Create a comprehensive summary report"""
+        return self.export_summary_report(pd.DataFrame([lead.to_dict() for lead in leads]), filename)
+    
+    def export_summary_report(self, df_leads: pd.DataFrame, filename: str = None,
+                              analytics: Optional[LeadAnalytics] = None) -> str:
+        """Create the summary report from a DataFrame of to_dict() rows and their analytics aggregate"""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"lead_summary_report_{timestamp}.xlsx"
@@ -235,28 +284,29 @@ class CSVExporter:
         filepath = self.output_dir / filename
         
         try:
-            df_leads = pd.DataFrame([lead.to_dict() for lead in leads])
+            analytics = analytics or LeadAnalytics.from_frame(df_leads)
+            contacts = analytics.contact_coverage()
             
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Executive Summary
-                summary_metrics = [
-                    ('Total Leads', len(leads)),
-                    ('Average Lead Score', f"{df_leads['lead_score'].mean():.1f}" if 'lead_score' in df_leads.columns and not df_leads.empty else 'N/A'),
-                    ('High Score Leads (60+)', len([l for l in leads if l.lead_score >= 60])),
-                    ('Leads with Email', int(df_leads['email'].notna().sum()) if 'email' in df_leads.columns else 0),
-                    ('Leads with Phone', int(df_leads['phone'].notna().sum()) if 'phone' in df_leads.columns else 0),
-                    ('Leads with Website', int(df_leads['website'].notna().sum()) if 'website' in df_leads.columns else 0),
-                    ('Most Common Platform', df_leads['platform'].mode().iloc[0] if 'platform' in df_leads.columns and not df_leads.empty else 'N/A'),
-                    ('Most Common Industry', df_leads['industry'].mode().iloc[0] if 'industry' in df_leads.columns and not df_leads['industry'].isna().all() else 'N/A')
-                ]
-                summary_df = pd.DataFrame(summary_metrics, columns=['Metric', 'Value'])
-                summary_df.to_excel(writer, sheet_name='Executive Summary', index=False)
+            # Executive Summary
+            summary_metrics = [
+                ('Total Leads', analytics.total),
+                ('Average Lead Score', f"{analytics.average_score:.1f}" if analytics.average_score is not None else 'N/A'),
+                ('High Score Leads (60+)', analytics.high_score),
+                ('Leads with Email', contacts['Has Email']),
+                ('Leads with Phone', contacts['Has Phone']),
+                ('Leads with Website', contacts['Has Website']),
+                ('Most Common Platform', analytics.most_common_platform if analytics.platforms else 'N/A'),
+                ('Most Common Industry', analytics.most_common_industry if analytics.industries else 'N/A')
+            ]
+            sheets = {
+                'Executive Summary': pd.DataFrame(summary_metrics, columns=['Metric', 'Value']),
                 # Full leads data
-                df_leads.to_excel(writer, sheet_name='All Leads', index=False)
-                # Add analytics
-                self._add_analytics_sheets(writer, df_leads)
-                # Format
-                self._format_excel_sheets(writer, df_leads)
+                'All Leads': df_leads,
+            }
+            # Add analytics
+            sheets.update(self._analytics_frames(analytics))
+            
+            self._write_workbook(filepath, sheets, formatted={'All Leads'}, rows=len(df_leads))
             
             logger.info(f"Created summary report: {filepath}")
             return str(filepath)
@@ -0,0 +1,192 @@
+"""
+Export jobs: serialize a lead set once and write several export files from it in parallel
+"""
+import time
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+from datetime import datetime
+import pandas as pd
+from loguru import logger
+
+from src.models.lead import Lead
+from src.exporters.csv_exporter import CSVExporter
+from src.utils.lead_analytics import LeadAnalytics
+from config.settings import EXPORTS_DIR
+
+
+# Sinks writing one file per key (the key may be None, e.g. leads without a platform)
+KEYED_SINKS = {'by_platform'}
+
+
+class ExportTask(NamedTuple):
+    """One file to write: the sink it belongs to, a writer function, the rows it covers and its other arguments"""
+
+    sink: str
+    key: Optional[str]
+    writer: Callable[..., str]
+    rows: Optional[List[int]]
+    args: tuple
+
+
+class JobData(NamedTuple):
+    """The serialized lead set shared by all tasks of a job"""
+
+    records: List[Dict[str, Any]]
+    df_leads: pd.DataFrame
+
+    def select_records(self, rows: Optional[List[int]]) -> List[Dict[str, Any]]:
+        return self.records if rows is None else [self.records[i] for i in rows]
+
+    def select_frame(self, rows: Optional[List[int]]) -> pd.DataFrame:
+        return self.df_leads if rows is None else self.df_leads.iloc[rows].reset_index(drop=True)
+
+
+# Job data of the current worker process, loaded once by _init_worker
+_worker_data: Optional[JobData] = None
+
+
+def _init_worker(payload: bytes):
+    global _worker_data
+    _worker_data = pickle.loads(payload)
+
+
+def _write_csv(data: JobData, rows: Optional[List[int]], output_dir: Path, filename: str,
+               compression: Optional[str]) -> str:
+    return CSVExporter(output_dir).export_to_csv_stream(data.select_records(rows), filename, compression)
+
+
+def _write_excel(data: JobData, rows: Optional[List[int]], output_dir: Path, filename: str,
+                 include_analytics: bool, analytics: LeadAnalytics) -> str:
+    return CSVExporter(output_dir).export_frame_to_excel(data.select_frame(rows), filename, include_analytics,
+                                                         analytics)
+
+
+def _write_summary_report(data: JobData, rows: Optional[List[int]], output_dir: Path, filename: str,
+                          analytics: LeadAnalytics) -> str:
+    return CSVExporter(output_dir).export_summary_report(data.select_frame(rows), filename, analytics)
+
+
+def _run_task(task: ExportTask, data: Optional[JobData] = None) -> str:
+    return task.writer(data if data is not None else _worker_data, task.rows, *task.args)
+
+
+class ExportJob:
+    """Writes several exports of one lead set from a shared serialized form
+
+    Leads are converted with to_dict() once; the CSV sink streams those rows
+    and every Excel sink works from one DataFrame built from them (subsets for
+    the per-platform and high-score files). Analytics sheets are read from
+    LeadAnalytics aggregates counted in the same pass. run() writes all files in
+    separate processes, so the job takes about as long as its slowest file; the
+    lead data is pickled once and loaded once per worker, and tasks only carry
+    the row positions they write.
+
+    Sinks are added with the add_* methods, which return the job for chaining:
+
+        ExportJob(leads).add_csv().add_excel().add_summary_report().run()
+    """
+
+    def __init__(self, leads: Iterable[Lead], output_dir: Path = EXPORTS_DIR, workers: int = 4):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+        self.workers = workers
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        self.records = []
+        self.analytics = LeadAnalytics()
+        for lead in leads:
+            record = lead.to_dict()
+            self.records.append(record)
+            self.analytics.add(record)
+        self.df_leads = pd.DataFrame(self.records)
+        self.data = JobData(self.records, self.df_leads)
+        self.tasks: List[ExportTask] = []
+
+    @classmethod
+    def standard(cls, leads: Iterable[Lead], output_dir: Path = EXPORTS_DIR, workers: int = 4,
+                 min_score: int = 50) -> 'ExportJob':
+        """Job producing the standard deliverable: CSV, Excel, per-platform, high-score and summary files"""
+        return (cls(leads, output_dir, workers)
+                .add_csv()
+                .add_excel()
+                .add_by_platform()
+                .add_high_score(min_score)
+                .add_summary_report())
+
+    def add_csv(self, filename: str = None, compression: Optional[str] = None) -> 'ExportJob':
+        """Add a CSV export of all leads"""
+        filename = filename or f"leads_export_{self.timestamp}.csv"
+        self.tasks.append(ExportTask('csv', None, _write_csv, None, (self.output_dir, filename, compression)))
+        return self
+
+    def add_excel(self, filename: str = None, include_analytics: bool = True) -> 'ExportJob':
+        """Add an Excel export of all leads"""
+        filename = filename or f"leads_export_{self.timestamp}.xlsx"
+        self.tasks.append(ExportTask('excel', None, _write_excel, None,
+                                     (self.output_dir, filename, include_analytics, self.analytics)))
+        return self
+
+    def add_by_platform(self, base_filename: str = None) -> 'ExportJob':
+        """Add one Excel export per platform"""
+        base_filename = base_filename or f"leads_by_platform_{self.timestamp}"
+        # Grouped in plain Python, so leads without a platform get their own file (..._None.xlsx) as before
+        platform_rows: Dict[Optional[str], List[int]] = {}
+        platform_analytics: Dict[Optional[str], LeadAnalytics] = {}
+        for i, record in enumerate(self.records):
+            platform = record.get('platform')
+            platform_rows.setdefault(platform, []).append(i)
+            platform_analytics.setdefault(platform, LeadAnalytics()).add(record)
+        for platform, rows in platform_rows.items():
+            self.tasks.append(ExportTask('by_platform', platform, _write_excel, rows,
+                                         (self.output_dir, f"{base_filename}_{platform}.xlsx", True,
+                                          platform_analytics[platform])))
+        return self
+
+    def add_high_score(self, min_score: int = 50, filename: str = None) -> 'ExportJob':
+        """Add an Excel export of leads scoring at least min_score"""
+        filename = filename or f"high_score_leads_{min_score}+_{self.timestamp}.xlsx"
+        rows = [i for i, record in enumerate(self.records) if record['lead_score'] >= min_score]
+        analytics = LeadAnalytics.from_leads(self.records[i] for i in rows)
+        logger.info(f"Exporting {len(rows)} leads with score >= {min_score}")
+        self.tasks.append(ExportTask('high_score', None, _write_excel, rows,
+                                     (self.output_dir, filename, True, analytics)))
+        return self
+
+    def add_summary_report(self, filename: str = None) -> 'ExportJob':
+        """Add the summary report"""
+        filename = filename or f"lead_summary_report_{self.timestamp}.xlsx"
+        self.tasks.append(ExportTask('summary_report', None, _write_summary_report, None,
+                                     (self.output_dir, filename, self.analytics)))
+        return self
+
+    def run(self) -> Dict[str, Any]:
+        """Write all added exports; returns each sink's file path (a dict by platform for by_platform)"""
+        start = time.perf_counter()
+        # Largest files first, so the slowest writes start immediately
+        tasks = sorted(self.tasks, key=self._task_size, reverse=True)
+
+        if self.workers > 1 and len(tasks) > 1:
+            # Pickled once here and unpickled once per worker, instead of once per task
+            payload = pickle.dumps(self.data, protocol=pickle.HIGHEST_PROTOCOL)
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks)),
+                                     initializer=_init_worker, initargs=(payload,)) as executor:
+                paths = list(executor.map(_run_task, tasks))
+        else:
+            paths = [_run_task(task, self.data) for task in tasks]
+
+        results: Dict[str, Any] = {}
+        for task, path in zip(tasks, paths):
+            if task.sink not in KEYED_SINKS:
+                results[task.sink] = path
+            else:
+                results.setdefault(task.sink, {})[task.key] = path
+
+        logger.info(f"Export job wrote {len(paths)} files for {len(self.records)} leads "
+                    f"in {time.perf_counter() - start:.1f}s")
+        return results
+
+    def _task_size(self, task: ExportTask) -> int:
+        """Rows a task writes"""
+        return len(self.records) if task.rows is None else len(task.rows)
@@ -0,0 +1,134 @@
+"""
+Persistent per-target export state for delta exports
+"""
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from src.utils.deduplication import lead_field
+from src.utils.identity_index import content_hash, source_key
+from config.settings import EXPORTS_DIR
+
+DEFAULT_STATE_PATH = EXPORTS_DIR / 'export_state.sqlite3'
+
+# Record keys per lookup query (SQLite's default limit is 999 bound variables)
+LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    target TEXT PRIMARY KEY,
+    last_updated TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shipped (
+    target TEXT NOT NULL,
+    record_key TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    exported_at TEXT NOT NULL,
+    PRIMARY KEY (target, record_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS exports (
+    export_id INTEGER PRIMARY KEY,
+    target TEXT NOT NULL,
+    exported_at TEXT NOT NULL,
+    lead_count INTEGER NOT NULL,
+    destination TEXT
+);
+"""
+
+
+def _last_updated(lead: Any) -> Optional[datetime]:
+    value = lead_field(lead, 'last_updated')
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value if isinstance(value, datetime) else None
+
+
+def record_key(lead: Any) -> str:
+    """Key identifying a lead across exports: its source record, or its content without a source URL"""
+    return source_key(lead) or f"hash:{content_hash(lead)}"
+
+
+class ExportState:
+    """SQLite record of what each export target (a CSV feed, a CRM, ...) was sent
+
+    For every target it stores the content hash of each shipped lead and a
+    watermark, the newest last_updated shipped so far (e.g. for sources that
+    can fetch only newer records). pending() returns the leads that are new or
+    changed for a target, comparing content hashes, so an edited lead is
+    pending again whether or not its last_updated was bumped. mark_shipped()
+    records a successful export; until then the same leads stay pending.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STATE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    def watermark(self, target: str) -> Optional[datetime]:
+        """Newest last_updated shipped to a target, or None if it was never exported to"""
+        row = self.conn.execute('SELECT last_updated FROM watermarks WHERE target = ?', (target,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def pending(self, target: str, leads: List[Any]) -> List[Any]:
+        """Leads (Lead or dict) that are new or changed since they were last shipped to target"""
+        keys = [record_key(lead) for lead in leads]
+        stored = self._stored_hashes(target, keys)
+        delta = [lead for lead, key in zip(leads, keys) if stored.get(key) != content_hash(lead)]
+
+        logger.info(f"Delta export to {target}: {len(delta)} of {len(leads)} leads new or changed")
+        return delta
+
+    def _stored_hashes(self, target: str, keys: List[str]) -> Dict[str, str]:
+        """Content hashes shipped to target, by record key, for the given keys"""
+        stored = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), LOOKUP_CHUNK):
+            chunk = unique[i:i + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            stored.update(self.conn.execute(
+                f'SELECT record_key, content_hash FROM shipped WHERE target = ? AND record_key IN ({placeholders})',
+                [target, *chunk]
+            ))
+        return stored
+
+    def mark_shipped(self, target: str, leads: List[Any], destination: Optional[str] = None):
+        """Record that leads were exported to target, advancing its watermark (one transaction)"""
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO shipped (target, record_key, content_hash, exported_at) VALUES (?, ?, ?, ?)',
+                [(target, record_key(lead), content_hash(lead), now) for lead in leads]
+            )
+            timestamps = [ts for ts in map(_last_updated, leads) if ts is not None]
+            if timestamps:
+                newest = max(timestamps)
+                watermark = self.watermark(target)
+                if watermark is None or newest > watermark:
+                    self.conn.execute('INSERT OR REPLACE INTO watermarks (target, last_updated) VALUES (?, ?)',
+                                      (target, newest.isoformat()))
+            self.conn.execute('INSERT INTO exports (target, exported_at, lead_count, destination) VALUES (?, ?, ?, ?)',
+                              (target, now, len(leads), destination))
+
+    def reset(self, target: str):
+        """Forget everything shipped to a target, so its next delta export is a full one"""
+        with self.conn:
+            self.conn.execute('DELETE FROM shipped WHERE target = ?', (target,))
+            self.conn.execute('DELETE FROM watermarks WHERE target = ?', (target,))
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,180 @@
+"""
+HubSpot contacts client using the CRM v3 batch endpoints
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import requests
+from loguru import logger
+
+from src.exporters.crm_http import BatchResult, ItemError, create_session, request_with_backoff
+
+HUBSPOT_API_URL = 'https://api.hubapi.com'
+
+# HubSpot accepts at most 100 inputs per batch request
+MAX_BATCH_SIZE = 100
+
+
+class HubSpotClient:
+    """Creates and upserts HubSpot contacts in batches of up to 100
+
+    Contacts with an email are upserted by email (idProperty=email), so re-runs
+    update existing contacts instead of duplicating them; contacts without one
+    are batch-created. Batches are sent concurrently (max_workers at a time)
+    with rate-limit aware retries, and every rejected contact is reported.
+
+    base_url can point at a local mock of the HubSpot API.
+    """
+
+    def __init__(self, access_token: str, base_url: str = HUBSPOT_API_URL, max_workers: int = 4,
+                 batch_size: int = MAX_BATCH_SIZE, session: Optional[requests.Session] = None,
+                 max_retries: int = 5, backoff: float = 1.0):
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = session or create_session(max_workers)
+        self.session.headers.update({
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json',
+        })
+
+    def upsert_contacts(self, contacts: List[Dict[str, str]]) -> BatchResult:
+        """Upsert contacts (property dicts) by email and create those without an email
+
+        Every ItemError carries the position of its contact in contacts.
+        """
+        by_email: Dict[str, Dict[str, str]] = {}
+        email_indices: Dict[str, List[int]] = {}
+        without_email = []
+        for i, properties in enumerate(contacts):
+            email = (properties.get('email') or '').strip().lower()
+            if email:
+                # One batch may not name the same email twice: later values win
+                by_email.setdefault(email, {}).update(properties, email=email)
+                email_indices.setdefault(email, []).append(i)
+            else:
+                without_email.append(({'properties': properties}, [i]))
+
+        upserts = [({'idProperty': 'email', 'id': email, 'properties': properties}, email_indices[email])
+                   for email, properties in by_email.items()]
+
+        requests_to_send = (
+            [('upsert', batch) for batch in self._batches(upserts)]
+            + [('create', batch) for batch in self._batches(without_email)]
+        )
+        if not requests_to_send:
+            return BatchResult(0, [])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda job: self._send(*job), requests_to_send))
+
+        result = BatchResult.combine(results)
+        logger.info(f"HubSpot: {result.succeeded} contacts saved in {len(requests_to_send)} batch requests, "
+                    f"{len(result.errors)} errors")
+        return result
+
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _batches(self, inputs: List[Tuple[Dict[str, Any], List[int]]]) -> List[List[Tuple[Dict[str, Any], List[int]]]]:
+        return [inputs[i:i + self.batch_size] for i in range(0, len(inputs), self.batch_size)]
+
+    def _send(self, action: str, batch: List[Tuple[Dict[str, Any], List[int]]]) -> BatchResult:
+        """Send one batch request and map its response to per-contact results
+
+        batch pairs each input with the positions of the contacts it was built from.
+        """
+        url = f"{self.base_url}/crm/v3/objects/contacts/batch/{action}"
+        inputs = [item for item, _ in batch]
+        keys = [self._key(item) for item in inputs]
+
+        def failed(indices: List[int], key: Optional[str], status: Optional[int], message: str) -> List[ItemError]:
+            return [ItemError(key, status, message, index) for index in indices]
+
+        try:
+            # Upserts by email can be resent safely; batch creates are only retried if never applied
+            response = request_with_backoff(self.session, 'POST', url, max_retries=self.max_retries,
+                                            backoff=self.backoff, idempotent=action == 'upsert',
+                                            json={'inputs': inputs})
+        except requests.RequestException as e:
+            return BatchResult(0, [error for key, (_, indices) in zip(keys, batch)
+                                   for error in failed(indices, key, None, str(e))])
+
+        if response.status_code >= 400:
+            message = self._error_message(response)
+            return BatchResult(0, [error for key, (_, indices) in zip(keys, batch)
+                                   for error in failed(indices, key, response.status_code, message)])
+
+        # 200/201 when every input succeeded, 207 (multi-status) when some failed
+        body = response.json() if response.content else {}
+        positions: Dict[Optional[str], List[int]] = {}
+        for position, key in enumerate(keys):
+            positions.setdefault(key, []).append(position)
+        failures: Dict[int, str] = {}  # batch position -> message
+        unattributed = []
+        for error in body.get('errors', []):
+            message = error.get('message', 'Unknown error')
+            if error.get('category'):
+                message = f"{error['category']}: {message}"
+            ids = (error.get('context') or {}).get('ids') or []
+            hits = [position for key in ids for position in positions.get(key, [])]
+            if hits:
+                failures.update((position, message) for position in hits)
+            else:
+                unattributed.append(message)
+
+        if unattributed:
+            # Inputs the results account for were saved; the errors without ids belong to the rest
+            message = '; '.join(unattributed)
+            remaining = {key: [position for position in found if position not in failures]
+                         for key, found in positions.items()}
+            anonymous = 0
+            for result in body.get('results', []):
+                key = self._result_key(result)
+                if key is None:
+                    anonymous += 1
+                elif remaining.get(key):
+                    remaining[key].pop(0)
+            unmatched = sorted(position for found in remaining.values() for position in found)
+            # Results without properties cannot be told apart: they cover the rest only if there is one for each
+            if anonymous < len(unmatched):
+                failures.update((position, message) for position in unmatched)
+
+        errors = [error for position, message in sorted(failures.items())
+                  for error in failed(batch[position][1], keys[position], response.status_code, message)]
+        succeeded = sum(len(indices) for position, (_, indices) in enumerate(batch) if position not in failures)
+        return BatchResult(succeeded, errors)
+
+    @staticmethod
+    def _key(item: Dict[str, Any]) -> Optional[str]:
+        """Identifier to report an input by: its email, or its name when it has none"""
+        properties = item['properties']
+        if item.get('id'):
+            return item['id']
+        name = ' '.join(filter(None, (properties.get('firstname'), properties.get('lastname'))))
+        return name or None
+
+    @staticmethod
+    def _result_key(result: Dict[str, Any]) -> Optional[str]:
+        """The _key of the input a result was saved from, read from the properties it echoes back"""
+        properties = result.get('properties') or {}
+        email = (properties.get('email') or '').strip().lower()
+        if email:
+            return email
+        name = ' '.join(filter(None, (properties.get('firstname'), properties.get('lastname'))))
+        return name or None
+
+    @staticmethod
+    def _error_message(response: requests.Response) -> str:
+        try:
+            return response.json().get('message') or response.text[:200]
+        except ValueError:
+            return response.text[:200]
@@ -0,0 +1,153 @@
+"""
+Pipedrive persons and organizations client with pooled connections and concurrent workers
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import requests
+from loguru import logger
+
+from src.exporters.crm_http import (
+    BatchResult, ItemError, RateLimitGate, create_session, request_with_backoff
+)
+
+
+class PersonInput(NamedTuple):
+    """A person to create and the organization it belongs to
+
+    org_key identifies the organization (e.g. the business domain) so that all
+    persons sharing it are linked to one organization; without it the person
+    is created without one. A person whose organization cannot be resolved is
+    not created but reported as an error, so it can be retried with its link.
+    """
+
+    data: Dict[str, Any]
+    org_key: Optional[str] = None
+    org_name: Optional[str] = None
+
+
+class PipedriveClient:
+    """Creates Pipedrive persons concurrently over one pooled, rate-limited session
+
+    Up to max_workers requests run at once. The X-RateLimit-* headers of every
+    response feed a shared gate, so when the quota runs out all workers pause
+    until it resets; 429 responses are retried after Retry-After. Creates are
+    not resent after errors that may have applied them. Organizations are
+    resolved (searched by exact name, created if missing) once per org_key and
+    cached for the lifetime of the client, so a create that failed ambiguously
+    is found by the next search instead of being duplicated.
+
+    base_url can point at a local mock of the Pipedrive API.
+    """
+
+    def __init__(self, api_token: str, company_domain: Optional[str] = None, base_url: Optional[str] = None,
+                 max_workers: int = 8, session: Optional[requests.Session] = None,
+                 max_retries: int = 5, backoff: float = 1.0):
+        if not base_url and not company_domain:
+            raise ValueError("Pipedrive company_domain or base_url is required")
+        self.base_url = (base_url or f"https://{company_domain}.pipedrive.com/api/v1").rstrip('/')
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = session or create_session(max_workers)
+        self.session.params = {'api_token': api_token}
+        # Keep a request per worker in reserve: that many may already be in flight
+        self.rate_limit = RateLimitGate(min_remaining=max_workers)
+
+        self._org_ids: Dict[str, int] = {}
+        self._org_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def create_persons(self, persons: List[PersonInput]) -> BatchResult:
+        """Create persons concurrently, linking each to its (cached) organization"""
+        if not persons:
+            return BatchResult(0, [])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            errors = [error for error in executor.map(self._create_person, range(len(persons)), persons)
+                      if error is not None]
+
+        result = BatchResult(len(persons) - len(errors), errors)
+        logger.info(f"Pipedrive: {result.succeeded} persons created, {len(result.errors)} errors, "
+                    f"{len(self._org_ids)} organizations resolved")
+        return result
+
+    def organization_id(self, org_key: str, org_name: str) -> Optional[int]:
+        """Id of the organization for org_key, found by name or created on first use
+
+        Only ids that were found or created are cached; after a failed lookup
+        the next person with this org_key tries again.
+        """
+        with self._lock:
+            if org_key in self._org_ids:
+                return self._org_ids[org_key]
+            key_lock = self._org_locks.setdefault(org_key, threading.Lock())
+
+        # Concurrent workers asking for the same organization wait for the first one
+        with key_lock:
+            with self._lock:
+                if org_key in self._org_ids:
+                    return self._org_ids[org_key]
+            searched, org_id = self._find_organization(org_name)
+            # Create only after a search that worked: a failed search may have missed an existing one
+            if searched and org_id is None:
+                org_id = self._create_organization(org_name)
+            if org_id is not None:
+                with self._lock:
+                    self._org_ids[org_key] = org_id
+            return org_id
+
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _create_person(self, index: int, person: PersonInput) -> Optional[ItemError]:
+        """Create one person (persons[index]); returns an ItemError if that failed"""
+        data = dict(person.data)
+        key = data.get('name')
+        try:
+            if person.org_key and person.org_name:
+                data['org_id'] = self.organization_id(person.org_key, person.org_name)
+                if data['org_id'] is None:
+                    return ItemError(key, None, f"Organization {person.org_name} could not be resolved", index)
+            response = self._request('POST', '/persons', json=data)
+        except requests.RequestException as e:
+            return ItemError(key, None, str(e), index)
+
+        if response.status_code != 201:
+            return ItemError(key, response.status_code, self._error_message(response), index)
+        return None
+
+    def _find_organization(self, name: str) -> Tuple[bool, Optional[int]]:
+        """Whether the search succeeded, and the id of the organization with exactly this name"""
+        response = self._request('GET', '/organizations/search',
+                                 params={'term': name, 'fields': 'name', 'exact_match': 'true', 'limit': 1})
+        if response.status_code != 200:
+            logger.warning(f"Pipedrive organization search failed for {name}: {self._error_message(response)}")
+            return False, None
+        items = ((response.json().get('data') or {}).get('items')) or []
+        return True, (items[0]['item']['id'] if items else None)
+
+    def _create_organization(self, name: str) -> Optional[int]:
+        response = self._request('POST', '/organizations', json={'name': name, 'visible_to': '3'})
+        if response.status_code != 201:
+            logger.warning(f"Failed to create Pipedrive organization {name}: {self._error_message(response)}")
+            return None
+        return response.json()['data']['id']
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        return request_with_backoff(self.session, method, f"{self.base_url}{path}", max_retries=self.max_retries,
+                                    backoff=self.backoff, rate_limit=self.rate_limit, **kwargs)
+
+    @staticmethod
+    def _error_message(response: requests.Response) -> str:
+        try:
+            return response.json().get('error') or response.text[:200]
+        except ValueError:
+            return response.text[:200]
@@ -1,53 +1,243 @@
 """
 Lead data model for storing and managing scraped data
 """
-from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
-from datetime import datetime
 import re
+import sys
 import json
-import pandas as pd
+from operator import attrgetter, itemgetter
+from typing import Optional, List, Dict, Any, Iterable
+from datetime import datetime
+
+from src.utils.phone import normalize_phone
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
+def is_missing(value: Any) -> bool:
+    """Scalar replacement for pd.isna that does not need pandas"""
+    if value is None:
+        return True
+    if type(value) is str:
+        return False
+    if isinstance(value, float):
+        return value != value
+    # pandas.NA and pandas.NaT, detected without importing pandas
+    return type(value).__name__ in ('NAType', 'NaTType')
+
+
+def _intern(value: Any) -> Any:
+    """Intern low-cardinality strings so leads share one copy"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _copy_json(value: Any) -> Any:
+    """Shallow copy of a decoded JSON object so cached values are not shared"""
+    return value.copy() if isinstance(value, (dict, list)) else value
+
+
+def _number(value: Any, kind: type) -> Any:
+    """Number from a text cell (e.g. a csv.DictReader value); missing or blank values become None"""
+    if type(value) is str:
+        value = value.strip()
+        if not value:
+            return None
+        return int(float(value)) if kind is int else float(value)
+    return None if is_missing(value) else value
+
+
+def _score_input(name: str) -> property:
+    """Slot-backed field whose assignment marks the lead score dirty"""
+    slot = '_' + name
+
+    def set_value(lead: 'Lead', value: Any):
+        setattr(lead, slot, value)
+        lead._score_dirty = True
+
+    return property(attrgetter(slot), set_value, doc=f"{name} (feeds the lead score)")
 
 
-@dataclass
 class Lead:
-    """Data model for a lead/prospect"""
-    
-    # Required fields
-    name: str
-    platform: str
-    source_url: str
-    
-    # Contact information
-    website: Optional[str] = None
-    email: Optional[str] = None
-    phone: Optional[str] = None
-    address: Optional[str] = None
-    
-    # Social media data
-    followers: Optional[int] = None
-    engagement_rate: Optional[float] = None
-    social_handles: Dict[str, str] = field(default_factory=dict)
-    
-    # Business information
-    industry: Optional[str] = None
-    business_type: Optional[str] = None
-    pain_points: List[str] = field(default_factory=list)
-    
-    # Lead scoring
-    lead_score: int = 0
-    score_breakdown: Dict[str, int] = field(default_factory=dict)
-    
-    # Metadata
-    scraped_at: datetime = field(default_factory=datetime.now)
-    last_updated: datetime = field(default_factory=datetime.now)
-    notes: Optional[str] = None
-    tags: List[str] = field(default_factory=list)
-    
-    def __post_init__(self):
-        """Validate and clean data after initialization"""
-        self.clean_data()
-        self.calculate_lead_score()
+    """Data model for a lead/prospect
+    
+    Stored in __slots__ rather than a per-instance __dict__ to keep large
+    result sets compact. Platform, industry and business type are interned.
+    
+    The lead score is computed lazily: assigning a field that feeds the score
+    marks it dirty and the next read of lead_score/score_breakdown (or
+    finalize()) recomputes it once.
+    """
+    
+    FIELDS = (
+        # Required fields
+        'name', 'platform', 'source_url',
+        # Contact information
+        'website', 'email', 'phone', 'address',
+        # Social media data
+        'followers', 'engagement_rate', 'social_handles',
+        # Business information
+        'industry', 'business_type', 'pain_points',
+        # Lead scoring
+        'lead_score', 'score_breakdown',
+        # Metadata
+        'scraped_at', 'last_updated', 'notes', 'tags',
+        # Provenance (source URLs of duplicate records merged into this one)
+        'sources'
+    )
+    
+    # Fields read by calculate_lead_score; assigning any of them marks the score dirty
+    SCORE_INPUTS = ('website', 'email', 'phone', 'followers', 'engagement_rate', 'industry', 'pain_points')
+    
+    # Score inputs and score fields are exposed as properties over private slots
+    __slots__ = (
+        'name', 'platform', 'source_url', 'address', 'social_handles', 'business_type',
+        'scraped_at', 'last_updated', 'notes', 'tags', 'sources',
+        '_website', '_email', '_phone', '_followers', '_engagement_rate', '_industry', '_pain_points',
+        '_lead_score', '_score_breakdown', '_score_dirty'
+    )
+    
+    website = _score_input('website')
+    email = _score_input('email')
+    phone = _score_input('phone')
+    followers = _score_input('followers')
+    engagement_rate = _score_input('engagement_rate')
+    industry = _score_input('industry')
+    pain_points = _score_input('pain_points')
+    
+    def __init__(self, name: str, platform: str, source_url: str,
+                 website: Optional[str] = None, email: Optional[str] = None,
+                 phone: Optional[str] = None, address: Optional[str] = None,
+                 followers: Optional[int] = None, engagement_rate: Optional[float] = None,
+                 social_handles: Optional[Dict[str, str]] = None,
+                 industry: Optional[str] = None, business_type: Optional[str] = None,
+                 pain_points: Optional[List[str]] = None,
+                 lead_score: int = 0, score_breakdown: Optional[Dict[str, int]] = None,
+                 scraped_at: Optional[datetime] = None, last_updated: Optional[datetime] = None,
+                 notes: Optional[str] = None, tags: Optional[List[str]] = None,
+                 sources: Optional[List[str]] = None):
+        # Clean scalar fields on locals before storing them (same rules as clean_data)
+        if scraped_at is None or last_updated is None:
+            now = datetime.now()
+            scraped_at = scraped_at or now
+            last_updated = last_updated or now
+        
+        self.name = name.strip() if name else name
+        self.platform = _intern(platform)
+        self.source_url = source_url
+        self._website = self._clean_website(website)
+        self._email = self._clean_email(email)
+        self._phone = self._clean_phone(phone) if phone else phone
+        self.address = address
+        self._followers = followers
+        self._engagement_rate = engagement_rate
+        self.social_handles = {k: v for k, v in social_handles.items() if v} if social_handles else {}
+        self._industry = _intern(industry)
+        self.business_type = _intern(business_type)
+        self._pain_points = pain_points if pain_points is not None else []
+        self.scraped_at = scraped_at
+        self.last_updated = last_updated
+        self.notes = notes
+        self.tags = tags if tags is not None else []
+        self.sources = sources if sources is not None else []
+        
+        # Passed-in scores are recomputed from the fields on first read, as before
+        self._lead_score = lead_score
+        self._score_breakdown = score_breakdown if score_breakdown is not None else {}
+        self._score_dirty = True
+    
+    @classmethod
+    def from_trusted(cls, name: str, platform: str, source_url: str,
+                     website: Optional[str] = None, email: Optional[str] = None,
+                     phone: Optional[str] = None, address: Optional[str] = None,
+                     followers: Optional[int] = None, engagement_rate: Optional[float] = None,
+                     social_handles: Optional[Dict[str, str]] = None,
+                     industry: Optional[str] = None, business_type: Optional[str] = None,
+                     pain_points: Optional[List[str]] = None,
+                     lead_score: Optional[int] = None, score_breakdown: Optional[Dict[str, int]] = None,
+                     scraped_at: Optional[datetime] = None, last_updated: Optional[datetime] = None,
+                     notes: Optional[str] = None, tags: Optional[List[str]] = None,
+                     sources: Optional[List[str]] = None) -> 'Lead':
+        """Build a lead from values that are already clean (e.g. produced by a Lead)
+        
+        Takes the same arguments as the constructor but skips cleaning. A given
+        lead_score (with its score_breakdown) is kept as-is; without one the
+        score is computed lazily as usual.
+        """
+        if scraped_at is None or last_updated is None:
+            now = datetime.now()
+            scraped_at = scraped_at or now
+            last_updated = last_updated or now
+        
+        lead = cls.__new__(cls)
+        lead.name = name
+        lead.platform = _intern(platform)
+        lead.source_url = source_url
+        lead._website = website
+        lead._email = email
+        lead._phone = phone
+        lead.address = address
+        lead._followers = followers
+        lead._engagement_rate = engagement_rate
+        lead.social_handles = social_handles or {}
+        lead._industry = _intern(industry)
+        lead.business_type = _intern(business_type)
+        lead._pain_points = pain_points or []
+        lead.scraped_at = scraped_at
+        lead.last_updated = last_updated
+        lead.notes = notes
+        lead.tags = tags or []
+        lead.sources = sources or []
+        
+        lead._lead_score = lead_score if lead_score is not None else 0
+        lead._score_breakdown = score_breakdown or {}
+        lead._score_dirty = lead_score is None
+        return lead
+    
+    @property
+    def lead_score(self) -> int:
+        """Lead score (0-100), recalculated first if any input changed"""
+        if self._score_dirty:
+            self.calculate_lead_score()
+        return self._lead_score
+    
+    @lead_score.setter
+    def lead_score(self, value: int):
+        # An explicit score (e.g. restored from an export) is trusted as-is; the
+        # old breakdown no longer describes it, so it is dropped
+        self.set_score(value)
+    
+    @property
+    def score_breakdown(self) -> Dict[str, int]:
+        """Points per scoring rule, recalculated first if any input changed"""
+        if self._score_dirty:
+            self.calculate_lead_score()
+        return self._score_breakdown
+    
+    @score_breakdown.setter
+    def score_breakdown(self, value: Dict[str, int]):
+        # A breakdown implies its score: keep the two in step
+        value = value or {}
+        self.set_score(min(sum(value.values()), 100), value)
+    
+    def set_score(self, score: int, breakdown: Optional[Dict[str, int]] = None):
+        """Trust a score and its breakdown as one unit (no breakdown means it is unknown)"""
+        self._lead_score = score
+        self._score_breakdown = breakdown or {}
+        self._score_dirty = False
+    
+    def mark_score_dirty(self):
+        """Flag the score for recalculation after in-place changes (e.g. pain_points.append)"""
+        self._score_dirty = True
+    
+    def finalize(self) -> 'Lead':
+        """Compute a pending score now"""
+        if self._score_dirty:
+            self.calculate_lead_score()
+        return self
+    
+    @staticmethod
+    def finalize_all(leads: Iterable['Lead']) -> List['Lead']:
+        """Compute pending scores for a batch of leads"""
+        return [lead.finalize() for lead in leads]
     
     def clean_data(self):
         """Clean and validate lead data"""
@@ -56,22 +246,14 @@ class Lead:
             self.name = self.name.strip()
         
         # Validate and clean email
-        if self.email and not pd.isna(self.email):
-            self.email = str(self.email).strip().lower()
-            if not self._is_valid_email(self.email):
-                self.email = None
-        else:
-            self.email = None
+        self.email = self._clean_email(self.email)
         
         # Clean phone number
         if self.phone:
             self.phone = self._clean_phone(self.phone)
         
         # Clean website URL
-        if self.website and not pd.isna(self.website):
-            self.website = self._clean_url(str(self.website))
-        else:
-            self.website = None
+        self.website = self._clean_website(self.website)
         
         # Clean social handles
         if self.social_handles:
@@ -122,14 +304,24 @@ class Lead:
             score += 5
             breakdown['industry'] = 5
         
-        self.lead_score = min(score, 100)  # Cap at 100
-        self.score_breakdown = breakdown
+        self._lead_score = min(score, 100)  # Cap at 100
+        self._score_breakdown = breakdown
+        self._score_dirty = False
     
     def add_pain_point(self, pain_point: str):
-        """Add a pain point and recalculate score"""
+        """Add a pain point; the score is recalculated on next read"""
         if pain_point and pain_point not in self.pain_points:
             self.pain_points.append(pain_point)
-            self.calculate_lead_score()
+            self._score_dirty = True
+    
+    def add_pain_points(self, pain_points: Iterable[str]):
+        """Add several pain points, skipping empty values and duplicates"""
+        existing = set(self.pain_points)
+        for pain_point in pain_points:
+            if pain_point and pain_point not in existing:
+                self.pain_points.append(pain_point)
+                existing.add(pain_point)
+                self._score_dirty = True
     
     def add_social_handle(self, platform: str, handle: str):
         """Add a social media handle"""
@@ -166,7 +358,8 @@ class Lead:
             'scraped_at': self.scraped_at.isoformat(),
             'last_updated': self.last_updated.isoformat(),
             'notes': self.notes,
-            'tags': ', '.join(self.tags) if self.tags else None
+            'tags': ', '.join(self.tags) if self.tags else None,
+            'sources': ', '.join(self.sources) if self.sources else None
         }
     
     @classmethod
@@ -185,6 +378,8 @@ class Lead:
             clean_data['pain_points'] = clean_data['pain_points'].split(', ')
         if isinstance(clean_data.get('tags'), str):
             clean_data['tags'] = clean_data['tags'].split(', ')
+        if isinstance(clean_data.get('sources'), str):
+            clean_data['sources'] = clean_data['sources'].split(', ')
 
         # Handle datetime fields
         if isinstance(clean_data.get('scraped_at'), str):
@@ -193,31 +388,145 @@ class Lead:
             clean_data['last_updated'] = datetime.fromisoformat(clean_data['last_updated'])
 
         return cls(**clean_data)
-    
-    def _is_valid_email(self, email: str) -> bool:
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], trust_scores: bool = False) -> List['Lead']:
+        """Create leads in bulk from dicts such as to_dict output or csv.DictReader rows
+
+        Parses the same string encodings as from_dict, but column by column, and
+        also reads all-text rows: empty strings count as missing in every column
+        and numeric columns are parsed from their text. Keys that are not lead
+        fields are ignored. See _from_columns for trust_scores.
+        """
+        records = records if isinstance(records, list) else list(records)
+        try:
+            # Fast path for complete records such as to_dict output
+            rows = list(map(itemgetter(*cls.FIELDS), records))
+            columns = dict(zip(cls.FIELDS, map(list, zip(*rows)))) if rows else {name: [] for name in cls.FIELDS}
+        except KeyError:
+            columns = {name: [record.get(name) for record in records] for name in cls.FIELDS}
+        return cls._from_columns(columns, len(records), trust_scores)
+
+    @classmethod
+    def from_dataframe(cls, df: Any, trust_scores: bool = False) -> List['Lead']:
+        """Create leads in bulk from a DataFrame, e.g. a re-imported CSV or Excel export
+
+        NaN/NA cells count as missing, float follower counts (from columns with
+        gaps) become ints and numeric phone numbers become strings (read CSVs
+        with dtype={'phone': str} to keep leading zeros).
+        """
+        import pandas as pd
+
+        n = len(df)
+        columns = {}
+        for name in cls.FIELDS:
+            if name in df.columns:
+                columns[name] = df[name].to_numpy(dtype=object, na_value=None).tolist()
+            else:
+                columns[name] = [None] * n
+
+        for name in ('scraped_at', 'last_updated'):
+            if name in df.columns and pd.api.types.is_datetime64_any_dtype(df[name]):
+                columns[name] = [None if ts is None else ts.to_pydatetime() for ts in columns[name]]
+
+        columns['followers'] = [int(value) if type(value) is float else value for value in columns['followers']]
+        columns['phone'] = [
+            str(int(value)) if type(value) is float and value.is_integer()
+            else str(value) if type(value) is int else value
+            for value in columns['phone']
+        ]
+        return cls._from_columns(columns, n, trust_scores)
+
+    @classmethod
+    def _from_columns(cls, columns: Dict[str, List[Any]], n: int, trust_scores: bool) -> List['Lead']:
+        """Decode string-encoded columns and construct the leads
+
+        Without trust_scores every lead is built through the constructor and its
+        score recomputed lazily, as with from_dict. With trust_scores, rows that
+        carry a lead_score are taken to be clean Lead output and are built with
+        from_trusted, keeping the stored score and breakdown.
+        """
+        for name in cls.FIELDS:
+            # Text sources such as csv.DictReader write missing values as ''
+            columns[name] = [None if type(value) is str and not value else value for value in columns[name]]
+        for name in ('social_handles', 'score_breakdown'):
+            values = columns[name]
+            # Decode each distinct JSON string once and give every lead its own copy
+            parsed = {value: json.loads(value) for value in set(values) if type(value) is str and value}
+            columns[name] = [
+                (_copy_json(parsed[value]) if value else None) if type(value) is str
+                else None if is_missing(value) else value
+                for value in values
+            ]
+        for name in ('pain_points', 'tags', 'sources'):
+            columns[name] = [
+                (value.split(', ') if value else None) if type(value) is str
+                else None if is_missing(value) else value
+                for value in columns[name]
+            ]
+        for name in ('scraped_at', 'last_updated'):
+            values = columns[name]
+            # Timestamps repeat across a batch, so parse each distinct string once
+            parsed = {value: datetime.fromisoformat(value) for value in set(values) if type(value) is str and value}
+            columns[name] = [
+                parsed.get(value) if type(value) is str
+                else None if is_missing(value) else value
+                for value in values
+            ]
+        columns['followers'] = [_number(value, int) for value in columns['followers']]
+        columns['engagement_rate'] = [_number(value, float) for value in columns['engagement_rate']]
+        columns['lead_score'] = [_number(value, int) for value in columns['lead_score']]
+
+        rows = zip(*(columns[name] for name in cls.FIELDS))
+        if not trust_scores:
+            return [cls(*row) for row in rows]
+
+        score_index = cls.FIELDS.index('lead_score')
+        from_trusted = cls.from_trusted
+        return [from_trusted(*row) if row[score_index] is not None else cls(*row) for row in rows]
+
+    @staticmethod
+    def _is_valid_email(email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return EMAIL_PATTERN.match(email) is not None
     
-    def _clean_phone(self, phone: str) -> str:
-        """Clean phone number"""
-        if not phone or pd.isna(phone):
+    @staticmethod
+    def _clean_email(email: Any) -> Optional[str]:
+        """Normalize email, returning None if missing or invalid"""
+        if not email or is_missing(email):
             return None
-
-        # Convert to string if it's not already
-        phone_str = str(phone)
-
-        # Remove all non-digit characters except +
-        cleaned = re.sub(r'[^\d+]', '', phone_str)
-        return cleaned if len(cleaned) >= 7 else None
+        email = str(email).strip().lower()
+        return email if EMAIL_PATTERN.match(email) else None
+    
+    @staticmethod
+    def _clean_phone(phone: Any) -> Optional[str]:
+        """Normalize phone number to E.164, returning None if missing or invalid"""
+        if not phone or is_missing(phone):
+            return None
+        return normalize_phone(phone if isinstance(phone, (str, int, float)) else str(phone))
     
-    def _clean_url(self, url: str) -> str:
+    @staticmethod
+    def _clean_website(website: Any) -> Optional[str]:
+        """Clean website URL, returning None if missing"""
+        if not website or is_missing(website):
+            return None
+        return Lead._clean_url(str(website))
+    
+    @staticmethod
+    def _clean_url(url: str) -> str:
         """Clean and validate URL"""
         url = url.strip()
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
         return url
     
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+    
+    __hash__ = None
+    
     def __str__(self) -> str:
         return f"Lead(name='{self.name}', platform='{self.platform}', score={self.lead_score})"
     
@@ -0,0 +1,187 @@
+"""
+Columnar lead container with vectorized cleaning, scoring and quality checks
+"""
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+from src.models.lead import Lead, EMAIL_PATTERN
+from src.utils.phone import normalize_phone_column
+
+# Columns held by a batch; scores are derived by LeadBatch.score()
+DATA_COLUMNS = [name for name in Lead.FIELDS if name not in ('lead_score', 'score_breakdown')]
+
+# Point columns in the order Lead.calculate_lead_score fills score_breakdown
+SCORE_RULES = ['email', 'phone', 'website', 'high_followers', 'medium_followers', 'low_followers',
+               'high_engagement', 'pain_points', 'industry']
+
+# A URL with a scheme and a non-empty network location, as urlparse sees it
+URL_PATTERN = r'^[A-Za-z][A-Za-z0-9+\-.]*://[^/?#]'
+
+# urlparse drops leading C0 control characters/spaces and tabs/newlines anywhere
+URL_LEADING_JUNK = ''.join(chr(code) for code in range(0x21))
+
+
+def present(column: pd.Series) -> np.ndarray:
+    """Mask of values that are neither missing (None/NaN/NA) nor falsy"""
+    not_missing = column.notna().to_numpy()
+    truthy = column.where(column.notna(), None).astype(bool).to_numpy()
+    return not_missing & truthy
+
+
+def _as_strings(column: pd.Series, mask: np.ndarray) -> pd.Series:
+    """String values of the masked entries"""
+    return column[mask].astype(str)
+
+
+def _to_python(column: pd.Series) -> List[Any]:
+    """Column values as Python objects with None for missing values"""
+    return column.to_numpy(dtype=object, na_value=None).tolist()
+
+
+class LeadBatch:
+    """Columnar (pandas-backed) container for processing many leads at once
+
+    Missing values are None/NaN and always count as absent. Cleaning and scoring
+    follow Lead.clean_data / Lead.calculate_lead_score, and data quality follows
+    DataValidator.score_data_quality, but run over whole columns.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        frame = frame.reset_index(drop=True)
+        self.frame = frame.reindex(columns=DATA_COLUMNS + [c for c in frame.columns if c not in DATA_COLUMNS])
+        self.score_points: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def from_leads(cls, leads: Iterable[Lead]) -> 'LeadBatch':
+        """Build a batch from Lead objects"""
+        leads = list(leads)
+        columns = {name: [getattr(lead, name) for lead in leads] for name in DATA_COLUMNS}
+        return cls(pd.DataFrame(columns))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'LeadBatch':
+        """Build a batch from raw dicts with native (unjoined) list and dict values"""
+        return cls(pd.DataFrame.from_records(list(records)))
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def clean(self) -> 'LeadBatch':
+        """Clean names, emails, phones, websites and social handles in place"""
+        frame = self.frame
+        n = len(frame)
+
+        # Name: strip strings
+        names = frame['name']
+        is_str = np.fromiter((type(value) is str for value in names), dtype=bool, count=n)
+        frame.loc[is_str, 'name'] = names[is_str].str.strip()
+
+        # Email: lowercase, strip and keep only valid addresses
+        mask = present(frame['email'])
+        emails = _as_strings(frame['email'], mask).str.strip().str.lower()
+        emails = emails.where(emails.str.match(EMAIL_PATTERN.pattern), None)
+        frame['email'] = pd.Series(None, index=frame.index, dtype=object)
+        frame.loc[mask, 'email'] = emails.to_numpy()
+
+        # Phone: normalize to E.164, each distinct number once
+        phones = frame['phone']
+        missing = phones.isna().to_numpy()
+        mask = present(phones)
+        cleaned = normalize_phone_column(phones[mask])
+        phones = phones.astype(object).where(~missing, None)
+        phones[mask] = cleaned
+        frame['phone'] = phones
+
+        # Website: strip and default to https
+        mask = present(frame['website'])
+        urls = _as_strings(frame['website'], mask).str.strip()
+        urls = urls.where(urls.str.startswith(('http://', 'https://')), 'https://' + urls)
+        frame['website'] = pd.Series(None, index=frame.index, dtype=object)
+        frame.loc[mask, 'website'] = urls.to_numpy()
+
+        # Social handles: drop empty handles
+        frame['social_handles'] = [
+            {k: v for k, v in handles.items() if v} if isinstance(handles, dict) and handles else {}
+            for handles in frame['social_handles']
+        ]
+
+        self.score_points = None
+        return self
+
+    def score(self) -> 'LeadBatch':
+        """Compute lead_score and the per-rule points for every lead"""
+        frame = self.frame
+        n = len(frame)
+        followers = pd.to_numeric(frame['followers'], errors='coerce').to_numpy(dtype=float)
+        engagement = pd.to_numeric(frame['engagement_rate'], errors='coerce').to_numpy(dtype=float)
+        has_followers = ~np.isnan(followers) & (followers != 0)
+
+        pain_point_counts = np.fromiter(
+            (len(value) if isinstance(value, (list, tuple)) else 0 for value in frame['pain_points']),
+            dtype=np.int64, count=n
+        )
+
+        points = pd.DataFrame({
+            'email': np.where(present(frame['email']), 20, 0),
+            'phone': np.where(present(frame['phone']), 15, 0),
+            'website': np.where(present(frame['website']), 10, 0),
+            'high_followers': np.where(has_followers & (followers > 10000), 15, 0),
+            'medium_followers': np.where(has_followers & (followers <= 10000) & (followers > 1000), 10, 0),
+            'low_followers': np.where(has_followers & (followers <= 1000), 5, 0),
+            'high_engagement': np.where(engagement > 0.03, 10, 0),
+            'pain_points': pain_point_counts * 5,
+            'industry': np.where(present(frame['industry']), 5, 0),
+        }, index=frame.index, columns=SCORE_RULES)
+
+        self.score_points = points
+        frame['lead_score'] = np.minimum(points.to_numpy().sum(axis=1), 100)
+        return self
+
+    def data_quality_scores(self) -> pd.Series:
+        """Data quality score (0-100) per lead, as DataValidator.score_data_quality"""
+        frame = self.frame
+        score = np.zeros(len(frame), dtype=np.int64)
+        score += np.where(present(frame['name']), 20, 0)
+
+        mask = present(frame['email'])
+        emails = _as_strings(frame['email'], mask).str.strip()
+        score[np.flatnonzero(mask)[emails.str.match(EMAIL_PATTERN.pattern).to_numpy()]] += 25
+
+        mask = present(frame['phone'])
+        lengths = _as_strings(frame['phone'], mask).str.replace(r'[^\d+]', '', regex=True).str.len()
+        score[np.flatnonzero(mask)[((lengths >= 7) & (lengths <= 15)).to_numpy()]] += 20
+
+        mask = present(frame['website'])
+        urls = _as_strings(frame['website'], mask).str.lstrip(URL_LEADING_JUNK).str.replace(r'[\t\r\n]', '', regex=True)
+        score[np.flatnonzero(mask)[urls.str.match(URL_PATTERN).to_numpy()]] += 15
+
+        for column in ('address', 'industry', 'social_handles', 'pain_points'):
+            score += np.where(present(frame[column]), 5, 0)
+
+        return pd.Series(np.minimum(score, 100), index=frame.index, name='data_quality_score')
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the underlying DataFrame"""
+        return self.frame
+
+    def to_leads(self) -> List[Lead]:
+        """Convert the batch back to Lead objects, keeping computed scores"""
+        frame = self.frame
+        columns = {name: _to_python(frame[name]) for name in DATA_COLUMNS}
+        for name in ('scraped_at', 'last_updated'):
+            timestamps = pd.to_datetime(frame[name])
+            columns[name] = pd.Series(timestamps.dt.to_pydatetime(), dtype=object).where(timestamps.notna().to_numpy(), None).tolist()
+        columns['followers'] = [None if value is None else int(value) for value in columns['followers']]
+
+        if self.score_points is not None:
+            columns['lead_score'] = frame['lead_score'].tolist()
+            columns['score_breakdown'] = [
+                {rule: value for rule, value in zip(SCORE_RULES, row) if value}
+                for row in self.score_points.to_numpy().tolist()
+            ]
+        else:
+            columns['lead_score'] = columns['score_breakdown'] = [None] * len(frame)
+
+        # from_trusted takes its arguments in Lead.FIELDS order
+        return [Lead.from_trusted(*values) for values in zip(*(columns[name] for name in Lead.FIELDS))]
@@ -0,0 +1,159 @@
+"""
+Versioned JSON and MessagePack codecs for leads
+"""
+import json
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+from src.models.lead import Lead
+
+try:
+    import orjson
+except ImportError:  # fall back to the standard library
+    orjson = None
+
+# Bump when the record layout changes and add an upgrade step to _upgrade_record
+# v2: added 'sources'
+SCHEMA_VERSION = 2
+
+# Field order of the positional (MessagePack) layout
+RECORD_FIELDS = Lead.FIELDS
+
+_DATETIME_FIELDS = ('scraped_at', 'last_updated')
+
+
+def lead_to_record(lead: Lead) -> Dict[str, Any]:
+    """Convert a lead to a plain record with native lists/dicts and a schema version"""
+    record = {'v': SCHEMA_VERSION}
+    for name in RECORD_FIELDS:
+        record[name] = getattr(lead, name)
+    for name in _DATETIME_FIELDS:
+        if record[name] is not None:
+            record[name] = record[name].isoformat()
+    return record
+
+
+def record_to_lead(record: Dict[str, Any]) -> Lead:
+    """Rebuild a lead from a record, keeping its stored score"""
+    record = _upgrade_record(record)
+    values = {name: record.get(name) for name in RECORD_FIELDS}
+    for name in _DATETIME_FIELDS:
+        if isinstance(values[name], str):
+            values[name] = datetime.fromisoformat(values[name])
+    return Lead.from_trusted(**values)
+
+
+def _upgrade_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Bring a record written by an older schema version up to date"""
+    version = record.get('v', SCHEMA_VERSION)
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Lead record schema v{version} is newer than supported v{SCHEMA_VERSION}")
+    # v1 records have no 'sources'; the missing value decodes as an empty list
+    return record
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# JSON
+
+def encode_json(lead: Lead) -> bytes:
+    """Encode one lead as a JSON object"""
+    return _dumps(lead_to_record(lead))
+
+
+def decode_json(data: Any) -> Lead:
+    """Decode one lead from a JSON object"""
+    return record_to_lead(_loads(data))
+
+
+def encode_json_many(leads: Iterable[Lead]) -> bytes:
+    """Encode leads as a JSON array"""
+    return _dumps([lead_to_record(lead) for lead in leads])
+
+
+def decode_json_many(data: Any) -> List[Lead]:
+    """Decode leads from a JSON array"""
+    return [record_to_lead(record) for record in _loads(data)]
+
+
+def write_jsonl(leads: Iterable[Lead], stream: BinaryIO) -> int:
+    """Write leads to a binary stream as JSON lines and return the count"""
+    count = 0
+    for lead in leads:
+        stream.write(_dumps(lead_to_record(lead)))
+        stream.write(b'\n')
+        count += 1
+    return count
+
+
+def iter_jsonl(stream: BinaryIO) -> Iterator[Lead]:
+    """Read leads from a JSON lines stream one at a time"""
+    for line in stream:
+        if line.strip():
+            yield record_to_lead(_loads(line))
+
+
+# MessagePack
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("msgpack not installed. Run: pip install msgpack")
+    return msgpack
+
+
+def _to_row(lead: Lead) -> List[Any]:
+    record = lead_to_record(lead)
+    return [record[name] for name in RECORD_FIELDS]
+
+
+def _from_row(row: List[Any], version: int, fields: Optional[List[str]] = None) -> Lead:
+    record = dict(zip(fields or RECORD_FIELDS, row))
+    record['v'] = version
+    return record_to_lead(record)
+
+
+def encode_msgpack(lead: Lead) -> bytes:
+    """Encode one lead as a compact positional MessagePack array"""
+    return _msgpack().packb([SCHEMA_VERSION] + _to_row(lead), use_bin_type=True)
+
+
+def decode_msgpack(data: bytes) -> Lead:
+    """Decode one lead from encode_msgpack output"""
+    values = _msgpack().unpackb(data, raw=False)
+    return _from_row(values[1:], values[0])
+
+
+def write_msgpack_stream(leads: Iterable[Lead], stream: BinaryIO) -> int:
+    """Write a header followed by one positional array per lead and return the count"""
+    msgpack = _msgpack()
+    packer = msgpack.Packer(use_bin_type=True)
+    stream.write(packer.pack({'schema': 'lead', 'v': SCHEMA_VERSION, 'fields': list(RECORD_FIELDS)}))
+    count = 0
+    for lead in leads:
+        stream.write(packer.pack(_to_row(lead)))
+        count += 1
+    return count
+
+
+def iter_msgpack_stream(stream: BinaryIO) -> Iterator[Lead]:
+    """Read leads written by write_msgpack_stream one at a time"""
+    unpacker = _msgpack().Unpacker(stream, raw=False)
+    header = next(unpacker, None)
+    if header is None:
+        return
+    if not isinstance(header, dict) or header.get('schema') != 'lead':
+        raise ValueError("Not a lead MessagePack stream")
+    for row in unpacker:
+        yield _from_row(row, header['v'], header['fields'])
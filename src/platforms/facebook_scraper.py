@@ -1,13 +1,18 @@
 """
 Facebook-specific scraper for groups, pages, and business profiles
 """
+import re
 import time
-from typing import List, Dict, Optional, Any
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Iterator, Tuple
 from selenium.webdriver.common.by import By
 from loguru import logger
 
 from src.core.selenium_handler import SeleniumHandler
 from src.core.data_parser import DataParser
+from src.core.geo_planner import GeoCrawlPlanner
+from src.core.scraper_pool import ScraperPool
 from src.models.lead import Lead
 from config.settings import PLATFORM_CONFIGS
 
@@ -15,6 +20,36 @@ from config.settings import PLATFORM_CONFIGS
 class FacebookScraper:
     """Scraper for Facebook groups, pages, and business profiles"""
     
+    # Facebook group post selectors (these may need updating)
+    POST_SELECTORS = [
+        'div[data-pagelet="FeedUnit_0"]',
+        'div[role="article"]',
+        '.userContentWrapper'
+    ]
+    
+    # Number of recent post ids remembered to skip posts re-rendered after scrolling
+    SEEN_POST_IDS_LIMIT = 5000
+    
+    # Detaches up to N unprocessed top-level posts from the feed, leaving same-height
+    # placeholders so scrolling keeps loading, and returns [permalink, outerHTML] pairs
+    _TAKE_POSTS_SCRIPT = """
+        const selectors = arguments[0], limit = arguments[1];
+        let nodes = [];
+        for (const selector of selectors) {
+            nodes = Array.from(document.querySelectorAll(selector))
+                .filter(node => !(node.parentElement && node.parentElement.closest(selector)));
+            if (nodes.length) break;
+        }
+        return nodes.slice(0, limit).map(node => {
+            const link = node.querySelector('a[href*="/posts/"], a[href*="/permalink/"], a[href*="story_fbid"]');
+            const html = node.outerHTML;
+            const placeholder = document.createElement('div');
+            placeholder.style.height = node.offsetHeight + 'px';
+            node.replaceWith(placeholder);
+            return [link ? link.getAttribute('href') : null, html];
+        });
+    """
+    
     def __init__(self, email: str = None, password: str = None):
         self.config = PLATFORM_CONFIGS['facebook']
         self.email = email
@@ -38,8 +73,11 @@ class FacebookScraper:
         
         return self.selenium_handler.login_facebook(self.email, self.password)
     
-    def scrape_group(self, group_url: str, max_posts: int = 50) -> List[Lead]:
+    def scrape_group(self, group_url: str, max_posts: int = 50, streaming: bool = False) -> List[Lead]:
         """Scrape Facebook group for business posts and leads"""
+        if streaming:
+            return list(self.scrape_group_streaming(group_url, max_posts))
+        
         leads = []
         
         try:
@@ -74,6 +112,60 @@ class FacebookScraper:
         
         return leads
     
+    def scrape_group_streaming(self, group_url: str, max_posts: int = 50, batch_size: int = 20,
+                               max_idle_scrolls: int = 3) -> Iterator[Lead]:
+        """Yield leads from a Facebook group while scrolling, with bounded memory
+        
+        Posts are taken from the page in batches of ``batch_size`` as they appear,
+        parsed one at a time and removed from the DOM, so neither the browser nor
+        this process accumulates post content regardless of group size.
+        """
+        try:
+            logger.info(f"Streaming Facebook group: {group_url}")
+            
+            if not self.selenium_handler.navigate_to(group_url):
+                return
+            
+            # Wait for group content to load
+            time.sleep(3)
+            
+            seen_post_ids = OrderedDict()
+            processed = 0
+            lead_count = 0
+            idle_scrolls = 0
+            
+            while processed < max_posts and idle_scrolls < max_idle_scrolls:
+                batch = self._take_post_batch(batch_size)
+                
+                for permalink, post_html in batch:
+                    post = self._parse_post_html(post_html)
+                    post_id = self._post_id(permalink, post['text'])
+                    if post_id in seen_post_ids:
+                        continue
+                    
+                    seen_post_ids[post_id] = None
+                    if len(seen_post_ids) > self.SEEN_POST_IDS_LIMIT:
+                        seen_post_ids.popitem(last=False)
+                    
+                    processed += 1
+                    lead = self._create_lead_from_post(post, group_url)
+                    if lead:
+                        lead_count += 1
+                        yield lead
+                    
+                    if processed >= max_posts:
+                        break
+                
+                # A full batch means more posts are already rendered; otherwise load more
+                if len(batch) < batch_size:
+                    idle_scrolls = idle_scrolls + 1 if not batch else 0
+                    self.selenium_handler.scroll_page("bottom")
+            
+            logger.info(f"Streamed {processed} posts and {lead_count} leads from Facebook group")
+            
+        except Exception as e:
+            logger.error(f"Error streaming Facebook group: {e}")
+    
     def scrape_page(self, page_url: str) -> Optional[Lead]:
         """Scrape Facebook business page"""
         try:
@@ -93,6 +185,16 @@ class FacebookScraper:
             
             # Get page source and parse
             html_content = self.selenium_handler.get_page_source()
+            return self._create_lead_from_page(html_content, page_url)
+        
+        except Exception as e:
+            logger.error(f"Error scraping Facebook page: {e}")
+        
+        return None
+    
+    def _create_lead_from_page(self, html_content: str, page_url: str) -> Optional[Lead]:
+        """Create lead from the HTML of a Facebook page (ideally its About tab)"""
+        try:
             parser = DataParser(html_content, page_url)
             
             # Extract page information
@@ -114,14 +216,13 @@ class FacebookScraper:
                 # Add pain points from page description
                 if page_data.get('description'):
                     pain_points = parser.extract_pain_points(page_data['description'])
-                    for pain_point in pain_points:
-                        lead.add_pain_point(pain_point)
+                    lead.add_pain_points(pain_points)
                 
                 logger.info(f"Created lead: {lead.name} (Score: {lead.lead_score})")
                 return lead
         
         except Exception as e:
-            logger.error(f"Error scraping Facebook page: {e}")
+            logger.error(f"Error parsing Facebook page {page_url}: {e}")
         
         return None
     
@@ -151,12 +252,16 @@ class FacebookScraper:
             # Extract search results
             results = self._extract_search_results(parser)
             
+            # Load the About tab directly so pages can be prefetched without clicking through
+            page_urls = {}
             for result in results[:max_results]:
                 if result.get('page_url'):
-                    lead = self.scrape_page(result['page_url'])
-                    if lead:
-                        leads.append(lead)
-                        time.sleep(2)  # Rate limiting
+                    page_urls[self._about_url(result['page_url'])] = result['page_url']
+            
+            for about_url, page_html in self.selenium_handler.iter_pages_pipelined(page_urls):
+                lead = self._create_lead_from_page(page_html, page_urls[about_url])
+                if lead:
+                    leads.append(lead)
             
             logger.info(f"Found {len(leads)} leads from Facebook search")
             
@@ -165,18 +270,60 @@ class FacebookScraper:
         
         return leads
     
+    def search_local_businesses_tiled(self, location: str, business_type: str, max_results: int = 20,
+                                      max_workers: int = 3, max_queries: int = 60) -> List[Lead]:
+        """Search a large location tile by tile (districts, then postcodes) in parallel browsers"""
+        planner = GeoCrawlPlanner()
+        pool = ScraperPool(
+            lambda: FacebookScraper(self.email, self.password),
+            setup=lambda scraper: scraper.login() if scraper.email and scraper.password else None
+        )
+        
+        with pool:
+            return planner.crawl(
+                location,
+                lambda tile_location: pool.get().search_local_businesses(tile_location, business_type, max_results),
+                result_cap=max_results,
+                max_workers=max_workers,
+                max_queries=max_queries
+            )
+    
+    def _about_url(self, page_url: str) -> str:
+        """Build the About tab URL for a Facebook page"""
+        return page_url.split('?')[0].rstrip('/') + '/about'
+    
+    def _take_post_batch(self, batch_size: int) -> List[Tuple[Optional[str], str]]:
+        """Detach up to batch_size unprocessed posts from the page and return their HTML"""
+        try:
+            return self.selenium_handler.driver.execute_script(
+                self._TAKE_POSTS_SCRIPT, self.POST_SELECTORS, batch_size
+            ) or []
+        except Exception as e:
+            logger.warning(f"Failed to read group posts from page: {e}")
+            return []
+    
+    def _parse_post_html(self, post_html: str) -> Dict[str, Any]:
+        """Parse a single post's HTML into post data"""
+        parser = DataParser(post_html)
+        element = parser.soup.find(True) or parser.soup
+        return {
+            'text': element.get_text(strip=True),
+            'author': self._extract_post_author(element)
+        }
+    
+    def _post_id(self, permalink: Optional[str], text: str) -> str:
+        """Identify a post by its permalink id, falling back to a hash of its text"""
+        if permalink:
+            match = re.search(r'(?:/posts/|/permalink/|story_fbid=)([\w.]+)', permalink)
+            if match:
+                return match.group(1)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
     def _extract_group_posts(self, parser: DataParser) -> List[Dict[str, Any]]:
         """Extract posts from Facebook group"""
         posts = []
         
-        # Facebook group post selectors (these may need updating)
-        post_selectors = [
-            'div[data-pagelet="FeedUnit_0"]',
-            'div[role="article"]',
-            '.userContentWrapper'
-        ]
-        
-        for selector in post_selectors:
+        for selector in self.POST_SELECTORS:
             post_elements = parser.soup.select(selector)
             if post_elements:
                 for element in post_elements:
@@ -306,8 +453,7 @@ class FacebookScraper:
         if post_data.get('text'):
             parser = DataParser(f"<div>{post_data['text']}</div>")
             pain_points = parser.extract_pain_points(post_data['text'])
-            for pain_point in pain_points:
-                lead.add_pain_point(pain_point)
+            lead.add_pain_points(pain_points)
         
         # Extract contact info from post
         if post_data.get('text'):
@@ -10,6 +10,7 @@ from loguru import logger
 from src.core.selenium_handler import SeleniumHandler
 from src.core.data_parser import DataParser
 from src.models.lead import Lead
+from src.utils.deduplication import LeadDeduplicator
 from config.settings import PLATFORM_CONFIGS
 
 
@@ -72,8 +73,7 @@ class InstagramScraper:
                 # Add pain points from bio
                 if profile_data.get('bio'):
                     pain_points = parser.extract_pain_points(profile_data['bio'])
-                    for pain_point in pain_points:
-                        lead.add_pain_point(pain_point)
+                    lead.add_pain_points(pain_points)
                 
                 # Extract contact info from bio
                 if profile_data.get('bio'):
@@ -198,15 +198,8 @@ class InstagramScraper:
                 if len(leads) >= max_profiles:
                     break
             
-            # Remove duplicates based on username
-            unique_leads = []
-            seen_usernames = set()
-            
-            for lead in leads:
-                username = lead.social_handles.get('instagram', '')
-                if username not in seen_usernames:
-                    unique_leads.append(lead)
-                    seen_usernames.add(username)
+            # Remove duplicates (same username, contact details or business name)
+            unique_leads = LeadDeduplicator().deduplicate(leads)
             
             logger.info(f"Found {len(unique_leads)} unique leads for category: {category}")
             return unique_leads[:max_profiles]
@@ -1,20 +1,33 @@
 """
 Yelp-specific scraper for business listings and reviews
 """
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional, Any
 from urllib.parse import quote_plus
+import numpy as np
+import pandas as pd
 from loguru import logger
 
 from src.core.selenium_handler import SeleniumHandler
 from src.core.data_parser import DataParser
+from src.core.geo_planner import GeoCrawlPlanner
+from src.core.scraper_pool import ScraperPool
 from src.models.lead import Lead
-from config.settings import PLATFORM_CONFIGS
+from config.settings import PLATFORM_CONFIGS, PAIN_POINT_KEYWORDS
 
 
 class YelpScraper:
     """Scraper for Yelp business listings"""
     
+    # Number of business links taken from one search results page
+    MAX_SEARCH_LINKS = 10
+    
+    # Review keywords tallied by the insight methods
+    COMPLAINT_KEYWORDS = ['slow', 'expensive', 'rude', 'poor', 'bad', 'terrible', 'awful']
+    POSITIVE_KEYWORDS = ['great', 'excellent', 'amazing', 'fantastic', 'wonderful', 'perfect']
+    
     def __init__(self):
         self.config = PLATFORM_CONFIGS['yelp']
         self.selenium_handler = None
@@ -53,12 +66,12 @@ class YelpScraper:
             # Extract business listings
             business_links = self._extract_business_links(parser)
             
-            # Scrape each business
-            for business_link in business_links[:max_results]:
-                lead = self.scrape_business(business_link)
+            # Scrape each business, prefetching the next page while the current one is parsed
+            pages = self.selenium_handler.iter_pages_pipelined(business_links[:max_results])
+            for business_url, page_html in pages:
+                lead = self._create_lead_from_page(page_html, business_url)
                 if lead:
                     leads.append(lead)
-                time.sleep(1)  # Rate limiting
             
             logger.info(f"Found {len(leads)} leads from Yelp search")
             
@@ -67,6 +80,21 @@ class YelpScraper:
         
         return leads
     
+    def search_businesses_tiled(self, business_type: str, location: str, max_results: int = 50,
+                                max_workers: int = 3, max_queries: int = 60) -> List[Lead]:
+        """Search a large location tile by tile (districts, then postcodes) in parallel browsers"""
+        planner = GeoCrawlPlanner()
+        result_cap = min(max_results, self.MAX_SEARCH_LINKS)
+        
+        with ScraperPool(YelpScraper) as pool:
+            return planner.crawl(
+                location,
+                lambda tile_location: pool.get().search_businesses(business_type, tile_location, max_results),
+                result_cap=result_cap,
+                max_workers=max_workers,
+                max_queries=max_queries
+            )
+    
     def scrape_business(self, business_url: str) -> Optional[Lead]:
         """Scrape individual Yelp business page"""
         try:
@@ -79,6 +107,16 @@ class YelpScraper:
             
             # Get page source and parse
             html_content = self.selenium_handler.get_page_source()
+            return self._create_lead_from_page(html_content, business_url)
+        
+        except Exception as e:
+            logger.error(f"Error scraping Yelp business: {e}")
+        
+        return None
+    
+    def _create_lead_from_page(self, html_content: str, business_url: str) -> Optional[Lead]:
+        """Create lead from the HTML of a Yelp business page"""
+        try:
             parser = DataParser(html_content, business_url)
             
             # Extract business information
@@ -99,8 +137,7 @@ class YelpScraper:
                 # Add pain points from reviews or description
                 if business_data.get('description'):
                     pain_points = parser.extract_pain_points(business_data['description'])
-                    for pain_point in pain_points:
-                        lead.add_pain_point(pain_point)
+                    lead.add_pain_points(pain_points)
                 
                 # Add rating as engagement metric (converted to 0-1 scale)
                 if business_data.get('rating'):
@@ -110,7 +147,7 @@ class YelpScraper:
                 return lead
         
         except Exception as e:
-            logger.error(f"Error scraping Yelp business: {e}")
+            logger.error(f"Error parsing Yelp business page {business_url}: {e}")
         
         return None
     
@@ -128,46 +165,13 @@ class YelpScraper:
         }
         
         try:
-            if not self.selenium_handler.navigate_to(business_url):
-                return insights
-            
-            time.sleep(3)
-            
-            # Scroll to load reviews
-            self.selenium_handler.scroll_page("down", 1000)
-            time.sleep(2)
-            
-            # Get page source and parse
-            html_content = self.selenium_handler.get_page_source()
-            parser = DataParser(html_content, business_url)
-            
-            # Extract reviews
-            reviews = self._extract_reviews(parser, max_reviews)
+            reviews = self._fetch_reviews(business_url, max_reviews)
             
             # Analyze reviews for insights
-            for review in reviews:
-                review_text = review.get('text', '').lower()
-                
-                # Extract pain points
-                pain_points = parser.extract_pain_points(review_text)
-                insights['pain_points'].extend(pain_points)
-                
-                # Look for common complaint keywords
-                complaint_keywords = ['slow', 'expensive', 'rude', 'poor', 'bad', 'terrible', 'awful']
-                for keyword in complaint_keywords:
-                    if keyword in review_text:
-                        insights['common_complaints'].append(keyword)
-                
-                # Look for positive aspects
-                positive_keywords = ['great', 'excellent', 'amazing', 'fantastic', 'wonderful', 'perfect']
-                for keyword in positive_keywords:
-                    if keyword in review_text:
-                        insights['positive_aspects'].append(keyword)
-            
-            # Remove duplicates and count occurrences
-            insights['common_complaints'] = list(set(insights['common_complaints']))
-            insights['positive_aspects'] = list(set(insights['positive_aspects']))
-            insights['pain_points'] = list(set(insights['pain_points']))
+            tallies = self._aggregate_review_insights({business_url: reviews})['per_business'][business_url]
+            insights['common_complaints'] = list(tallies['common_complaints'])
+            insights['positive_aspects'] = list(tallies['positive_aspects'])
+            insights['pain_points'] = list(tallies['pain_points'])
             
             logger.info(f"Extracted insights from {len(reviews)} reviews")
             
@@ -176,6 +180,101 @@ class YelpScraper:
         
         return insights
     
+    def scrape_reviews_for_insights_batch(self, business_urls: List[str], max_reviews: int = 20,
+                                          max_workers: int = 3) -> Dict[str, Any]:
+        """Scrape reviews of many businesses concurrently and aggregate keyword tallies
+        
+        Counts are the number of reviews mentioning a keyword (or a pain point category).
+        Returns the businesses x keywords count ``matrix`` along with ``per_business``
+        and per-category ``totals`` tallies.
+        """
+        business_urls = list(dict.fromkeys(business_urls))
+        reviews_by_business = {url: [] for url in business_urls}
+        
+        with ScraperPool(YelpScraper) as pool, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(lambda url: pool.get()._fetch_reviews(url, max_reviews), url): url
+                for url in business_urls
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    reviews_by_business[url] = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching reviews for {url}: {e}")
+        
+        insights = self._aggregate_review_insights(reviews_by_business)
+        logger.info(f"Aggregated insights from {insights['reviews_analyzed']} reviews "
+                    f"across {len(business_urls)} businesses")
+        return insights
+    
+    def _fetch_reviews(self, business_url: str, max_reviews: int = 20) -> List[str]:
+        """Load a business page and return the text of its reviews"""
+        if not self.selenium_handler.navigate_to(business_url):
+            return []
+        
+        time.sleep(3)
+        
+        # Scroll to load reviews
+        self.selenium_handler.scroll_page("down", 1000)
+        time.sleep(2)
+        
+        # Get page source and parse
+        html_content = self.selenium_handler.get_page_source()
+        parser = DataParser(html_content, business_url)
+        
+        return [review['text'] for review in self._extract_reviews(parser, max_reviews)]
+    
+    def _aggregate_review_insights(self, reviews_by_business: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Build the businesses x keywords matrix of review hits and derive tallies from it"""
+        keyword_groups = {
+            ('common_complaints', keyword): [keyword] for keyword in self.COMPLAINT_KEYWORDS
+        }
+        keyword_groups.update({
+            ('positive_aspects', keyword): [keyword] for keyword in self.POSITIVE_KEYWORDS
+        })
+        keyword_groups.update({
+            ('pain_points', category): keywords for category, keywords in PAIN_POINT_KEYWORDS.items()
+        })
+        
+        rows = [(url, text.lower()) for url, texts in reviews_by_business.items() for text in texts]
+        reviews = pd.DataFrame(rows, columns=['business_url', 'text'], dtype=object)
+        
+        # One vectorized substring scan per keyword group over all reviews at once
+        hits = {
+            column: reviews['text'].str.contains('|'.join(re.escape(k.lower()) for k in keywords), regex=True)
+            for column, keywords in keyword_groups.items()
+        }
+        hit_frame = pd.DataFrame(hits, index=reviews.index, columns=pd.MultiIndex.from_tuples(list(keyword_groups)))
+        matrix = (
+            hit_frame.astype(np.int64)
+            .groupby(reviews['business_url']).sum()
+            .reindex(list(reviews_by_business), fill_value=0)
+        )
+        review_counts = reviews.groupby('business_url').size().reindex(list(reviews_by_business), fill_value=0)
+        
+        categories = ['common_complaints', 'positive_aspects', 'pain_points']
+        per_business = {}
+        for url, row in matrix.iterrows():
+            tallies = {'review_count': int(review_counts[url])}
+            for category in categories:
+                counts = row[category]
+                tallies[category] = {label: int(count) for label, count in counts[counts > 0].sort_values(ascending=False).items()}
+            per_business[url] = tallies
+        
+        totals = {}
+        column_totals = matrix.sum()
+        for category in categories:
+            counts = column_totals[category]
+            totals[category] = {label: int(count) for label, count in counts[counts > 0].sort_values(ascending=False).items()}
+        
+        return {
+            'matrix': matrix,
+            'per_business': per_business,
+            'totals': totals,
+            'reviews_analyzed': len(reviews)
+        }
+    
     def _extract_business_links(self, parser: DataParser) -> List[str]:
         """Extract business page links from search results"""
         business_links = []
@@ -206,7 +305,7 @@ class YelpScraper:
                     if clean_url not in business_links:
                         business_links.append(clean_url)
 
-        return business_links[:10]  # Limit to first 10 results
+        return business_links[:self.MAX_SEARCH_LINKS]
     
     def _extract_business_info(self, parser: DataParser) -> Dict[str, Any]:
         """Extract business information from Yelp business page"""
@@ -0,0 +1,172 @@
+"""
+Vectorized validation engine behind DataValidator.validate_batch
+"""
+import re
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.models.lead_batch import URL_PATTERN
+from src.utils.data_validator import (
+    DataValidator, EMAIL_PATTERN, EMAIL_PREFIX_PATTERN, TRACKING_PARAM_PATTERN,
+    BUSINESS_TYPE_KEYWORDS, MIN_QUALITY_SCORE
+)
+from src.utils.phone import normalize_phone_column
+
+# Values whose truthiness can be tested without raising
+PLAIN_TYPES = (str, int, float, bool, list, tuple, dict, set, type(None))
+
+# One alternation per business type; re.search over it equals any(keyword in text)
+BUSINESS_TYPE_PATTERNS = [
+    (business_type, '|'.join(re.escape(keyword) for keyword in keywords))
+    for business_type, keywords in BUSINESS_TYPE_KEYWORDS.items()
+]
+
+# Websites urlparse may reject (bracketed hosts, non-ASCII netlocs) are checked one by one
+URL_EDGE_CASE_PATTERN = r'[\[\]]|[^\x00-\x7f]'
+
+
+def is_plain_lead(lead_data: Any) -> bool:
+    """Whether a lead dict only holds values the vectorized engine handles exactly like DataValidator"""
+    if type(lead_data) is not dict:
+        return False
+    for key in ('name', 'email', 'phone', 'website'):
+        value = lead_data.get(key)
+        if value is not None and type(value) is not str:
+            return False
+    for key in ('address', 'industry', 'pain_points'):
+        if not isinstance(lead_data.get(key), PLAIN_TYPES):
+            return False
+    handles = lead_data.get('social_handles')
+    if isinstance(handles, dict):
+        return all(isinstance(platform, str) and (handle is None or type(handle) is str)
+                   for platform, handle in handles.items())
+    return isinstance(handles, PLAIN_TYPES)
+
+
+def _present(values: List[Any]) -> np.ndarray:
+    """Truthiness mask of a column"""
+    return np.fromiter(map(bool, values), dtype=bool, count=len(values))
+
+
+def _scatter(n: int, mask: np.ndarray, values: pd.Series) -> np.ndarray:
+    """Place cleaned values of the masked rows into a column of Nones"""
+    column = np.full(n, None, dtype=object)
+    column[mask] = values.to_numpy(dtype=object)
+    return column
+
+
+def clean_emails(values: List[Any]) -> np.ndarray:
+    """Column version of DataValidator.clean_email for str/None values"""
+    mask = _present(values)
+    emails = pd.Series(values, dtype=object)[mask]
+    emails = emails.str.strip().str.lower().str.replace(EMAIL_PREFIX_PATTERN, '', regex=True)
+    valid = emails.str.strip().str.match(EMAIL_PATTERN)
+    return _scatter(len(values), mask, emails.where(valid, None))
+
+
+def clean_phone_numbers(values: List[Any]) -> np.ndarray:
+    """Column version of DataValidator.clean_phone_number for str/None values"""
+    mask = _present(values)
+    phones = normalize_phone_column(value for value, keep in zip(values, mask) if keep)
+    return _scatter(len(values), mask, pd.Series(phones, dtype=object))
+
+
+def clean_urls(values: List[Any]) -> np.ndarray:
+    """Column version of DataValidator.clean_url for str/None values"""
+    mask = _present(values)
+    urls = pd.Series(values, dtype=object)[mask].str.strip()
+    urls = urls.where(urls.str.startswith(('http://', 'https://')), 'https://' + urls)
+    urls = urls.str.replace(TRACKING_PARAM_PATTERN, '', regex=True)
+
+    valid = urls.str.replace(r'[\t\r\n]', '', regex=True).str.match(URL_PATTERN)
+    edge_cases = urls.str.contains(URL_EDGE_CASE_PATTERN, regex=True)
+    if edge_cases.any():
+        valid[edge_cases] = urls[edge_cases].map(DataValidator.validate_url)
+    return _scatter(len(values), mask, urls.where(valid.astype(bool), None))
+
+
+def detect_business_types(names: List[Any]) -> np.ndarray:
+    """Column version of DataValidator.detect_business_type for str/None values"""
+    mask = _present(names)
+    text = pd.Series(names, dtype=object)[mask].str.lower()
+    business_types = pd.Series(np.full(len(text), None, dtype=object), index=text.index)
+
+    # Types are tried in order, so each pass only searches the names still unmatched
+    for business_type, pattern in BUSINESS_TYPE_PATTERNS:
+        if text.empty:
+            break
+        matched = text.str.contains(pattern, regex=True).to_numpy(dtype=bool)
+        business_types[text.index[matched]] = business_type
+        text = text[~matched]
+    return _scatter(len(names), mask, business_types)
+
+
+def _validate_plain(leads: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """Clean and score plain leads column-wise; entries below the quality threshold are None"""
+    n = len(leads)
+    if not n:
+        return []
+
+    emails = clean_emails([lead.get('email') for lead in leads])
+    phones = clean_phone_numbers([lead.get('phone') for lead in leads])
+    websites = clean_urls([lead.get('website') for lead in leads])
+
+    needs_industry = [not lead.get('industry') for lead in leads]
+    names = [lead.get('name') if missing else None for lead, missing in zip(leads, needs_industry)]
+    industries = detect_business_types(names)
+
+    results = []
+    for i, lead_data in enumerate(leads):
+        cleaned_data = lead_data.copy()
+        if 'email' in cleaned_data:
+            cleaned_data['email'] = emails[i]
+        if 'phone' in cleaned_data:
+            cleaned_data['phone'] = phones[i]
+        if 'website' in cleaned_data:
+            cleaned_data['website'] = websites[i]
+        handles = cleaned_data.get('social_handles')
+        if isinstance(handles, dict):
+            cleaned_data['social_handles'] = {
+                platform: handle for platform, handle in handles.items()
+                if DataValidator.validate_social_handle(platform, handle)
+            }
+        if industries[i] is not None:
+            cleaned_data['industry'] = industries[i]
+
+        # Same points as DataValidator.score_data_quality; cleaned emails/websites are valid or None
+        phone = cleaned_data.get('phone')
+        score = 20 if cleaned_data.get('name') else 0
+        score += 25 if cleaned_data.get('email') else 0
+        score += 20 if phone and 7 <= len(phone) <= 15 else 0
+        score += 15 if cleaned_data.get('website') else 0
+        for key in ('address', 'industry', 'social_handles', 'pain_points'):
+            if cleaned_data.get(key):
+                score += 5
+        cleaned_data['data_quality_score'] = min(score, 100)
+
+        if cleaned_data['data_quality_score'] >= MIN_QUALITY_SCORE:
+            results.append(cleaned_data)
+        else:
+            logger.debug(f"Filtered out low-quality lead: {cleaned_data.get('name', 'Unknown')}")
+            results.append(None)
+    return results
+
+
+def validate_records(leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Clean, score and threshold-filter leads in order, without deduplication
+
+    Gives the same result as DataValidator.validate_and_score per lead. Leads
+    with unusual value types (which that method may reject with a warning)
+    are passed through it directly.
+    """
+    plain = [is_plain_lead(lead_data) for lead_data in leads]
+    plain_results = iter(_validate_plain([lead_data for lead_data, ok in zip(leads, plain) if ok]))
+
+    validated_leads = []
+    for lead_data, ok in zip(leads, plain):
+        cleaned_data = next(plain_results) if ok else DataValidator.validate_and_score(lead_data)
+        if cleaned_data is not None:
+            validated_leads.append(cleaned_data)
+    return validated_leads
@@ -2,11 +2,46 @@
 Data validation utilities for lead information
 """
 import re
-import requests
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, List, Dict, Any
 from urllib.parse import urlparse
 from loguru import logger
 
+from src.utils.deduplication import LeadDeduplicator
+from src.utils.url_checker import URLChecker
+from src.utils.phone import normalize_phone
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+EMAIL_PREFIX_PATTERN = re.compile(r'^(mailto:|email:)')
+PHONE_STRIP_PATTERN = re.compile(r'[^\d+]')
+TRACKING_PARAM_PATTERN = re.compile(r'[?&](utm_|fbclid|gclid)[^&]*')
+
+SOCIAL_HANDLE_PATTERNS = {
+    'instagram': re.compile(r'^[a-zA-Z0-9_.]{1,30}$'),
+    'facebook': re.compile(r'^[a-zA-Z0-9.]{5,50}$'),
+    'twitter': re.compile(r'^[a-zA-Z0-9_]{1,15}$'),
+    'linkedin': re.compile(r'^[a-zA-Z0-9\-]{3,100}$')
+}
+
+BUSINESS_TYPE_KEYWORDS = {
+    'restaurant': ['restaurant', 'café', 'bistro', 'eatery', 'diner', 'food'],
+    'retail': ['shop', 'store', 'boutique', 'retail', 'market'],
+    'service': ['service', 'repair', 'maintenance', 'cleaning'],
+    'healthcare': ['doctor', 'clinic', 'medical', 'health', 'dental', 'therapy'],
+    'fitness': ['gym', 'fitness', 'yoga', 'pilates', 'training'],
+    'beauty': ['salon', 'spa', 'beauty', 'hair', 'nails', 'massage'],
+    'professional': ['lawyer', 'attorney', 'accountant', 'consultant', 'agency'],
+    'education': ['school', 'education', 'training', 'course', 'academy'],
+    'automotive': ['auto', 'car', 'mechanic', 'garage', 'automotive'],
+    'real_estate': ['real estate', 'property', 'realtor', 'housing']
+}
+
+# Leads scoring below this data quality are dropped by validate_batch
+MIN_QUALITY_SCORE = 20
+
+# URL checkers shared by check_url_accessibility, one per timeout
+_URL_CHECKERS: Dict[int, URLChecker] = {}
+
 
 class DataValidator:
     """Validates and cleans scraped data"""
@@ -17,8 +52,7 @@ class DataValidator:
         if not email:
             return False
         
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email.strip()) is not None
+        return EMAIL_PATTERN.match(email.strip()) is not None
     
     @staticmethod
     def validate_phone(phone: str) -> bool:
@@ -27,7 +61,7 @@ class DataValidator:
             return False
         
         # Remove all non-digit characters except +
-        cleaned = re.sub(r'[^\d+]', '', phone)
+        cleaned = PHONE_STRIP_PATTERN.sub('', phone)
         
         # Check if it's a reasonable phone number length
         return 7 <= len(cleaned) <= 15
@@ -50,21 +84,8 @@ class DataValidator:
         if not phone:
             return None
         
-        # Remove all non-digit characters except +
-        cleaned = re.sub(r'[^\d+]', '', phone)
-        
-        # German phone number formatting
-        if cleaned.startswith('+49'):
-            # International format
-            return cleaned
-        elif cleaned.startswith('0'):
-            # National format - convert to international
-            return '+49' + cleaned[1:]
-        elif len(cleaned) >= 10:
-            # Assume it's missing country code
-            return '+49' + cleaned
-        
-        return cleaned if DataValidator.validate_phone(cleaned) else None
+        # E.164 with German national numbers converted to +49
+        return normalize_phone(phone)
     
     @staticmethod
     def clean_email(email: str) -> Optional[str]:
@@ -75,7 +96,7 @@ class DataValidator:
         email = email.strip().lower()
         
         # Remove common prefixes/suffixes
-        email = re.sub(r'^(mailto:|email:)', '', email)
+        email = EMAIL_PREFIX_PATTERN.sub('', email)
         
         return email if DataValidator.validate_email(email) else None
     
@@ -92,7 +113,7 @@ class DataValidator:
             url = 'https://' + url
         
         # Remove common tracking parameters
-        url = re.sub(r'[?&](utm_|fbclid|gclid)[^&]*', '', url)
+        url = TRACKING_PARAM_PATTERN.sub('', url)
         
         return url if DataValidator.validate_url(url) else None
     
@@ -111,21 +132,14 @@ class DataValidator:
         if not handle:
             return False
         
-        patterns = {
-            'instagram': r'^[a-zA-Z0-9_.]{1,30}$',
-            'facebook': r'^[a-zA-Z0-9.]{5,50}$',
-            'twitter': r'^[a-zA-Z0-9_]{1,15}$',
-            'linkedin': r'^[a-zA-Z0-9\-]{3,100}$'
-        }
-        
-        pattern = patterns.get(platform.lower())
+        pattern = SOCIAL_HANDLE_PATTERNS.get(platform.lower())
         if not pattern:
             return True  # Unknown platform, assume valid
         
         # Remove @ symbol if present
         handle = handle.lstrip('@')
         
-        return re.match(pattern, handle) is not None
+        return pattern.match(handle) is not None
     
     @staticmethod
     def detect_business_type(text: str) -> Optional[str]:
@@ -135,20 +149,7 @@ class DataValidator:
         
         text = text.lower()
         
-        business_types = {
-            'restaurant': ['restaurant', 'café', 'bistro', 'eatery', 'diner', 'food'],
-            'retail': ['shop', 'store', 'boutique', 'retail', 'market'],
-            'service': ['service', 'repair', 'maintenance', 'cleaning'],
-            'healthcare': ['doctor', 'clinic', 'medical', 'health', 'dental', 'therapy'],
-            'fitness': ['gym', 'fitness', 'yoga', 'pilates', 'training'],
-            'beauty': ['salon', 'spa', 'beauty', 'hair', 'nails', 'massage'],
-            'professional': ['lawyer', 'attorney', 'accountant', 'consultant', 'agency'],
-            'education': ['school', 'education', 'training', 'course', 'academy'],
-            'automotive': ['auto', 'car', 'mechanic', 'garage', 'automotive'],
-            'real_estate': ['real estate', 'property', 'realtor', 'housing']
-        }
-        
-        for business_type, keywords in business_types.items():
+        for business_type, keywords in BUSINESS_TYPE_KEYWORDS.items():
             if any(keyword in text for keyword in keywords):
                 return business_type
         
@@ -189,48 +190,37 @@ class DataValidator:
     
     @staticmethod
     def check_url_accessibility(url: str, timeout: int = 5) -> bool:
-        """Check if URL is accessible"""
+        """Check if URL is accessible (pooled session, HEAD with GET fallback, cached per host)"""
         try:
-            response = requests.head(url, timeout=timeout, allow_redirects=True)
-            return response.status_code < 400
-        except:
+            return DataValidator._url_checker(timeout).check(url)
+        except Exception:
             return False
     
+    @staticmethod
+    def check_urls_accessibility(urls: List[str], timeout: int = 5, max_workers: int = 16) -> Dict[str, bool]:
+        """Check many URLs concurrently, returning accessibility per URL"""
+        with URLChecker(timeout=timeout, max_workers=max_workers) as checker:
+            return checker.check_many(urls)
+    
+    @staticmethod
+    def _url_checker(timeout: int) -> URLChecker:
+        """Shared checker (and connection pool) for single URL checks"""
+        checker = _URL_CHECKERS.get(timeout)
+        if checker is None:
+            checker = _URL_CHECKERS.setdefault(timeout, URLChecker(timeout=timeout))
+        return checker
+    
     @staticmethod
     def deduplicate_leads(leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate leads based on multiple criteria"""
-        seen = set()
-        unique_leads = []
+        """Merge duplicate leads (by email, phone, domain, social handle or fuzzy name) into golden records"""
+        unique_leads = LeadDeduplicator().merge_duplicates(leads)
         
-        for lead in leads:
-            # Create a unique identifier based on multiple fields
-            identifiers = []
-            
-            if lead.get('email'):
-                identifiers.append(('email', lead['email'].lower()))
-            if lead.get('phone'):
-                identifiers.append(('phone', re.sub(r'[^\d+]', '', lead['phone'])))
-            if lead.get('website'):
-                domain = DataValidator.extract_domain(lead['website'])
-                if domain:
-                    identifiers.append(('domain', domain))
-            if lead.get('name'):
-                identifiers.append(('name', lead['name'].lower().strip()))
-            
-            # Check if any identifier has been seen before
-            is_duplicate = False
-            for identifier in identifiers:
-                if identifier in seen:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                # Add all identifiers to seen set
-                for identifier in identifiers:
-                    seen.add(identifier)
-                unique_leads.append(lead)
+        # Golden records combine several leads, so their data quality is rescored
+        for lead in unique_leads:
+            if 'data_quality_score' in lead and 'sources' in lead:
+                lead['data_quality_score'] = DataValidator.score_data_quality(lead)
         
-        logger.info(f"Removed {len(leads) - len(unique_leads)} duplicate leads")
+        logger.info(f"Merged {len(leads) - len(unique_leads)} duplicate leads")
         return unique_leads
     
     @staticmethod
@@ -263,27 +253,42 @@ class DataValidator:
         return min(score, 100)
     
     @staticmethod
-    def validate_batch(leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Validate and clean a batch of leads"""
-        validated_leads = []
-        
-        for lead_data in leads:
-            try:
-                # Validate and clean data
-                cleaned_data = DataValidator.validate_lead_data(lead_data)
-                
-                # Score data quality
-                quality_score = DataValidator.score_data_quality(cleaned_data)
-                cleaned_data['data_quality_score'] = quality_score
+    def validate_and_score(lead_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Clean and score one lead, returning None if it is invalid or below the quality threshold"""
+        try:
+            # Validate and clean data
+            cleaned_data = DataValidator.validate_lead_data(lead_data)
+            
+            # Score data quality
+            quality_score = DataValidator.score_data_quality(cleaned_data)
+            cleaned_data['data_quality_score'] = quality_score
+            
+            # Only keep leads with minimum quality
+            if quality_score >= MIN_QUALITY_SCORE:
+                return cleaned_data
+            logger.debug(f"Filtered out low-quality lead: {cleaned_data.get('name', 'Unknown')}")
                 
-                # Only keep leads with minimum quality
-                if quality_score >= 20:  # Minimum threshold
-                    validated_leads.append(cleaned_data)
-                else:
-                    logger.debug(f"Filtered out low-quality lead: {cleaned_data.get('name', 'Unknown')}")
-                    
-            except Exception as e:
-                logger.warning(f"Error validating lead data: {e}")
+        except Exception as e:
+            logger.warning(f"Error validating lead data: {e}")
+        return None
+    
+    @staticmethod
+    def validate_batch(leads: List[Dict[str, Any]], workers: int = 1, chunk_size: int = 10000) -> List[Dict[str, Any]]:
+        """Validate and clean a batch of leads
+        
+        Columns are cleaned and scored vectorized; with workers > 1 large batches
+        are split into chunks validated in separate processes. Deduplication
+        always runs over the whole batch afterwards.
+        """
+        from src.utils.batch_validation import validate_records
+        
+        leads = list(leads)
+        if workers > 1 and len(leads) > chunk_size:
+            chunks = [leads[i:i + chunk_size] for i in range(0, len(leads), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                validated_leads = [lead for chunk in executor.map(validate_records, chunks) for lead in chunk]
+        else:
+            validated_leads = validate_records(leads)
         
         # Remove duplicates
         validated_leads = DataValidator.deduplicate_leads(validated_leads)
@@ -0,0 +1,394 @@
+"""
+Blocking-index record linkage for finding duplicate leads
+"""
+import re
+import json
+import unicodedata
+from datetime import datetime
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+from src.models.lead import Lead, EMAIL_PATTERN, is_missing
+from src.utils.phone import normalize_phone
+
+Record = TypeVar('Record')
+
+UMLAUTS = (('ä', 'ae'), ('ö', 'oe'), ('ü', 'ue'), ('ß', 'ss'))
+
+# Legal-form tokens dropped from the end of business names ("Müller GmbH & Co. KG" -> "mueller")
+LEGAL_SUFFIXES = {
+    'gmbh', 'mbh', 'ug', 'haftungsbeschraenkt', 'ag', 'kg', 'kgaa', 'ohg', 'gbr', 'ek', 'ev', 'eg',
+    'co', 'und', 'ltd', 'inc', 'llc', 'se'
+}
+
+# Hosts shared by many businesses; a website on them does not identify a lead
+SHARED_HOSTS = {
+    'facebook.com', 'instagram.com', 'yelp.com', 'yelp.de', 'google.com', 'goo.gl', 'linktr.ee',
+    'twitter.com', 'x.com', 'linkedin.com', 'youtube.com', 'tiktok.com', 'wix.com', 'jimdo.com',
+    'business.site', 'sites.google.com'
+}
+
+NON_ALNUM_PATTERN = re.compile(r'[^a-z0-9]+')
+
+# Kölner Phonetik letter groups
+_PHONETIC_CODES = {
+    **dict.fromkeys('aeijouy', '0'), 'b': '1', **dict.fromkeys('fvw', '3'), **dict.fromkeys('gkq', '4'),
+    'l': '5', **dict.fromkeys('mn', '6'), 'r': '7', **dict.fromkeys('sz', '8'), 'h': ''
+}
+
+
+class LeadSignature(NamedTuple):
+    """Matching keys of one lead"""
+
+    name: str
+    strong_keys: Tuple[Tuple[str, str], ...]
+    fuzzy_keys: Tuple[Tuple[str, str], ...]
+
+
+def normalize_name(name: Any) -> str:
+    """Fold case, umlauts, accents, punctuation and trailing legal forms out of a business name"""
+    if not name or not isinstance(name, str):
+        return ''
+    text = name.casefold()
+    for umlaut, replacement in UMLAUTS:
+        text = text.replace(umlaut, replacement)
+    if not text.isascii():
+        text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    tokens = NON_ALNUM_PATTERN.sub(' ', text.replace('.', '')).split()
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+@lru_cache(maxsize=100_000)
+def koelner_phonetik(word: str) -> str:
+    """Kölner Phonetik code of a normalized (a-z0-9) word (memoized; name tokens repeat a lot)"""
+    codes = []
+    for i, char in enumerate(word):
+        prev = word[i - 1] if i else ''
+        following = word[i + 1] if i + 1 < len(word) else ''
+        if char == 'p':
+            code = '3' if following == 'h' else '1'
+        elif char in 'dt':
+            code = '8' if following in ('c', 's', 'z') else '2'
+        elif char == 'c':
+            if i == 0:
+                code = '4' if following in ('a', 'h', 'k', 'l', 'o', 'q', 'r', 'u', 'x') else '8'
+            elif prev in ('s', 'z'):
+                code = '8'
+            else:
+                code = '4' if following in ('a', 'h', 'k', 'o', 'q', 'u', 'x') else '8'
+        elif char == 'x':
+            code = '8' if prev in ('c', 'k', 'q') else '48'
+        else:
+            code = _PHONETIC_CODES.get(char, '')
+        codes.append(code)
+
+    collapsed = []
+    for code in ''.join(codes):
+        if not collapsed or collapsed[-1] != code:
+            collapsed.append(code)
+    return ''.join(code for i, code in enumerate(collapsed) if code != '0' or i == 0)
+
+
+def normalize_domain(url: Any) -> Optional[str]:
+    """Registrable-looking host of a website without www. and port"""
+    if not url or not isinstance(url, str):
+        return None
+    url = url.strip()
+    if '://' not in url:
+        url = 'http://' + url
+    try:
+        host = (urlparse(url).hostname or '').lower()
+    except ValueError:
+        return None
+    if host.startswith('www.'):
+        host = host[4:]
+    return host or None
+
+
+def is_shared_host(domain: str) -> bool:
+    """Whether the domain is (a subdomain of) a shared platform host"""
+    parts = domain.split('.')
+    return any('.'.join(parts[i:]) in SHARED_HOSTS for i in range(len(parts) - 1))
+
+
+def lead_field(record: Any, name: str) -> Any:
+    """Read a field from a lead dict or a Lead"""
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+class DisjointSet:
+    """Union-find over positions 0..n-1 with path halving and union by size"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+    def groups(self) -> List[List[int]]:
+        """Members of every set, ordered by their smallest member"""
+        groups: Dict[int, List[int]] = {}
+        for item in range(len(self.parent)):
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
+
+
+def _as_mapping(value: Any) -> Dict[str, Any]:
+    """Native dict of a dict or JSON-encoded (to_dict) field"""
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            decoded = json.loads(value)
+        except ValueError:
+            return {}
+        return decoded if isinstance(decoded, dict) else {}
+    return {}
+
+
+def _as_list(value: Any) -> List[Any]:
+    """Native list of a list or ', '-joined (to_dict) field"""
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if isinstance(value, str) and value:
+        return value.split(', ')
+    return []
+
+
+def _ordered_union(lists: List[List[Any]]) -> List[Any]:
+    """Distinct items of several lists in first-seen order"""
+    return list(dict.fromkeys(item for items in lists for item in items if item))
+
+
+def _first(values: List[Any], accept: Callable[[Any], bool] = bool) -> Any:
+    """First present value satisfying accept, else the first present value"""
+    present = [value for value in values if value and not is_missing(value)]
+    for value in present:
+        if accept(value):
+            return value
+    return present[0] if present else None
+
+
+def merge_records(records: List[Record]) -> Record:
+    """Build the golden record of a cluster of duplicate leads (dicts or Leads)
+
+    The first record is the base. Contact details take the best available value
+    (an email on the business's own domain, a phone that normalizes, a website
+    off shared platform hosts), list and handle fields are unioned, followers
+    take the maximum and other empty fields are filled from later records.
+    ``sources`` lists the source URLs of all merged records.
+    """
+    rows = [record if isinstance(record, dict) else {name: getattr(record, name) for name in Lead.FIELDS}
+            for record in records]
+    column = lambda name: [row.get(name) for row in rows]
+
+    websites = column('website')
+    own_domains = {domain for domain in map(normalize_domain, websites) if domain and not is_shared_host(domain)}
+
+    def is_valid_email(email: Any) -> bool:
+        return isinstance(email, str) and EMAIL_PATTERN.match(email.strip().lower()) is not None
+
+    def is_own_email(email: Any) -> bool:
+        return is_valid_email(email) and email.strip().lower().rsplit('@', 1)[-1] in own_domains
+
+    email = _first(column('email'), is_own_email) if own_domains else None
+    golden = dict(rows[0])
+    golden.update({
+        'email': email or _first(column('email'), is_valid_email),
+        'phone': _first(column('phone'), lambda phone: normalize_phone(phone) is not None),
+        'website': _first(websites, lambda url: (normalize_domain(url) or '') in own_domains),
+    })
+
+    for name in ('name', 'address', 'industry', 'business_type', 'engagement_rate', 'notes'):
+        golden[name] = _first(column(name))
+
+    followers = [value for value in column('followers') if isinstance(value, (int, float)) and not is_missing(value)]
+    golden['followers'] = max(followers) if followers else golden.get('followers')
+
+    handles = {}
+    for row in rows:
+        for platform, handle in _as_mapping(row.get('social_handles')).items():
+            if handle:
+                handles.setdefault(platform, handle)
+    golden['social_handles'] = handles
+    golden['pain_points'] = _ordered_union([_as_list(row.get('pain_points')) for row in rows])
+    golden['tags'] = _ordered_union([_as_list(row.get('tags')) for row in rows])
+    golden['sources'] = _ordered_union([_as_list(row.get('sources')) or [row.get('source_url')] for row in rows])
+
+    timestamps = [value for value in column('scraped_at') if isinstance(value, datetime)]
+    if timestamps:
+        golden['scraped_at'] = min(timestamps)
+    timestamps = [value for value in column('last_updated') if isinstance(value, datetime)]
+    if timestamps:
+        golden['last_updated'] = max(timestamps)
+
+    if isinstance(records[0], Lead):
+        # The merged score inputs changed, so the score is recomputed lazily
+        golden.pop('lead_score', None)
+        golden.pop('score_breakdown', None)
+        return Lead.from_trusted(**golden)
+
+    # Dicts only gain the fields some merged record had, plus sources
+    present_keys = set().union(*rows)
+    return {key: value for key, value in golden.items() if key in present_keys or key == 'sources'}
+
+
+class LeadDeduplicator:
+    """Finds duplicate leads (dicts or Lead objects) via blocking keys
+
+    Records sharing an email, phone, non-platform domain, social handle or
+    normalized name are duplicates outright. Records that only share a
+    phonetic name key are compared by name similarity, so the expensive
+    comparison runs only within those small blocks.
+    """
+
+    def __init__(self, threshold: float = 0.85, max_block_size: int = 50):
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+
+    def signature(self, record: Any) -> LeadSignature:
+        """Compute the blocking keys of a record"""
+        strong = []
+
+        email = lead_field(record, 'email')
+        if email and isinstance(email, str):
+            strong.append(('email', email.strip().lower()))
+
+        phone = normalize_phone(lead_field(record, 'phone'))
+        if phone:
+            strong.append(('phone', phone))
+
+        domain = normalize_domain(lead_field(record, 'website'))
+        if domain and not is_shared_host(domain):
+            strong.append(('domain', domain))
+
+        handles = lead_field(record, 'social_handles')
+        if isinstance(handles, str):
+            try:
+                handles = json.loads(handles)
+            except ValueError:
+                handles = None
+        if isinstance(handles, dict):
+            for platform, handle in handles.items():
+                if handle and isinstance(handle, str):
+                    strong.append(('handle', f"{platform}:{handle.strip().lstrip('@').lower()}"))
+
+        name = normalize_name(lead_field(record, 'name'))
+        fuzzy = []
+        if name:
+            strong.append(('name', name))
+            codes = sorted(koelner_phonetik(token) for token in name.split())
+            fuzzy.append(('phonetic', ' '.join(codes)))
+
+        return LeadSignature(name, tuple(strong), tuple(fuzzy))
+
+    def similarity(self, a: LeadSignature, b: LeadSignature) -> float:
+        """Name similarity (0-1) of two records, ignoring the tokens both names share
+        
+        Comparing only the differing tokens keeps generic words ("zahnarztpraxis")
+        from making unrelated names look alike.
+        """
+        if not a.name or not b.name:
+            return 0.0
+        tokens_a, tokens_b = a.name.split(), b.name.split()
+        rest_a = [token for token in tokens_a if token not in tokens_b]
+        rest_b = [token for token in tokens_b if token not in tokens_a]
+        if not rest_a and not rest_b:
+            return 1.0
+        matcher = SequenceMatcher(None, ' '.join(rest_a), ' '.join(rest_b))
+        if matcher.real_quick_ratio() < self.threshold or matcher.quick_ratio() < self.threshold:
+            return 0.0
+        return matcher.ratio()
+
+    def iter_matches(self, signature: LeadSignature, index: Dict[Tuple[str, str], List[int]],
+                     signatures: List[LeadSignature], skip: Callable[[int], bool] = None) -> Iterator[int]:
+        """Positions of indexed records matching the signature (may repeat)
+
+        Members of a strong-key block are all duplicates of each other, so only
+        the first is reported. ``skip`` excludes candidates from the costlier
+        name comparison, e.g. records already known to be in the same cluster.
+        """
+        for key in signature.strong_keys:
+            block = index.get(key)
+            if block:
+                yield block[0]
+
+        compared = set()
+        for key in signature.fuzzy_keys:
+            for position in index.get(key, ())[:self.max_block_size]:
+                if position not in compared:
+                    compared.add(position)
+                    if skip is not None and skip(position):
+                        continue
+                    if self.similarity(signature, signatures[position]) >= self.threshold:
+                        yield position
+
+    @staticmethod
+    def add_to_index(signature: LeadSignature, position: int, index: Dict[Tuple[str, str], List[int]]):
+        """Register a record's keys in a blocking index"""
+        for key in signature.strong_keys + signature.fuzzy_keys:
+            index.setdefault(key, []).append(position)
+
+    def deduplicate(self, records: List[Record]) -> List[Record]:
+        """Keep the first record of every group of duplicates, preserving order"""
+        index: Dict[Tuple[str, str], List[int]] = {}
+        kept_signatures: List[LeadSignature] = []
+        unique = []
+
+        for record in records:
+            signature = self.signature(record)
+            if next(self.iter_matches(signature, index, kept_signatures), None) is None:
+                self.add_to_index(signature, len(kept_signatures), index)
+                kept_signatures.append(signature)
+                unique.append(record)
+
+        return unique
+
+    def cluster(self, records: List[Record]) -> List[List[int]]:
+        """Group record positions into clusters of (transitive) duplicates
+
+        Clusters are ordered by their first record and list positions in order.
+        """
+        index: Dict[Tuple[str, str], List[int]] = {}
+        signatures: List[LeadSignature] = []
+        clusters = DisjointSet(len(records))
+
+        for position, record in enumerate(records):
+            signature = self.signature(record)
+            same_cluster = lambda other: clusters.find(other) == clusters.find(position)
+            for match in self.iter_matches(signature, index, signatures, skip=same_cluster):
+                clusters.union(match, position)
+            self.add_to_index(signature, position, index)
+            signatures.append(signature)
+
+        return clusters.groups()
+
+    def merge_duplicates(self, records: List[Record]) -> List[Record]:
+        """Replace every cluster of duplicates with one golden record, preserving order
+
+        Records without duplicates are returned unchanged.
+        """
+        return [
+            records[members[0]] if len(members) == 1 else merge_records([records[i] for i in members])
+            for members in self.cluster(records)
+        ]
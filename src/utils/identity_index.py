@@ -0,0 +1,193 @@
+"""
+Persistent lead identity index for incremental scrape runs
+"""
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional
+from loguru import logger
+
+from src.models.lead import Lead
+from src.utils.deduplication import LeadDeduplicator, lead_field
+from config.settings import EXPORTS_DIR
+
+DEFAULT_INDEX_PATH = EXPORTS_DIR / 'lead_index.sqlite3'
+
+# Fields that change on every run (or follow from others) and do not make a lead "changed"
+VOLATILE_FIELDS = {'scraped_at', 'last_updated', 'lead_score', 'score_breakdown', 'data_quality_score'}
+
+# Strong dedup keys that identify a business across runs (names are too ambiguous)
+IDENTITY_KEY_KINDS = ('email', 'phone', 'domain', 'handle')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    lead_id INTEGER PRIMARY KEY,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS identity_keys (
+    key TEXT PRIMARY KEY,
+    lead_id INTEGER NOT NULL REFERENCES leads (lead_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS records (
+    record_key TEXT PRIMARY KEY,
+    lead_id INTEGER NOT NULL REFERENCES leads (lead_id),
+    content_hash TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class IndexDiff(NamedTuple):
+    """Incoming leads split by what the index already knew about them"""
+
+    new: List[Any]
+    changed: List[Any]
+    unchanged: List[Any]
+    lead_ids: List[int]
+
+
+def source_key(lead: Any) -> Optional[str]:
+    """Key of the source record a lead (dict or Lead) was scraped from, from its canonical source URL"""
+    source_url = lead_field(lead, 'source_url')
+    if source_url and isinstance(source_url, str):
+        return f"source:{source_url.split('?')[0].rstrip('/').lower()}"
+    return None
+
+
+def lead_keys(lead: Any, deduplicator: Optional[LeadDeduplicator] = None) -> List[str]:
+    """Identity keys of a lead (dict or Lead): email, phone, domain, handles and source URL"""
+    signature = (deduplicator or LeadDeduplicator()).signature(lead)
+    keys = [f"{kind}:{value}" for kind, value in signature.strong_keys if kind in IDENTITY_KEY_KINDS]
+    source = source_key(lead)
+    if source:
+        keys.append(source)
+    return keys
+
+
+def content_hash(lead: Any) -> str:
+    """Stable hash of a lead's content, ignoring timestamps and derived scores"""
+    if isinstance(lead, Lead):
+        data = {name: getattr(lead, name) for name in Lead.FIELDS if name not in VOLATILE_FIELDS}
+    else:
+        data = {key: value for key, value in lead.items() if key not in VOLATILE_FIELDS}
+    encoded = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+class IdentityIndex:
+    """SQLite map of identity keys to lead ids, with a content hash per source record
+
+    Lookups go through the primary key of identity_keys, so classifying a lead
+    costs a single indexed query. sync() classifies and registers a whole run
+    in one transaction: either every lead is recorded or none is.
+    """
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.deduplicator = LeadDeduplicator()
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    def lookup(self, lead: Any) -> Optional[int]:
+        """Id of the known lead sharing an identity key with this one, or None"""
+        return self._lookup_keys(lead_keys(lead, self.deduplicator))
+
+    def classify(self, leads: List[Any]) -> IndexDiff:
+        """Split leads into new, changed and unchanged without recording them"""
+        try:
+            return self._apply(leads)
+        finally:
+            self.conn.rollback()
+
+    def sync(self, leads: List[Any]) -> IndexDiff:
+        """Classify leads and record them atomically; returns what was new or changed"""
+        with self.conn:
+            diff = self._apply(leads)
+        logger.info(f"Identity index: {len(diff.new)} new, {len(diff.changed)} changed, "
+                    f"{len(diff.unchanged)} unchanged leads")
+        return diff
+
+    def filter_new_or_changed(self, leads: List[Any]) -> List[Any]:
+        """Record leads and return only those that are new or changed, in input order"""
+        diff = self.sync(leads)
+        fresh = {id(lead) for lead in diff.new + diff.changed}
+        return [lead for lead in leads if id(lead) in fresh]
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM leads').fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _lookup_keys(self, keys: List[str]) -> Optional[int]:
+        """Lead id of the source URL key if known, else the smallest id any key maps to"""
+        if not keys:
+            return None
+        if keys[-1].startswith('source:'):
+            row = self.conn.execute('SELECT lead_id FROM identity_keys WHERE key = ?', (keys[-1],)).fetchone()
+            if row:
+                return row[0]
+        placeholders = ','.join('?' * len(keys))
+        row = self.conn.execute(
+            f'SELECT MIN(lead_id) FROM identity_keys WHERE key IN ({placeholders})', keys
+        ).fetchone()
+        return row[0]
+
+    def _apply(self, leads: List[Any]) -> IndexDiff:
+        """Classify and write leads inside the current transaction
+
+        Leads are registered as they are classified, so a duplicate later in
+        the same run is matched against the earlier one.
+        """
+        now = datetime.now().isoformat()
+        diff = IndexDiff([], [], [], [])
+        cursor = self.conn.cursor()
+
+        for lead in leads:
+            keys = lead_keys(lead, self.deduplicator)
+            digest = content_hash(lead)
+            lead_id = self._lookup_keys(keys)
+
+            if lead_id is None:
+                cursor.execute('INSERT INTO leads (first_seen, last_seen) VALUES (?, ?)', (now, now))
+                lead_id = cursor.lastrowid
+                diff.new.append(lead)
+                record_key = self._record_key(keys, lead_id)
+            else:
+                # Content is tracked per source record, so copies of one business from
+                # different platforms do not flag each other as changed on every run
+                record_key = self._record_key(keys, lead_id)
+                stored = cursor.execute('SELECT content_hash FROM records WHERE record_key = ?',
+                                        (record_key,)).fetchone()
+                if stored and stored[0] == digest:
+                    diff.unchanged.append(lead)
+                else:
+                    diff.changed.append(lead)
+                cursor.execute('UPDATE leads SET last_seen = ? WHERE lead_id = ?', (now, lead_id))
+
+            cursor.execute('INSERT OR REPLACE INTO records (record_key, lead_id, content_hash) VALUES (?, ?, ?)',
+                           (record_key, lead_id, digest))
+            cursor.executemany('INSERT OR IGNORE INTO identity_keys (key, lead_id) VALUES (?, ?)',
+                               [(key, lead_id) for key in keys])
+            diff.lead_ids.append(lead_id)
+
+        return diff
+
+    @staticmethod
+    def _record_key(keys: List[str], lead_id: int) -> str:
+        """Key of the source record a lead came from (its source URL when it has one)"""
+        if keys and keys[-1].startswith('source:'):
+            return keys[-1]
+        return f"lead:{lead_id}"
@@ -0,0 +1,189 @@
+"""
+Incremental, mergeable analytics aggregates over leads
+"""
+import math
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.models.lead import Lead
+
+# Right-closed score buckets, matching pd.cut(bins=[0, 20, 40, 60, 80, 100]); scores of 0 fall in none
+SCORE_BUCKET_EDGES = (20, 40, 60, 80, 100)
+SCORE_BUCKET_LABELS = ('0-20', '21-40', '41-60', '61-80', '81-100')
+
+HIGH_SCORE_THRESHOLD = 60
+
+# Contact coverage rows: report label -> lead field
+CONTACT_FIELDS = {
+    'Has Email': 'email',
+    'Has Phone': 'phone',
+    'Has Website': 'website',
+    'Has Address': 'address',
+    'Has Social Handles': 'social_handles',
+}
+
+
+def _missing(value: Any) -> bool:
+    """Whether a value counts as missing: None, NaN or an empty dict/list"""
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return math.isnan(value)
+    if isinstance(value, (dict, list, tuple)):
+        return not value
+    return False
+
+
+def _mode(counts: Counter) -> Optional[Any]:
+    """Most frequent key; ties go to the smallest, as with pandas Series.mode()"""
+    if not counts:
+        return None
+    top = max(counts.values())
+    return min(key for key, count in counts.items() if count == top)
+
+
+class LeadAnalytics:
+    """Running counts over leads that can be updated as leads arrive and merged across batches
+
+    Counters keep keys in first-seen order, so most_common() breaks ties the
+    way pandas value_counts() does over the same leads, and merging aggregates
+    in batch order gives the same result as aggregating all leads at once.
+    Reports read these counts instead of rescanning the leads.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.platforms: Counter = Counter()
+        self.industries: Counter = Counter()
+        self.pain_points: Counter = Counter()
+        self.score_buckets: Counter = Counter({label: 0 for label in SCORE_BUCKET_LABELS})
+        self.contacts: Counter = Counter({label: 0 for label in CONTACT_FIELDS})
+        self.score_sum = 0
+        self.score_count = 0
+        self.high_score = 0
+
+    def add(self, lead: Any) -> 'LeadAnalytics':
+        """Count one lead (a Lead, its to_dict() form or a raw lead dict)"""
+        get = lead.__getattribute__ if isinstance(lead, Lead) else lead.get
+        self.total += 1
+
+        platform = get('platform')
+        if not _missing(platform):
+            self.platforms[platform] += 1
+        industry = get('industry')
+        if not _missing(industry):
+            self.industries[industry] += 1
+
+        pain_points = get('pain_points')
+        if isinstance(pain_points, str):
+            if pain_points:
+                self.pain_points.update(pain_points.split(', '))
+        elif not _missing(pain_points):
+            self.pain_points.update(pain_points)
+
+        score = get('lead_score')
+        if not _missing(score):
+            self.score_sum += score
+            self.score_count += 1
+            if score >= HIGH_SCORE_THRESHOLD:
+                self.high_score += 1
+            if 0 < score <= SCORE_BUCKET_EDGES[-1]:
+                self.score_buckets[SCORE_BUCKET_LABELS[bisect_left(SCORE_BUCKET_EDGES, score)]] += 1
+
+        for label, field in CONTACT_FIELDS.items():
+            if not _missing(get(field)):
+                self.contacts[label] += 1
+        return self
+
+    def update(self, leads: Iterable[Any]) -> 'LeadAnalytics':
+        """Count a stream of leads"""
+        for lead in leads:
+            self.add(lead)
+        return self
+
+    def merge(self, other: 'LeadAnalytics') -> 'LeadAnalytics':
+        """Add another aggregate's counts to this one (other's leads count as coming later)"""
+        self.total += other.total
+        # Counter.update keeps zero counts and appends new keys, preserving first-seen order
+        self.platforms.update(other.platforms)
+        self.industries.update(other.industries)
+        self.pain_points.update(other.pain_points)
+        self.score_buckets.update(other.score_buckets)
+        self.contacts.update(other.contacts)
+        self.score_sum += other.score_sum
+        self.score_count += other.score_count
+        self.high_score += other.high_score
+        return self
+
+    def __add__(self, other: 'LeadAnalytics') -> 'LeadAnalytics':
+        return LeadAnalytics().merge(self).merge(other)
+
+    @classmethod
+    def from_leads(cls, leads: Iterable[Any]) -> 'LeadAnalytics':
+        """Aggregate over leads"""
+        return cls().update(leads)
+
+    @classmethod
+    def from_frame(cls, df_leads: pd.DataFrame) -> 'LeadAnalytics':
+        """Aggregate over a DataFrame of to_dict() rows, counting column-wise"""
+        analytics = cls()
+        analytics.total = len(df_leads)
+        columns = df_leads.columns
+
+        # value_counts(sort=False) lists values in first-seen order, like the Counters
+        if 'platform' in columns:
+            analytics.platforms.update(df_leads['platform'].value_counts(sort=False).to_dict())
+        if 'industry' in columns:
+            analytics.industries.update(df_leads['industry'].value_counts(sort=False).to_dict())
+        if 'pain_points' in columns:
+            pain_points = df_leads['pain_points'].dropna()
+            pain_points = pain_points[pain_points != ''].str.split(', ').explode()
+            analytics.pain_points.update(pain_points.value_counts(sort=False).to_dict())
+
+        if 'lead_score' in columns:
+            scores = df_leads['lead_score'].dropna()
+            analytics.score_sum = pd.to_numeric(scores).sum().item()
+            analytics.score_count = len(scores)
+            analytics.high_score = int((scores >= HIGH_SCORE_THRESHOLD).sum())
+            buckets = pd.cut(scores, bins=(0,) + SCORE_BUCKET_EDGES, labels=SCORE_BUCKET_LABELS)
+            analytics.score_buckets.update({str(label): int(count) for label, count in
+                                            buckets.value_counts(sort=False).items()})
+
+        for label, field in CONTACT_FIELDS.items():
+            if field in columns:
+                analytics.contacts[label] = int(df_leads[field].notna().sum())
+        return analytics
+
+    @property
+    def average_score(self) -> Optional[float]:
+        """Mean lead score, or None without scored leads"""
+        return self.score_sum / self.score_count if self.score_count else None
+
+    @property
+    def most_common_platform(self) -> Optional[str]:
+        return _mode(self.platforms)
+
+    @property
+    def most_common_industry(self) -> Optional[str]:
+        return _mode(self.industries)
+
+    def platform_counts(self) -> List[Tuple[str, int]]:
+        """Leads per platform, most frequent first"""
+        return self.platforms.most_common()
+
+    def score_distribution(self) -> List[Tuple[str, int]]:
+        """Leads per score bucket, most frequent first (empty buckets included)"""
+        return self.score_buckets.most_common()
+
+    def top_industries(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.industries.most_common(n)
+
+    def top_pain_points(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.pain_points.most_common(n)
+
+    def contact_coverage(self) -> Dict[str, int]:
+        """Number of leads having each kind of contact information"""
+        return dict(self.contacts)
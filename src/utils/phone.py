@@ -0,0 +1,63 @@
+"""
+Phone number normalization to E.164 for German numbers
+"""
+import re
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional
+
+# Digits are ASCII only; '+' is kept so an international prefix survives stripping
+PHONE_STRIP_PATTERN = re.compile(r'[^\d+]', re.ASCII)
+
+# "+49 (0)30 ..." writes the national trunk zero in parentheses
+TRUNK_ZERO_PATTERN = re.compile(r'\(\s*0\s*\)')
+
+E164_PATTERN = re.compile(r'^\+[1-9]\d{6,14}$', re.ASCII)
+
+COUNTRY_CODE = '49'
+
+
+@lru_cache(maxsize=262_144)
+def _normalize(text: str) -> Optional[str]:
+    """E.164 form of a phone string (memoized: the same numbers recur across platforms)"""
+    digits = PHONE_STRIP_PATTERN.sub('', TRUNK_ZERO_PATTERN.sub('', text))
+    international = digits.startswith('+')
+    digits = digits.replace('+', '')
+
+    if international:
+        number = digits
+    elif digits.startswith('00'):
+        number = digits[2:]
+    elif digits.startswith('0'):
+        number = COUNTRY_CODE + digits[1:]
+    elif len(digits) >= 10:
+        # Long numbers without a prefix either already start with the country code or lack it
+        number = digits if digits.startswith(COUNTRY_CODE) and len(digits) >= 11 else COUNTRY_CODE + digits
+    else:
+        return None
+
+    # "+49 030 ..." keeps the trunk zero after the country code
+    if number.startswith(COUNTRY_CODE + '0'):
+        number = COUNTRY_CODE + number[len(COUNTRY_CODE) + 1:]
+
+    e164 = '+' + number
+    return e164 if E164_PATTERN.match(e164) else None
+
+
+def normalize_phone(phone: Any) -> Optional[str]:
+    """E.164 form (+49...) of a phone number in German national or international notation, or None"""
+    if isinstance(phone, str):
+        return _normalize(phone) if phone else None
+    if isinstance(phone, bool):
+        return None
+    if isinstance(phone, int):
+        return _normalize(str(phone))
+    if isinstance(phone, float) and phone.is_integer():
+        return _normalize(str(int(phone)))
+    return None
+
+
+def normalize_phone_column(values: Iterable[Any]) -> List[Any]:
+    """Normalize a column of phone numbers (list or pandas Series), converting each distinct value once"""
+    values = values.tolist() if hasattr(values, 'tolist') else list(values)
+    normalized = {value: normalize_phone(value) for value in set(values)}
+    return [normalized[value] for value in values]
@@ -0,0 +1,147 @@
+"""
+Concurrent website accessibility checks with per-host limits and caching
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from loguru import logger
+
+# HEAD responses with these statuses are retried as GET; many servers reject or mishandle HEAD
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 429, 500, 501, 503}
+
+
+class URLChecker:
+    """Checks many URLs concurrently over a pooled keep-alive session
+
+    At most ``per_host_limit`` requests run against one host at a time. A URL
+    is accessible if HEAD (or, when HEAD is refused, a streamed GET) answers
+    below 400. Results are cached per host for ``cache_ttl`` seconds, so other
+    URLs on a checked domain are not requested again.
+
+    Pass a ``session`` (e.g. one pointed at a local test server) to control the
+    transport; ``clock`` can be replaced to test cache expiry.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, max_workers: int = 16,
+                 per_host_limit: int = 4, timeout: float = 5, cache_ttl: float = 3600,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.clock = clock
+        self.session = session or self._create_session()
+
+        self._cache: Dict[str, Tuple[bool, float]] = {}
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """Session whose connection pools keep up to per_host_limit connections per host"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.per_host_limit)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def check(self, url: str) -> bool:
+        """Whether a URL (or its host, if checked recently) is accessible"""
+        host = self._host(url)
+        if host is None:
+            return False
+
+        cached = self._cached(host)
+        if cached is not None:
+            return cached
+
+        with self._slot(host):
+            # Another thread may have checked the host while this one waited
+            cached = self._cached(host)
+            if cached is not None:
+                return cached
+            result = self._request(url)
+
+        with self._lock:
+            self._cache[host] = (result, self.clock() + self.cache_ttl)
+        return result
+
+    def check_many(self, urls: Iterable[str]) -> Dict[str, bool]:
+        """Check URLs concurrently; each host is requested once and shares its result"""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        by_host: Dict[str, str] = {}
+        for url in urls:
+            host = self._host(url)
+            if host is not None:
+                by_host.setdefault(host, url)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = dict(zip(by_host, executor.map(self.check, by_host.values())))
+
+        accessible = {url: results.get(self._host(url), False) for url in urls}
+        logger.info(f"Checked {len(urls)} URLs on {len(by_host)} hosts: "
+                    f"{sum(accessible.values())} accessible")
+        return accessible
+
+    def clear_cache(self):
+        """Forget all cached results"""
+        with self._lock:
+            self._cache.clear()
+
+    def close(self):
+        """Close the pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _request(self, url: str) -> bool:
+        """HEAD the URL, falling back to a streamed GET when HEAD is refused"""
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            response.close()
+            if response.status_code < 400:
+                return True
+            if response.status_code not in HEAD_FALLBACK_STATUSES:
+                return False
+
+            response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+            response.close()
+            return response.status_code < 400
+        except requests.RequestException as e:
+            logger.debug(f"URL not accessible: {url} ({e})")
+            return False
+
+    def _cached(self, host: str) -> Optional[bool]:
+        """Unexpired cached result for a host"""
+        with self._lock:
+            entry = self._cache.get(host)
+            if entry is None:
+                return None
+            if entry[1] <= self.clock():
+                del self._cache[host]
+                return None
+            return entry[0]
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        """Semaphore limiting concurrent requests to a host"""
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
+
+    @staticmethod
+    def _host(url: str) -> Optional[str]:
+        """Lowercased host:port of a URL, or None if it has none"""
+        try:
+            host = urlparse(url.strip()).netloc.lower()
+        except (AttributeError, ValueError):
+            return None
+        return host or None
@@ -0,0 +1,184 @@
+"""Tests for AsanaClient against a local stand-in of the Asana API"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.exporters.asana_client import AsanaClient
+
+
+class AsanaHandler(BaseHTTPRequestHandler):
+    """Workspaces, paginated projects, tasks and /batch; failures are scripted per path"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _handle(self, method):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        with server.lock:
+            server.calls.append((method, url.path))
+            failures = server.failures.get(url.path)
+            status = failures.pop(0) if failures else None
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.headers.get('Authorization') != 'Bearer token':
+                return self._reply(401, {'errors': [{'message': 'Not authorized'}]})
+            if status is not None:
+                return self._reply(status, {'errors': [{'message': 'Scripted failure'}]}, {'Retry-After': '0'})
+            self._route(method, url.path, query, body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _route(self, method, path, query, body):
+        server = self.server
+        if method == 'GET' and path == '/workspaces':
+            return self._reply(200, {'data': [{'gid': 'w1', 'name': 'Team'}], 'next_page': None})
+        if method == 'GET' and path == '/projects':
+            time.sleep(server.project_delay)
+            limit, offset = int(query['limit'][0]), int(query.get('offset', ['0'])[0])
+            page = server.projects[offset:offset + limit]
+            next_page = {'offset': str(offset + limit)} if offset + limit < len(server.projects) else None
+            return self._reply(200, {'data': page, 'next_page': next_page})
+        if method == 'POST' and path == '/projects':
+            with server.lock:
+                gid = f"p{len(server.projects)}"
+                server.projects.append({'gid': gid, 'name': body['data']['name']})
+            return self._reply(201, {'data': {'gid': gid}})
+        if method == 'POST' and path == '/tasks':
+            status, payload = self._create_task(body['data'])
+            return self._reply(status, payload)
+        if method == 'POST' and path == '/batch':
+            results = []
+            for action in body['data']['actions']:
+                status, payload = self._create_task(action['data'])
+                results.append({'status_code': status, 'body': payload})
+            return self._reply(200, {'data': results[:server.batch_results]})
+        self._reply(404, {'errors': [{'message': 'Not found'}]})
+
+    def _create_task(self, task):
+        if task['name'] == 'Lead: ':
+            return 400, {'errors': [{'message': 'name: Missing input'}]}
+        with self.server.lock:
+            self.server.tasks.append(task)
+            return 201, {'data': {'gid': str(len(self.server.tasks))}}
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), AsanaHandler)
+    server.lock = threading.Lock()
+    server.calls = []
+    server.failures = {}
+    server.projects = [{'gid': f"p{i}", 'name': f"Project {i}"} for i in range(250)]
+    server.project_delay = 0
+    server.batch_results = None
+    server.tasks = []
+    server.active = 0
+    server.max_active = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    with AsanaClient('token', f"http://127.0.0.1:{server.server_port}", max_workers=4, backoff=0) as client:
+        yield client
+
+
+def tasks(names):
+    return [{'name': f"Lead: {name}", 'projects': ['p1']} for name in names]
+
+
+def test_project_lookup_pages_through_and_is_cached(server, client):
+    assert client.project_gid('Project 240', 'w1') == 'p240'
+    assert client.project_gid('Project 240', 'w1') == 'p240'
+
+    assert server.calls.count(('GET', '/projects')) == 3
+
+
+def test_missing_project_is_created_once(server, client):
+    gid = client.project_gid('Leads', 'w1')
+
+    assert client.project_gid('Leads', 'w1') == gid
+    assert server.calls.count(('POST', '/projects')) == 1
+
+
+def test_workspace_is_looked_up_once(server, client):
+    assert client.workspace_gid() == client.workspace_gid() == 'w1'
+    assert client.workspace_gid('w9') == 'w9'
+    assert server.calls.count(('GET', '/workspaces')) == 1
+
+
+def test_lookups_of_different_projects_run_concurrently(server, client):
+    server.projects = server.projects[:10]
+    server.project_delay = 0.2
+    threads = [threading.Thread(target=client.project_gid, args=(f"Project {i}", 'w1')) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert server.max_active == 3
+
+
+@pytest.mark.parametrize('use_batch_api', [False, True])
+def test_tasks_are_created_and_rejections_reported(server, client, use_batch_api):
+    names = [f"Cafe {i}" if i % 7 else '' for i in range(25)]
+
+    result = client.create_tasks(tasks(names), use_batch_api=use_batch_api)
+
+    assert result.succeeded == 21
+    assert sorted(error.index for error in result.errors) == [0, 7, 14, 21]
+    assert {error.status for error in result.errors} == {400}
+    assert len(server.tasks) == 21
+    if use_batch_api:
+        assert server.calls.count(('POST', '/batch')) == 3
+
+
+def test_batch_actions_without_a_result_are_reported(server, client):
+    server.batch_results = 8
+
+    result = client.create_tasks(tasks([f"Cafe {i}" for i in range(1, 13)]), use_batch_api=True)
+
+    assert result.succeeded == 10
+    assert [error.index for error in result.errors] == [8, 9]
+    assert {error.status for error in result.errors} == {None}
+
+
+def test_task_create_is_retried_on_429_but_not_on_server_error(server, client):
+    server.failures['/tasks'] = [429, 503]
+
+    result = client.create_tasks(tasks(['Cafe Rot']))
+
+    assert result.errors[0].status == 503
+    assert server.calls.count(('POST', '/tasks')) == 2
+    assert server.tasks == []
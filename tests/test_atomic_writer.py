@@ -0,0 +1,80 @@
+"""Tests for atomic exporter writes"""
+import gzip
+import json
+import os
+import stat
+
+import pytest
+
+from src.exporters.atomic_writer import AtomicDirectory, AtomicWriter
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def default_mode():
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def test_writes_file_and_manifest(tmp_path):
+    target = tmp_path / 'leads.csv'
+    with AtomicWriter(target) as out:
+        out.file.write('name\nCafe Rot\n')
+        out.rows = 1
+
+    assert target.read_text(encoding='utf-8') == 'name\nCafe Rot\n'
+    manifest = json.loads((tmp_path / 'leads.csv.manifest.json').read_text(encoding='utf-8'))
+    assert manifest['rows'] == 1
+    assert manifest['bytes'] == target.stat().st_size
+
+
+def test_failed_write_leaves_target_untouched(tmp_path):
+    target = tmp_path / 'leads.csv'
+    target.write_text('old', encoding='utf-8')
+
+    with pytest.raises(RuntimeError):
+        with AtomicWriter(target) as out:
+            out.file.write('new')
+            raise RuntimeError('boom')
+
+    assert target.read_text(encoding='utf-8') == 'old'
+    assert [p.name for p in tmp_path.iterdir()] == ['leads.csv']
+
+
+def test_compressed_write(tmp_path):
+    with AtomicWriter(tmp_path / 'leads.csv', compression='gzip', manifest=False) as out:
+        out.file.write('name\n')
+
+    assert gzip.decompress((tmp_path / 'leads.csv.gz').read_bytes()) == b'name\n'
+
+
+def test_new_files_get_default_permissions(tmp_path):
+    target = tmp_path / 'leads.csv'
+    with AtomicWriter(target) as out:
+        out.file.write('name\n')
+
+    assert mode(target) == default_mode()
+    assert mode(tmp_path / 'leads.csv.manifest.json') == default_mode()
+
+
+def test_replaced_file_keeps_its_permissions(tmp_path):
+    target = tmp_path / 'leads.csv'
+    target.write_text('old', encoding='utf-8')
+    os.chmod(target, 0o640)
+
+    with AtomicWriter(target, manifest=False) as out:
+        out.file.write('new')
+
+    assert mode(target) == 0o640
+
+
+def test_directory_files_get_default_permissions(tmp_path):
+    with AtomicDirectory(tmp_path / 'dataset', manifest_name='run') as stage:
+        (stage.staging_dir / 'part=a').mkdir()
+        (stage.staging_dir / 'part=a' / 'data.parquet').write_bytes(b'x')
+
+    assert mode(tmp_path / 'dataset' / 'part=a' / 'data.parquet') == default_mode()
+    assert mode(tmp_path / 'dataset' / '_manifest_run.json') == default_mode()
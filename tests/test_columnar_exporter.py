@@ -0,0 +1,36 @@
+"""Tests for the partitioned dataset export"""
+from datetime import datetime
+
+import pytest
+
+ds = pytest.importorskip('pyarrow.dataset')
+
+from src.exporters.columnar_exporter import ColumnarExporter
+from src.models.lead import Lead
+
+
+def make_leads(count, platform='instagram'):
+    return [
+        Lead(name=f"Lead {i}", platform=platform, source_url=f"https://example.com/{i}",
+             scraped_at=datetime(2024, 5, 1, 12, 0))
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_exports_in_the_same_second_append(tmp_path, format):
+    exporter = ColumnarExporter(tmp_path)
+
+    exporter.export_dataset(make_leads(10), format=format)
+    exporter.export_dataset(make_leads(10), format=format)
+
+    assert exporter.open_dataset(format=format).count_rows() == 20
+    assert len(list((tmp_path / 'leads_dataset').glob('_manifest_*.json'))) == 2
+
+
+def test_dataset_is_partitioned_by_platform(tmp_path):
+    exporter = ColumnarExporter(tmp_path)
+    exporter.export_dataset(make_leads(3) + make_leads(2, platform='yelp'))
+
+    table = exporter.open_dataset().to_table(filter=ds.field('platform') == 'yelp')
+    assert table.num_rows == 2
@@ -0,0 +1,97 @@
+"""Tests for the shared CRM retry policy"""
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from src.exporters.crm_http import RateLimitGate, request_with_backoff, retry_after
+
+
+class ScriptedSession:
+    """Session stand-in that answers with (or raises) the scripted outcomes in order"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def response(status, headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    return resp
+
+
+def connect_error():
+    return requests.ConnectionError(MaxRetryError(None, '/x', NewConnectionError(None, 'refused')))
+
+
+def send(session, method='GET', **kwargs):
+    return request_with_backoff(session, method, 'http://crm.test/x', backoff=0, sleep=lambda s: None, **kwargs)
+
+
+def test_get_retries_server_errors_and_timeouts():
+    session = ScriptedSession(response(503), requests.ReadTimeout('slow'), response(200))
+    assert send(session).status_code == 200
+    assert session.calls == 3
+
+
+def test_post_is_not_resent_after_server_error():
+    session = ScriptedSession(response(502), response(201))
+    assert send(session, 'POST').status_code == 502
+    assert session.calls == 1
+
+
+def test_post_is_not_resent_after_read_timeout():
+    session = ScriptedSession(requests.ReadTimeout('slow'), response(201))
+    with pytest.raises(requests.ReadTimeout):
+        send(session, 'POST')
+    assert session.calls == 1
+
+
+def test_post_is_resent_after_rate_limit_and_connect_failure():
+    session = ScriptedSession(response(429, {'Retry-After': '0'}), connect_error(),
+                              requests.ConnectTimeout('no route'), response(201))
+    assert send(session, 'POST').status_code == 201
+    assert session.calls == 4
+
+
+def test_idempotent_post_retries_like_get():
+    session = ScriptedSession(response(500), response(200))
+    assert send(session, 'POST', idempotent=True).status_code == 200
+
+
+def test_last_response_is_returned_when_retries_run_out():
+    session = ScriptedSession(*[response(429)] * 3)
+    assert send(session, max_retries=2).status_code == 429
+    assert session.calls == 3
+
+
+def test_retry_after_seconds_and_dates():
+    assert retry_after(response(429, {'Retry-After': '2.5'})) == 2.5
+    assert retry_after(response(429, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'})) == 0.0
+    assert retry_after(response(429)) is None
+
+
+def test_rate_limit_gate_pauses_when_quota_is_used_up():
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    gate = RateLimitGate(min_remaining=2, clock=lambda: now[0], sleep=sleep)
+    gate.update(response(200, {'X-RateLimit-Remaining': '5', 'X-RateLimit-Reset': '3'}))
+    gate.wait()
+    assert slept == []
+
+    gate.update(response(200, {'X-RateLimit-Remaining': '1', 'X-RateLimit-Reset': '3'}))
+    gate.wait()
+    assert sum(slept) == pytest.approx(3)
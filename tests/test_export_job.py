@@ -0,0 +1,34 @@
+"""Tests for multi-sink export jobs"""
+import csv
+
+import pytest
+
+pytest.importorskip('openpyxl')
+
+from src.exporters.export_job import ExportJob
+from src.models.lead import Lead
+
+
+def make_leads():
+    return [
+        Lead(name='Cafe Rot', platform='instagram', source_url='https://instagram.com/caferot',
+             email='info@caferot.de', phone='+4930123456', website='https://caferot.de'),
+        Lead(name='Baeckerei Blau', platform='yelp', source_url='https://yelp.de/biz/blau'),
+        Lead(name='Unknown Source', platform=None, source_url='https://example.com/x'),
+    ]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_standard_job_writes_every_sink(tmp_path, workers):
+    results = ExportJob.standard(make_leads(), tmp_path, workers=workers, min_score=40).run()
+
+    assert set(results) == {'csv', 'excel', 'by_platform', 'high_score', 'summary_report'}
+    with open(results['csv'], newline='', encoding='utf-8') as fh:
+        assert len(list(csv.DictReader(fh))) == 3
+
+
+def test_leads_without_platform_get_their_own_file(tmp_path):
+    results = ExportJob(make_leads(), tmp_path, workers=1).add_by_platform().run()
+
+    assert set(results['by_platform']) == {'instagram', 'yelp', None}
+    assert results['by_platform'][None].endswith('_None.xlsx')
@@ -0,0 +1,70 @@
+"""Tests for delta export state"""
+from datetime import datetime
+
+import pytest
+
+from src.exporters.crm_exporter import CRMExporter
+from src.exporters.crm_http import BatchResult, ItemError
+from src.exporters.export_state import ExportState
+from src.models.lead import Lead
+
+
+def make_lead(name, **fields):
+    slug = name.lower().replace(' ', '')
+    return Lead(name=name, platform='instagram', source_url=f"https://instagram.com/{slug}",
+                last_updated=datetime(2024, 5, 1, 12, 0), **fields)
+
+
+@pytest.fixture
+def state(tmp_path):
+    with ExportState(tmp_path / 'state.sqlite3') as state:
+        yield state
+
+
+def test_new_leads_are_pending_until_shipped(state):
+    leads = [make_lead('Cafe Rot'), make_lead('Baeckerei Blau')]
+    assert state.pending('csv', leads) == leads
+
+    state.mark_shipped('csv', leads)
+    assert state.pending('csv', leads) == []
+    assert state.watermark('csv') == datetime(2024, 5, 1, 12, 0)
+
+
+def test_lead_edited_after_ship_is_pending(state):
+    a, b = make_lead('Cafe Rot'), make_lead('Baeckerei Blau')
+    state.mark_shipped('csv', [a, b])
+
+    a.email = 'new@a.de'  # last_updated stays at the watermark
+    assert state.pending('csv', [a, b]) == [a]
+
+
+def test_targets_are_tracked_separately(state):
+    lead = make_lead('Cafe Rot')
+    state.mark_shipped('csv', [lead])
+
+    assert state.pending('crm:hubspot', [lead]) == [lead]
+
+
+def test_reset_makes_everything_pending(state):
+    lead = make_lead('Cafe Rot')
+    state.mark_shipped('csv', [lead])
+    state.reset('csv')
+
+    assert state.pending('csv', [lead]) == [lead]
+    assert state.watermark('csv') is None
+
+
+def test_export_delta_ships_only_accepted_leads(state, monkeypatch):
+    leads = [make_lead('Cafe Rot'), make_lead('Baeckerei Blau'), make_lead('Eis Gelb')]
+    rejected = ItemError('Baeckerei Blau', 400, 'Invalid email', 1)
+    monkeypatch.setattr(CRMExporter, 'export_batch', lambda self, leads, crm_name: BatchResult(2, [rejected]))
+
+    assert CRMExporter().export_delta(leads, 'hubspot', state) is True
+    assert state.pending('crm:hubspot', leads) == [leads[1]]
+
+
+def test_export_delta_ships_nothing_when_crm_fails(state):
+    leads = [make_lead('Cafe Rot'), make_lead('Baeckerei Blau')]
+
+    assert CRMExporter().export_delta(leads, 'unknown', state) is False
+    assert state.pending('crm:unknown', leads) == leads
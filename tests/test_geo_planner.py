@@ -0,0 +1,96 @@
+"""Tests for GeoCrawlPlanner tiling and adaptive subdivision"""
+import json
+import threading
+
+import pytest
+
+from src.core.geo_planner import GeoCrawlPlanner
+from src.models.lead import Lead
+
+GAZETTEER = {
+    'koeln': {
+        'name': 'Köln',
+        'aliases': ['Cologne'],
+        'districts': {
+            'Innenstadt': ['50667', '50668'],
+            'Ehrenfeld': ['50823', '50825', '50827'],
+        },
+    },
+}
+
+
+@pytest.fixture
+def planner(tmp_path):
+    path = tmp_path / 'gazetteer.json'
+    path.write_text(json.dumps(GAZETTEER), encoding='utf-8')
+    return GeoCrawlPlanner(path)
+
+
+class FakeSearch:
+    """Returns scripted result counts per query; overlapping queries share leads named in shared"""
+
+    def __init__(self, counts, shared=(), fail=()):
+        self.counts = counts
+        self.shared = set(shared)
+        self.fail = set(fail)
+        self.queries = []
+        self.lock = threading.Lock()
+
+    def __call__(self, query):
+        with self.lock:
+            self.queries.append(query)
+        if query in self.fail:
+            raise RuntimeError('blocked')
+        slug = 'shared' if query in self.shared else query.replace(' ', '-').replace(',', '')
+        return [Lead(name=f"Cafe {i}", platform='google_maps', source_url=f"https://maps.example/{slug}/{i}")
+                for i in range(self.counts.get(query, 0))]
+
+
+def test_plan_resolves_aliases_to_district_tiles(planner):
+    for location in ('Köln', 'koeln', ' COLOGNE '):
+        tiles = planner.plan(location)
+        assert [tile.query for tile in tiles] == ['Innenstadt, Köln', 'Ehrenfeld, Köln']
+        assert [child.query for child in tiles[1].children] == ['50823 Köln', '50825 Köln', '50827 Köln']
+        assert {child.level for tile in tiles for child in tile.children} == {'postcode'}
+
+
+def test_unknown_location_is_searched_as_a_single_tile(planner):
+    tiles = planner.plan('Bielefeld')
+
+    assert [(tile.query, tile.level, tile.children) for tile in tiles] == [('Bielefeld', 'location', [])]
+
+
+def test_only_saturated_tiles_are_subdivided(planner):
+    search = FakeSearch({'Innenstadt, Köln': 5, 'Ehrenfeld, Köln': 20, '50823 Köln': 3, '50825 Köln': 4})
+
+    leads = planner.crawl('Köln', search, result_cap=20)
+
+    assert sorted(search.queries) == sorted(['Innenstadt, Köln', 'Ehrenfeld, Köln',
+                                             '50823 Köln', '50825 Köln', '50827 Köln'])
+    assert len(leads) == 5 + 20 + 3 + 4
+
+
+def test_leads_found_by_overlapping_tiles_are_kept_once(planner):
+    search = FakeSearch({'Innenstadt, Köln': 4, 'Ehrenfeld, Köln': 4}, shared={'Innenstadt, Köln', 'Ehrenfeld, Köln'})
+
+    leads = planner.crawl('Köln', search, result_cap=20)
+
+    assert len(leads) == 4
+
+
+def test_query_budget_bounds_subdivision(planner):
+    search = FakeSearch({'Innenstadt, Köln': 20, 'Ehrenfeld, Köln': 20})
+
+    planner.crawl('Köln', search, result_cap=20, max_workers=1, max_queries=3)
+
+    assert len(search.queries) == 3
+    assert set(search.queries[:2]) == {'Innenstadt, Köln', 'Ehrenfeld, Köln'}
+
+
+def test_failed_tile_does_not_stop_the_crawl(planner):
+    search = FakeSearch({'Ehrenfeld, Köln': 2}, fail={'Innenstadt, Köln'})
+
+    leads = planner.crawl('Köln', search, result_cap=20)
+
+    assert len(leads) == 2
+    assert len(search.queries) == 2
@@ -0,0 +1,153 @@
+"""Tests for HubSpotClient against a local stand-in of the batch contacts API"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.exporters.hubspot_client import HubSpotClient
+
+
+class HubSpotHandler(BaseHTTPRequestHandler):
+    """batch/upsert and batch/create; rejects emails without '@', throttles the first N requests
+
+    Contacts named in server.lost are dropped with an error that names no input.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        action = self.path.rsplit('/', 1)[-1]
+        inputs = body['inputs']
+        with server.lock:
+            server.calls.append((action, len(inputs)))
+            throttled = server.throttle > 0
+            server.throttle -= throttled
+            failing = action in server.fail_actions
+        if self.headers.get('Authorization') != 'Bearer token':
+            return self._reply(401, {'message': 'Unauthorized'})
+        if throttled:
+            return self._reply(429, {'message': 'Too many requests'}, {'Retry-After': '0'})
+        if failing:
+            return self._reply(500, {'message': 'Internal error'})
+
+        results, errors = [], []
+        for item in inputs:
+            if action == 'upsert' and '@' not in item['id']:
+                errors.append({'status': 'error', 'category': 'VALIDATION_ERROR', 'message': 'Invalid email',
+                               'context': {'ids': [item['id']]}})
+                continue
+            if item['properties'].get('email', item['properties'].get('firstname')) in server.lost:
+                errors.append({'status': 'error', 'category': 'INTERNAL_ERROR', 'message': 'Not saved'})
+                continue
+            with server.lock:
+                server.contacts.append(item['properties'])
+            results.append({'id': str(len(server.contacts)), 'properties': item['properties']})
+        self._reply(207 if errors else 200, {'status': 'COMPLETE', 'results': results, 'errors': errors})
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), HubSpotHandler)
+    server.lock = threading.Lock()
+    server.calls = []
+    server.contacts = []
+    server.throttle = 0
+    server.fail_actions = set()
+    server.lost = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    with HubSpotClient('token', f"http://127.0.0.1:{server.server_port}", max_workers=2, backoff=0) as client:
+        yield client
+
+
+def test_contacts_are_sent_in_batches_of_100(server, client):
+    contacts = [{'email': f"lead{i}@example.com"} for i in range(230)] + [{'firstname': 'No Email'}]
+
+    result = client.upsert_contacts(contacts)
+
+    assert (result.succeeded, result.errors) == (231, [])
+    assert sorted(server.calls) == [('create', 1), ('upsert', 30), ('upsert', 100), ('upsert', 100)]
+
+
+def test_duplicate_emails_are_merged_into_one_upsert(server, client):
+    contacts = [{'email': 'A@Example.com', 'phone': '1'}, {'email': 'a@example.com', 'website': 'a.de'}]
+
+    result = client.upsert_contacts(contacts)
+
+    assert result.succeeded == 2
+    assert server.contacts == [{'email': 'a@example.com', 'phone': '1', 'website': 'a.de'}]
+
+
+def test_rate_limited_batches_are_retried(server, client):
+    server.throttle = 2
+
+    result = client.upsert_contacts([{'email': 'a@example.com'}, {'firstname': 'No Email'}])
+
+    assert (result.succeeded, result.errors) == (2, [])
+    assert len(server.calls) == 4
+
+
+def test_partial_errors_name_the_rejected_contacts(server, client):
+    contacts = [{'email': 'a@example.com'}, {'email': 'broken'}, {'email': 'b@example.com'}, {'email': 'broken'}]
+
+    result = client.upsert_contacts(contacts)
+
+    assert result.succeeded == 2
+    assert sorted(error.index for error in result.errors) == [1, 3]
+    assert {(error.key, error.status) for error in result.errors} == {('broken', 207)}
+
+
+def test_error_without_ids_fails_only_the_contacts_without_a_result(server, client):
+    server.lost = {'b@example.com', 'Grace'}
+    contacts = [{'email': 'a@example.com'}, {'email': 'b@example.com'}, {'email': 'A@example.com'},
+                {'firstname': 'Ada'}, {'firstname': 'Grace'}]
+
+    result = client.upsert_contacts(contacts)
+
+    assert result.succeeded == 3
+    assert [(error.key, error.status, error.index) for error in sorted(result.errors, key=lambda e: e.index)] == [
+        ('b@example.com', 207, 1), ('Grace', 207, 4)
+    ]
+
+
+def test_failed_create_batch_is_reported_and_not_resent(server, client):
+    server.fail_actions = {'create'}
+
+    result = client.upsert_contacts([{'firstname': 'Ada'}, {'firstname': 'Grace', 'lastname': 'Hopper'}])
+
+    assert result.succeeded == 0
+    assert [(error.key, error.status, error.index) for error in result.errors] == [
+        ('Ada', 500, 0), ('Grace Hopper', 500, 1)
+    ]
+    assert server.calls == [('create', 2)]
+
+
+def test_failed_upsert_batch_is_retried(server, client):
+    server.fail_actions = {'upsert'}
+
+    result = client.upsert_contacts([{'email': 'a@example.com'}])
+
+    assert result.errors[0].status == 500
+    assert len(server.calls) == client.max_retries + 1
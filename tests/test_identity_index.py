@@ -0,0 +1,80 @@
+"""Tests for IdentityIndex across incremental runs"""
+import pytest
+
+from src.models.lead import Lead
+from src.utils.identity_index import IdentityIndex
+
+
+def make_lead(name='Cafe Rot', platform='instagram', source_url='https://instagram.com/caferot', **fields):
+    return Lead(name=name, platform=platform, source_url=source_url, **fields)
+
+
+@pytest.fixture
+def index(tmp_path):
+    with IdentityIndex(tmp_path / 'index.sqlite3') as index:
+        yield index
+
+
+def test_repeat_run_matches_known_leads_as_unchanged(index):
+    leads = [make_lead(email='info@caferot.de'), make_lead('Baeckerei Blau', source_url='https://instagram.com/blau')]
+    first = index.sync(leads)
+
+    again = [make_lead(email='info@caferot.de'), make_lead('Baeckerei Blau', source_url='https://instagram.com/blau')]
+    second = index.sync(again)
+
+    assert (len(second.new), len(second.changed), second.unchanged) == (0, 0, again)
+    assert second.lead_ids == first.lead_ids
+    assert len(index) == 2
+
+
+def test_same_business_on_another_platform_keeps_its_identity(index):
+    first = index.sync([make_lead(email='info@caferot.de', website='https://caferot.de')])
+
+    other = make_lead(platform='yelp', source_url='https://yelp.de/biz/cafe-rot', website='https://www.caferot.de/')
+    second = index.sync([other])
+
+    assert second.lead_ids == first.lead_ids
+    assert second.changed == [other]
+    assert len(index) == 1
+
+
+def test_new_record_gets_a_new_identity(index):
+    first = index.sync([make_lead(email='info@caferot.de')])
+
+    newcomer = make_lead('Baeckerei Blau', source_url='https://instagram.com/blau', email='hallo@blau.de')
+    second = index.sync([newcomer])
+
+    assert second.new == [newcomer]
+    assert second.lead_ids[0] != first.lead_ids[0]
+    assert len(index) == 2
+
+
+def test_changed_content_is_reported_but_volatile_fields_are_not(index):
+    index.sync([make_lead(followers=100, lead_score=10)])
+
+    rescored = index.sync([make_lead(followers=100, lead_score=60)])
+    grown = make_lead(followers=250)
+    changed = index.sync([grown])
+
+    assert len(rescored.unchanged) == 1
+    assert changed.changed == [grown]
+
+
+def test_classify_does_not_record(index):
+    lead = make_lead()
+
+    assert index.classify([lead]).new == [lead]
+    assert index.classify([lead]).new == [lead]
+    assert len(index) == 0
+
+
+def test_index_persists_across_reopen(tmp_path):
+    path = tmp_path / 'index.sqlite3'
+    with IdentityIndex(path) as index:
+        first = index.sync([make_lead(email='info@caferot.de')])
+
+    with IdentityIndex(path) as reopened:
+        assert len(reopened) == 1
+        assert reopened.lookup(make_lead(platform='yelp', source_url='https://yelp.de/biz/x',
+                                         email='INFO@caferot.de')) == first.lead_ids[0]
+        assert reopened.filter_new_or_changed([make_lead(email='info@caferot.de')]) == []
@@ -0,0 +1,70 @@
+"""Tests for Lead score tracking and bulk construction"""
+import csv
+import io
+
+from src.models.lead import Lead
+
+
+def make_lead(**fields):
+    return Lead(name='Cafe Rot', platform='instagram', source_url='https://instagram.com/caferot', **fields)
+
+
+def test_score_follows_field_changes():
+    lead = make_lead(email='info@caferot.de')
+    assert lead.score_breakdown == {'email': 20}
+
+    lead.phone = '+4930123456'
+    assert lead.lead_score == 35
+    assert lead.score_breakdown == {'email': 20, 'phone': 15}
+
+
+def test_explicit_score_drops_stale_breakdown():
+    lead = make_lead(email='info@caferot.de')
+    lead.finalize()
+
+    lead.lead_score = 90
+    assert lead.lead_score == 90
+    assert lead.score_breakdown == {}
+
+
+def test_breakdown_sets_matching_score():
+    lead = make_lead(email='info@caferot.de', phone='+4930123456')
+
+    lead.score_breakdown = {'email': 20}
+    assert lead.lead_score == 20
+
+    lead.set_score(55, {'email': 20, 'website': 10})
+    assert (lead.lead_score, lead.score_breakdown) == (55, {'email': 20, 'website': 10})
+
+
+def test_field_change_after_explicit_score_recomputes_both():
+    lead = make_lead(email='info@caferot.de', phone='+4930123456')
+    lead.lead_score = 90
+
+    lead.email = None
+    assert lead.lead_score == 15
+    assert lead.score_breakdown == {'phone': 15}
+
+
+def test_from_records_reads_csv_rows_like_from_dict():
+    leads = [
+        make_lead(email='info@caferot.de', followers=5000, engagement_rate=0.05, pain_points=['slow_service'],
+                  social_handles={'instagram': '@caferot'}, tags=['berlin']),
+        Lead(name='Baeckerei Blau', platform='yelp', source_url='https://yelp.de/biz/blau'),
+    ]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(leads[0].to_dict()))
+    writer.writeheader()
+    writer.writerows(lead.to_dict() for lead in leads)
+    buffer.seek(0)
+    rows = list(csv.DictReader(buffer))
+
+    for trust_scores in (False, True):
+        for got, lead in zip(Lead.from_records(rows, trust_scores=trust_scores), leads):
+            expected = Lead.from_dict(lead.to_dict())
+            assert got.to_dict() == expected.to_dict()
+            assert type(got.followers) is type(expected.followers)
+            assert type(got.lead_score) is int
+
+    blank = Lead.from_records(rows)[1]
+    assert (blank.email, blank.followers, blank.engagement_rate, blank.notes) == (None, None, None, None)
@@ -0,0 +1,114 @@
+"""Round-trip tests for the lead codecs"""
+import io
+from datetime import datetime
+
+import pytest
+
+from src.models import lead_codec
+from src.models.lead import Lead
+
+
+def make_lead(**overrides):
+    fields = dict(
+        name='Cafe Rot', platform='instagram', source_url='https://instagram.com/caferot',
+        website='https://caferot.de', email='info@caferot.de', phone='+4930123456',
+        address='Hauptstr. 1, Berlin', followers=2500, engagement_rate=0.045,
+        social_handles={'instagram': '@caferot'}, industry='Cafe', pain_points=['no_website_booking'],
+        scraped_at=datetime(2024, 5, 1, 12, 30), last_updated=datetime(2024, 5, 2, 8, 0),
+        notes='Ask about catering', tags=['berlin'], sources=['instagram'],
+    )
+    fields.update(overrides)
+    return Lead(**fields)
+
+
+def assert_same_lead(decoded, original):
+    for name in Lead.FIELDS:
+        assert getattr(decoded, name) == getattr(original, name), name
+
+
+def test_json_round_trip():
+    lead = make_lead()
+    assert_same_lead(lead_codec.decode_json(lead_codec.encode_json(lead)), lead)
+
+
+def test_json_keeps_stored_score():
+    lead = make_lead()
+    lead.set_score(77, {'custom': 77})
+
+    decoded = lead_codec.decode_json(lead_codec.encode_json(lead))
+    assert (decoded.lead_score, decoded.score_breakdown) == (77, {'custom': 77})
+
+
+def test_msgpack_round_trip():
+    pytest.importorskip('msgpack')
+    lead = make_lead(website=None, followers=None, pain_points=[])
+    assert_same_lead(lead_codec.decode_msgpack(lead_codec.encode_msgpack(lead)), lead)
+
+
+def test_jsonl_stream_round_trip():
+    leads = [make_lead(), make_lead(name='Baeckerei Blau', email=None)]
+    stream = io.BytesIO()
+
+    assert lead_codec.write_jsonl(leads, stream) == 2
+    stream.seek(0)
+    decoded = list(lead_codec.iter_jsonl(stream))
+
+    assert len(decoded) == 2
+    for got, expected in zip(decoded, leads):
+        assert_same_lead(got, expected)
+
+
+def test_msgpack_stream_round_trip():
+    pytest.importorskip('msgpack')
+    leads = [make_lead(), make_lead(name='Baeckerei Blau', email=None)]
+    stream = io.BytesIO()
+
+    assert lead_codec.write_msgpack_stream(leads, stream) == 2
+    stream.seek(0)
+    decoded = list(lead_codec.iter_msgpack_stream(stream))
+
+    assert len(decoded) == 2
+    for got, expected in zip(decoded, leads):
+        assert_same_lead(got, expected)
+
+
+def test_v1_json_record_upgrades():
+    record = lead_codec.lead_to_record(make_lead())
+    del record['sources']
+    record['v'] = 1
+
+    lead = lead_codec.decode_json(lead_codec._dumps(record))
+    assert lead.sources == []
+    assert lead.email == 'info@caferot.de'
+
+
+def test_v1_msgpack_stream_upgrades():
+    msgpack = pytest.importorskip('msgpack')
+    v1_fields = [name for name in lead_codec.RECORD_FIELDS if name != 'sources']
+    record = lead_codec.lead_to_record(make_lead())
+    packer = msgpack.Packer(use_bin_type=True)
+    stream = io.BytesIO(
+        packer.pack({'schema': 'lead', 'v': 1, 'fields': v1_fields})
+        + packer.pack([record[name] for name in v1_fields])
+    )
+
+    [lead] = lead_codec.iter_msgpack_stream(stream)
+    assert lead.sources == []
+    assert lead.name == 'Cafe Rot'
+
+
+def test_newer_schema_version_is_rejected():
+    record = lead_codec.lead_to_record(make_lead())
+    record['v'] = lead_codec.SCHEMA_VERSION + 1
+
+    with pytest.raises(ValueError, match='newer than supported'):
+        lead_codec.record_to_lead(record)
+
+
+def test_newer_msgpack_version_is_rejected():
+    pytest.importorskip('msgpack')
+    lead = make_lead()
+    data = lead_codec._msgpack().packb([lead_codec.SCHEMA_VERSION + 1] + lead_codec._to_row(lead), use_bin_type=True)
+
+    with pytest.raises(ValueError, match='newer than supported'):
+        lead_codec.decode_msgpack(data)
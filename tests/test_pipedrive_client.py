@@ -0,0 +1,162 @@
+"""Tests for PipedriveClient against a local stand-in of the persons/organizations API"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from src.exporters.pipedrive_client import PersonInput, PipedriveClient
+
+
+class PipedriveHandler(BaseHTTPRequestHandler):
+    """Organization search/create and person create; failures are scripted per path"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def _handle(self, method):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        with server.lock:
+            server.calls.append((method, url.path))
+            failures = server.failures.get(url.path)
+            status = failures.pop(0) if failures else None
+        if query.get('api_token') != ['token']:
+            return self._reply(401, {'success': False, 'error': 'Unauthorized'})
+        if status is not None:
+            return self._reply(status, {'success': False, 'error': 'Scripted failure'}, {'Retry-After': '0'})
+
+        with server.lock:
+            if url.path == '/organizations/search':
+                org_id = server.orgs.get(query['term'][0])
+                items = [{'item': {'id': org_id}}] if org_id else []
+                return self._reply(200, {'success': True, 'data': {'items': items}})
+            if url.path == '/organizations':
+                server.orgs[body['name']] = len(server.orgs) + 1
+                return self._reply(201, {'success': True, 'data': {'id': server.orgs[body['name']]}})
+            if url.path == '/persons':
+                server.persons.append(body)
+                return self._reply(201, {'success': True, 'data': {'id': len(server.persons)}})
+        self._reply(404, {'success': False, 'error': 'Not found'})
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PipedriveHandler)
+    server.lock = threading.Lock()
+    server.calls = []
+    server.failures = {}
+    server.orgs = {}
+    server.persons = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    with PipedriveClient('token', base_url=f"http://127.0.0.1:{server.server_port}", max_workers=4,
+                         backoff=0) as client:
+        yield client
+
+
+def person(name, org=None):
+    return PersonInput({'name': name}, f"name:{org}" if org else None, org)
+
+
+def test_persons_of_one_organization_share_it(server, client):
+    result = client.create_persons([person(f"Person {i}", 'Cafe Rot') for i in range(6)] + [person('Solo')])
+
+    assert (result.succeeded, result.errors) == (7, [])
+    assert server.orgs == {'Cafe Rot': 1}
+    assert server.calls.count(('GET', '/organizations/search')) == 1
+    assert [p.get('org_id') for p in server.persons].count(1) == 6
+
+
+def test_failed_organization_lookup_is_not_cached(server, client):
+    server.failures['/organizations/search'] = [500] * (client.max_retries + 1)
+
+    first = client.create_persons([person('First', 'Cafe Rot')])
+    second = client.create_persons([person('Second', 'Cafe Rot')])
+
+    assert (first.succeeded, second.succeeded) == (0, 1)
+    assert [p['org_id'] for p in server.persons] == [1]
+    assert server.orgs == {'Cafe Rot': 1}
+
+
+def test_person_of_an_unresolved_organization_is_reported_not_created(server, client):
+    server.failures['/organizations/search'] = [500] * (client.max_retries + 1)
+
+    result = client.create_persons([person('Solo'), person('First', 'Cafe Rot')])
+
+    assert result.succeeded == 1
+    assert [(error.key, error.status, error.index) for error in result.errors] == [('First', None, 1)]
+    assert server.persons == [{'name': 'Solo'}]
+
+
+def test_organization_is_not_created_after_a_failed_search(server, client):
+    server.orgs['Cafe Rot'] = 7
+    server.failures['/organizations/search'] = [500] * (client.max_retries + 1)
+
+    client.create_persons([person('First', 'Cafe Rot')])
+
+    assert server.orgs == {'Cafe Rot': 7}
+    assert ('POST', '/organizations') not in server.calls
+
+
+def test_rejected_person_is_reported_with_its_position(server, client):
+    server.failures['/persons'] = [400]
+
+    result = client.create_persons([person('Only')])
+
+    assert result.succeeded == 0
+    assert [(error.key, error.status, error.index) for error in result.errors] == [('Only', 400, 0)]
+
+
+def test_person_create_is_retried_on_429_but_not_on_server_error(server, client):
+    server.failures['/persons'] = [429, 502]
+
+    result = client.create_persons([person('Only')])
+
+    assert result.errors[0].status == 502
+    assert server.calls.count(('POST', '/persons')) == 2
+    assert server.persons == []
+
+
+def test_exporter_reuses_its_client_across_exports(server):
+    from src.exporters.crm_exporter import CRMExporter
+    from src.models.lead import Lead
+
+    exporter = CRMExporter()
+    exporter.crm_configs = {'pipedrive': {'api_token': 'token', 'base_url': f"http://127.0.0.1:{server.server_port}"}}
+    leads = [Lead(name='Cafe Rot', platform='instagram', source_url=f"https://instagram.com/caferot{i}",
+                  website='https://caferot.de') for i in range(2)]
+
+    assert exporter.export_to_pipedrive(leads[:1]) is True
+    assert exporter.export_to_pipedrive(leads[1:]) is True
+
+    assert server.calls.count(('GET', '/organizations/search')) == 1
+    assert [p['org_id'] for p in server.persons] == [1, 1]
@@ -0,0 +1,141 @@
+"""Tests for URLChecker against a local HTTP server"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils.url_checker import URLChecker
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers by path: /ok, /redirect, /no-head, /missing, /gone, /error, /slow"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self._answer('HEAD')
+
+    def do_GET(self):
+        self._answer('GET')
+
+    def _answer(self, method):
+        server = self.server
+        with server.lock:
+            server.requests.append((method, self.path))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path == '/slow':
+                time.sleep(0.05)
+            if self.path == '/redirect':
+                self._reply(302, location='/ok')
+            elif self.path == '/no-head':
+                self._reply(405 if method == 'HEAD' else 200)
+            elif self.path == '/missing':
+                self._reply(404)
+            elif self.path == '/gone':
+                self._reply(410)
+            elif self.path == '/error':
+                self._reply(500)
+            else:
+                self._reply(200)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _reply(self, status, location=None):
+        self.send_response(status)
+        if location:
+            self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.active = 0
+    server.max_active = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url(server, path, host='127.0.0.1'):
+    return f"http://{host}:{server.server_port}{path}"
+
+
+@pytest.mark.parametrize('path, accessible', [
+    ('/ok', True),
+    ('/redirect', True),
+    ('/no-head', True),
+    ('/missing', False),
+    ('/gone', False),
+    ('/error', False),
+])
+def test_classifies_responses(server, path, accessible):
+    with URLChecker(timeout=2) as checker:
+        assert checker.check(url(server, path)) is accessible
+
+
+def test_head_refusal_falls_back_to_get(server):
+    with URLChecker(timeout=2) as checker:
+        checker.check(url(server, '/no-head'))
+    assert server.requests == [('HEAD', '/no-head'), ('GET', '/no-head')]
+
+
+def test_non_fallback_error_skips_get(server):
+    with URLChecker(timeout=2) as checker:
+        checker.check(url(server, '/gone'))
+    assert server.requests == [('HEAD', '/gone')]
+
+
+def test_unreachable_and_invalid_urls_are_not_accessible(server):
+    port = server.server_port
+    server.shutdown()
+    server.server_close()
+    with URLChecker(timeout=1) as checker:
+        assert checker.check(f"http://127.0.0.1:{port}/ok") is False
+        assert checker.check('not a url') is False
+
+
+def test_host_result_is_cached_until_ttl(server):
+    now = [0.0]
+    with URLChecker(cache_ttl=60, clock=lambda: now[0]) as checker:
+        assert checker.check(url(server, '/ok')) is True
+        assert checker.check(url(server, '/missing')) is True  # same host, cached
+        assert len(server.requests) == 1
+
+        now[0] = 61
+        assert checker.check(url(server, '/missing')) is False
+        assert len(server.requests) == 3
+
+
+def test_check_many_requests_each_host_once(server):
+    urls = [url(server, '/ok'), url(server, '/missing'), url(server, '/ok', host='localhost')]
+    with URLChecker() as checker:
+        results = checker.check_many(urls + [None, ''])
+
+    assert results == {urls[0]: True, urls[1]: True, urls[2]: True}
+    assert len(server.requests) == 2
+
+
+def test_per_host_limit_bounds_concurrent_requests(server):
+    # A zero TTL disables caching, so every check reaches the server
+    with URLChecker(max_workers=8, per_host_limit=2, cache_ttl=0) as checker:
+        threads = [threading.Thread(target=checker.check, args=(url(server, '/slow'),)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(server.requests) == 8
+    assert server.max_active == 2